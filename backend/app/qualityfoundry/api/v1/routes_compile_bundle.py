@@ -6,7 +6,7 @@ quality-foundry
 """
 from fastapi import APIRouter, HTTPException
 from qualityfoundry.models.compile_schemas import CompileBundleRequest, CompileBundleResponse, CompiledCase
-from qualityfoundry.services.compile.compiler import compile_step_to_actions
+from qualityfoundry.services.compile.compiler import compile_steps_to_actions
 
 router = APIRouter()
 
@@ -17,12 +17,7 @@ def compile_bundle(req: CompileBundleRequest) -> CompileBundleResponse:
     timeout_ms = req.options.default_timeout_ms
 
     for c in req.cases:
-        actions = []
-        warnings = []
-        for st in c.steps:
-            a, w = compile_step_to_actions(st.step, timeout_ms=timeout_ms)
-            actions.extend(a)
-            warnings.extend(w)
+        actions, warnings = compile_steps_to_actions([st.step for st in c.steps], timeout_ms=timeout_ms)
 
         # strict 模式：只有 severity="error" 的警告才触发失败
         if req.options.strict and any(w.severity == "error" for w in warnings):
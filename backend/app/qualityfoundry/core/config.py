@@ -64,6 +64,12 @@ class Settings(BaseSettings):
     # 环境变量：QF_JWT_EXPIRE_HOURS
     JWT_EXPIRE_HOURS: int = 24
 
+    # ---------- Playwright ----------
+    # 已运行浏览器服务的 WebSocket 地址（如 `playwright launch-server` 启动的 ws://...）
+    # 设置后 runner 连接该浏览器而不是每次本地启动 Chromium
+    # 环境变量：QF_PLAYWRIGHT_WS_ENDPOINT
+    PLAYWRIGHT_WS_ENDPOINT: Optional[str] = None
+
 
 # 全局单例：直接 import settings 使用
 settings = Settings()
@@ -9,7 +9,7 @@ import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 
 from qualityfoundry.database.config import Base
@@ -60,5 +60,10 @@ class AuditLog(Base):
     # 扩展信息
     details = Column(Text, nullable=True)  # JSON 字符串
 
+    # 复合索引：query_audit_events 按 run_id 过滤并按 ts 排序
+    __table_args__ = (
+        Index("ix_audit_logs_run_id_ts", "run_id", "ts"),
+    )
+
     def __repr__(self) -> str:
         return f"<AuditLog {self.id} {self.event_type.value} run={self.run_id}>"
@@ -84,13 +84,34 @@ def _detect_container_runtime() -> Optional[str]:
     return None
 
 
+# 运行时探测结果缓存（shutil.which 需遍历 PATH，进程内只探测一次）
+_cached_runtime: Optional[str] = None
+_runtime_probed: bool = False
+
+
+def _get_container_runtime() -> Optional[str]:
+    """获取容器运行时（带缓存）"""
+    global _cached_runtime, _runtime_probed
+    if not _runtime_probed:
+        _cached_runtime = _detect_container_runtime()
+        _runtime_probed = True
+    return _cached_runtime
+
+
+def clear_container_runtime_cache() -> None:
+    """清除容器运行时探测缓存（用于测试或运行时安装后重新探测）"""
+    global _cached_runtime, _runtime_probed
+    _cached_runtime = None
+    _runtime_probed = False
+
+
 def _is_container_runtime_available() -> tuple[bool, Optional[str]]:
     """检查容器运行时是否可用
     
     Returns:
         (is_available, runtime_name)
     """
-    runtime = _detect_container_runtime()
+    runtime = _get_container_runtime()
     return (runtime is not None, runtime)
 
 
@@ -114,6 +135,63 @@ async def _get_image_hash(runtime: str, image: str) -> Optional[str]:
     return None
 
 
+async def _read_stream(stream: Optional[asyncio.StreamReader]) -> bytes:
+    """读取管道直至 EOF（与进程等待并行，超时被杀时仍保留已产生的输出）"""
+    if stream is None:
+        return b""
+    return await stream.read()
+
+
+def _run_args(
+    config: ContainerSandboxConfig,
+    workspace_path: Path,
+    output_path: Path,
+    env_vars: Optional[dict[str, str]],
+) -> list[str]:
+    """构建 docker run 的隔离参数（资源限制、网络、挂载、环境变量）"""
+    args = [
+        # 资源限制
+        f"--memory={config.memory_mb}m",
+        f"--cpus={config.cpus}",
+        f"--pids-limit={config.pids_limit}",
+        # 安全
+        "--security-opt", "no-new-privileges",
+        "--cap-drop=ALL",
+    ]
+
+    # 网络策略
+    if config.network_policy == "deny":
+        args.append("--network=none")
+    elif config.network_policy == "allowlist":
+        # 简单实现：由于 Docker 原生不支持按域名过滤，这里仅作标识
+        # 实际生产环境通常配合 iptables 或 sidecar 开启
+        # 此处展示逻辑骨架：如果限制白名单但未实现，则回退到 deny 保证安全
+        if not config.network_allowlist:
+            args.append("--network=none")
+        else:
+            # MVP 阶段：白名单模式若无专用 sidecar 则暂视为 all 但记录警告
+            logger.warning("Container network allowlist requested but not implemented for runtime. Using default network.")
+    # "all" 模式，不添加限制
+
+    # 挂载
+    workspace_mount = f"{workspace_path.absolute()}:/workspace"
+    if config.readonly_workspace:
+        workspace_mount += ":ro"
+    args.extend(["-v", workspace_mount])
+    args.extend(["-v", f"{output_path.absolute()}:/output:rw"])
+
+    # 工作目录
+    args.extend(["-w", "/workspace"])
+
+    # 环境变量
+    if env_vars:
+        for k, v in env_vars.items():
+            args.extend(["-e", f"{k}={v}"])
+    if os.environ.get("CI"):
+        args.extend(["-e", "CI=true"])
+    return args
+
+
 async def run_in_container(
     cmd: list[str],
     *,
@@ -158,59 +236,15 @@ async def run_in_container(
 
     # 4. 构建 docker run 命令
     container_name = f"qf-sandbox-{int(time.time())}-{os.getpid()}"
-    
     docker_cmd = [
         runtime, "run",
         "--name", container_name,
         "--rm",  # 自动清理
-        # 资源限制
-        f"--memory={config.memory_mb}m",
-        f"--cpus={config.cpus}",
-        f"--pids-limit={config.pids_limit}",
-        # 安全
-        "--security-opt", "no-new-privileges",
-        "--cap-drop=ALL",
+        *_run_args(config, workspace_path, output_path, env_vars),
     ]
-
-    # 5. 网络策略
-    if config.network_policy == "deny":
-        docker_cmd.append("--network=none")
-    elif config.network_policy == "allowlist":
-        # 简单实现：由于 Docker 原生不支持按域名过滤，这里仅作标识
-        # 实际生产环境通常配合 iptables 或 sidecar 开启
-        # 此处展示逻辑骨架：如果限制白名单但未实现，则回退到 deny 保证安全
-        if not config.network_allowlist:
-            docker_cmd.append("--network=none")
-        else:
-            # MVP 阶段：白名单模式若无专用 sidecar 则暂视为 all 但记录警告
-            logger.warning("Container network allowlist requested but not implemented for runtime. Using default network.")
-            pass 
-    else:
-        # "all" 模式，不添加限制
-        pass
-
-    # 挂载
-    workspace_mount = f"{workspace_path.absolute()}:/workspace"
-    if config.readonly_workspace:
-        workspace_mount += ":ro"
-    docker_cmd.extend(["-v", workspace_mount])
-    docker_cmd.extend(["-v", f"{output_path.absolute()}:/output:rw"])
-
-    # 工作目录
-    docker_cmd.extend(["-w", "/workspace"])
-
-    # 环境变量
-    if env_vars:
-        for k, v in env_vars.items():
-            docker_cmd.extend(["-e", f"{k}={v}"])
-    # 传递 CI 标识
-    if os.environ.get("CI"):
-        docker_cmd.extend(["-e", "CI=true"])
-
     # 镜像和命令
     docker_cmd.append(config.image)
     docker_cmd.extend(cmd)
-
     logger.info(f"Container sandbox: {runtime} run {config.image} (network={config.network_policy})")
 
     # 5. 执行
@@ -223,11 +257,12 @@ async def run_in_container(
             stderr=asyncio.subprocess.PIPE,
         )
 
+        # 并行排空 stdout/stderr，进程退出与输出读取互不阻塞
+        stdout_task = asyncio.create_task(_read_stream(process.stdout))
+        stderr_task = asyncio.create_task(_read_stream(process.stderr))
+
         try:
-            stdout_bytes, stderr_bytes = await asyncio.wait_for(
-                process.communicate(),
-                timeout=config.timeout_s,
-            )
+            await asyncio.wait_for(process.wait(), timeout=config.timeout_s)
         except asyncio.TimeoutError:
             logger.warning(f"Container timeout after {config.timeout_s}s, killing...")
             killed_by_timeout = True
@@ -246,8 +281,21 @@ async def run_in_container(
                 await asyncio.wait_for(process.wait(), timeout=5)
             except Exception:
                 process.kill()
-            stdout_bytes = b""
-            stderr_bytes = f"Container killed by timeout ({config.timeout_s}s)".encode()
+
+        # 收集输出（超时被杀时为截至被杀前的部分输出）
+        try:
+            stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                asyncio.gather(stdout_task, stderr_task),
+                timeout=5,
+            )
+        except Exception:
+            stdout_task.cancel()
+            stderr_task.cancel()
+            stdout_bytes, stderr_bytes = b"", b""
+
+        if killed_by_timeout:
+            notice = f"Container killed by timeout ({config.timeout_s}s)".encode()
+            stderr_bytes = stderr_bytes.rstrip(b"\n") + b"\n" + notice if stderr_bytes else notice
 
         elapsed_ms = int((time.monotonic() - start_time) * 1000)
 
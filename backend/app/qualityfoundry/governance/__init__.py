@@ -19,6 +19,7 @@ from qualityfoundry.governance.policy_loader import (
     PolicyConfig,
     get_policy,
     load_policy,
+    load_policy_from_dict,
     clear_policy_cache,
 )
 from qualityfoundry.governance.repro import (
@@ -42,6 +43,7 @@ __all__ = [
     "PolicyConfig",
     "get_policy",
     "load_policy",
+    "load_policy_from_dict",
     "clear_policy_cache",
     # Repro (L5 foundation)
     "ReproMeta",
@@ -47,6 +47,10 @@ class AIReviewConfig(BaseModel):
     )
     max_retries: int = Field(2, ge=0, description="单个模型最大重试次数")
     timeout_seconds: int = Field(30, ge=1, description="单次评审超时时间")
+    cache_votes: bool = Field(
+        False,
+        description="是否在进程内缓存模型投票（需显式开启，且仅在所有模型 temperature=0 时生效）",
+    )
 
 
 class ModelVote(BaseModel):
@@ -3,6 +3,7 @@
 AI 评审引擎核心实现
 """
 import hashlib
+import threading
 import time
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
@@ -18,10 +19,27 @@ from .models import (
 )
 
 
+# 进程内最多缓存的评审输入数
+VOTE_CACHE_MAX_SIZE = 256
+
+# 进程级投票缓存：键为 prompt 摘要 + 模型配置指纹，门禁每次新建引擎也能命中
+_vote_cache: Dict[str, List[ModelVote]] = {}
+_vote_cache_lock = threading.Lock()
+
+
+def clear_vote_cache() -> None:
+    """清除进程内的投票缓存（模型配置或后端变更后调用）"""
+    with _vote_cache_lock:
+        _vote_cache.clear()
+
+
 class AIReviewEngine:
     """AI 评审引擎
     
-    支持多模型评审，多种策略（多数投票、加权投票、级联）
+    支持多模型评审，多种策略（多数投票、加权投票、级联）。
+    显式开启 cache_votes 且所有模型均为确定性配置（temperature=0）时，相同输入、相同模型配置的
+    投票在进程内精确缓存（跨引擎实例共享），重复评审不再查询模型；聚合、元数据（review_id/时间戳）
+    仍逐次生成。只缓存全部为明确裁决（PASS/FAIL）的投票，NEEDS_HITL（不确定或查询失败回退）不缓存。
     """
     
     def __init__(self, config: AIReviewConfig):
@@ -49,16 +67,26 @@ class AIReviewEngine:
         if not self.config.models:
             return self._create_error_result("No models configured")
         
-        # 计算 prompt hash（用于审计）
-        prompt_hash = self._compute_prompt_hash(content, context, prompt_template)
+        # 完整 prompt 摘要作为缓存键，截断后用于审计
+        prompt_digest = self._compute_prompt_digest(content, context, prompt_template)
+        prompt_hash = prompt_digest[:16]
         
-        # 收集各模型投票
+        # 收集各模型投票（确定性配置下优先命中缓存）
         start_time = time.time()
-        model_votes = []
+        cacheable = self.config.cache_votes and self._is_deterministic()
+        cache_key = f"{prompt_digest}:{self._models_fingerprint()}" if cacheable else None
+        cached_votes = _vote_cache.get(cache_key) if cache_key else None
         
-        for model_config in self.config.models:
-            vote = self._query_model(model_config, content, context, prompt_template)
-            model_votes.append(vote)
+        if cached_votes is not None:
+            # 命中缓存时未查询模型，耗时记为 0
+            model_votes = [vote.model_copy(update={"duration_ms": 0}) for vote in cached_votes]
+        else:
+            model_votes = [
+                self._query_model(model_config, content, context, prompt_template)
+                for model_config in self.config.models
+            ]
+            if cache_key and all(self._is_cacheable_vote(v) for v in model_votes):
+                self._cache_votes(cache_key, model_votes)
         
         total_duration_ms = int((time.time() - start_time) * 1000)
         
@@ -229,15 +257,41 @@ class AIReviewEngine:
         )
         return f"Final: {final_verdict.value} | Votes: [{vote_summary}]"
     
-    def _compute_prompt_hash(
+    def _compute_prompt_digest(
         self,
         content: str,
         context: Optional[Dict],
         prompt_template: Optional[str],
     ) -> str:
-        """计算 prompt 哈希（用于审计）"""
+        """计算完整 prompt 摘要（缓存键；前 16 位用于审计）"""
         data = f"{content}:{context}:{prompt_template}"
-        return hashlib.sha256(data.encode()).hexdigest()[:16]
+        return hashlib.sha256(data.encode()).hexdigest()
+    
+    def _is_deterministic(self) -> bool:
+        """所有模型 temperature 为 0 时，相同输入的投票结果可复用"""
+        return all(m.temperature == 0 for m in self.config.models)
+    
+    @staticmethod
+    def _is_cacheable_vote(vote: ModelVote) -> bool:
+        """只有明确裁决可复用；NEEDS_HITL 可能来自超时/错误回退，下次应重新查询"""
+        return vote.verdict != VerdictType.NEEDS_HITL
+
+    def _models_fingerprint(self) -> str:
+        """模型配置指纹：模型列表任一字段不同的引擎不共享缓存"""
+        data = "|".join(m.model_dump_json() for m in self.config.models)
+        return hashlib.sha256(data.encode()).hexdigest()
+    
+    def _cache_votes(self, cache_key: str, votes: List[ModelVote]) -> None:
+        """写入投票缓存，超出容量时淘汰最早写入的条目"""
+        copies = [vote.model_copy() for vote in votes]
+        with _vote_cache_lock:
+            if cache_key not in _vote_cache and len(_vote_cache) >= VOTE_CACHE_MAX_SIZE:
+                _vote_cache.pop(next(iter(_vote_cache)))
+            _vote_cache[cache_key] = copies
+    
+    def clear_cache(self) -> None:
+        """清除投票缓存（进程级，影响所有引擎实例）"""
+        clear_vote_cache()
     
     def _create_disabled_result(self) -> AIReviewResult:
         """创建禁用状态的结果"""
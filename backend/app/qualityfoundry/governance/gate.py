@@ -13,7 +13,8 @@ from __future__ import annotations
 import logging
 import re
 from enum import Enum
-from typing import Any
+from functools import lru_cache
+from typing import Any, NamedTuple
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -51,6 +52,46 @@ _LEGACY_HIGH_RISK_PATTERNS = [
     r"\bdrop\s+table\b", r"\btruncate\b", r"\brm\s+-rf\b", r"\bsudo\b",
 ]
 
+# 输入分词（高危关键词按整词匹配）
+_WORD_RE = re.compile(r"\b\w+\b")
+
+# 同时命中多个关键词时优先返回的关键词（越靠前越重要），其余关键词排在其后
+_PRIORITY_KEYWORDS = ("production", "prod", "delete", "drop", "truncate")
+_PRIORITY_RANK = {kw: rank for rank, kw in enumerate(_PRIORITY_KEYWORDS)}
+_DEFAULT_RANK = len(_PRIORITY_KEYWORDS)
+
+
+def _keyword_priority(keyword: str) -> tuple[int, str]:
+    """关键词排序键：先按优先级，同级按字母序（结果不依赖集合迭代顺序）"""
+    return _PRIORITY_RANK.get(keyword, _DEFAULT_RANK), keyword
+
+
+class _CompiledPatterns(NamedTuple):
+    """预编译的高危模式"""
+    patterns: tuple[tuple[str, re.Pattern[str]], ...]
+    # 全部模式合并成的单一交替：未命中时一次扫描即可返回
+    prefilter: re.Pattern[str] | None
+
+
+@lru_cache(maxsize=32)
+def _compile_high_risk_patterns(patterns: tuple[str, ...]) -> _CompiledPatterns:
+    """编译高危模式（按模式元组缓存，每组模式只编译一次）
+
+    命中时仍按列表顺序逐个匹配，保证返回的是第一个命中的模式。
+    含捕获组的模式可能带反向引用，合并后组号会错位，此时不生成预过滤。
+    """
+    compiled = tuple((p, re.compile(p)) for p in patterns)
+    prefilter = None
+    if compiled and all(c.groups == 0 for _, c in compiled):
+        try:
+            prefilter = re.compile("|".join(f"(?:{p})" for p in patterns))
+        except re.error:
+            prefilter = None
+    return _CompiledPatterns(compiled, prefilter)
+
+
+_LEGACY_COMPILED_PATTERNS = _compile_high_risk_patterns(tuple(_LEGACY_HIGH_RISK_PATTERNS))
+
 
 class GateResult(BaseModel):
     """门禁决策结果"""
@@ -131,8 +172,8 @@ def evaluate_gate(
     # 规则 3: Fallback 到 tool_calls 状态（使用 policy 配置）
     if evidence.tool_calls:
         if policy.fallback_rule.require_all_tools_success:
-            failed_tools = [tc for tc in evidence.tool_calls if tc.status != "success"]
-            if not failed_tools:
+            # 常见的全部成功路径不分配中间列表；遇到第一个失败即短路
+            if all(tc.status == "success" for tc in evidence.tool_calls):
                 triggered_rules.append("all_tools_succeeded")
                 return GateResult(
                     decision=GateDecision.PASS,
@@ -143,7 +184,9 @@ def evaluate_gate(
             else:
                 triggered_rules.append("tool_execution_failed")
                 failed_reasons = []
-                for tc in failed_tools:
+                for tc in evidence.tool_calls:
+                    if tc.status == "success":
+                        continue
                     msg = f"{tc.tool_name}"
                     if tc.error_message:
                         # 只取前 100 个字符避免过长
@@ -256,6 +299,7 @@ def evaluate_gate_with_ai_review(
             hitl_threshold=policy.ai_review.thresholds.hitl_confidence,
             max_retries=policy.ai_review.max_retries,
             timeout_seconds=policy.ai_review.timeout_seconds,
+            cache_votes=policy.ai_review.cache_votes,
         )
 
         # 创建引擎并执行评审
@@ -308,29 +352,26 @@ def _check_high_risk(
     """
     # 获取关键词和模式
     if policy:
-        keywords = frozenset(policy.high_risk_keywords)
-        patterns = policy.high_risk_patterns
+        keywords = policy.high_risk_keyword_set
+        patterns = _compile_high_risk_patterns(tuple(policy.high_risk_patterns))
     else:
         keywords = _LEGACY_HIGH_RISK_KEYWORDS
-        patterns = _LEGACY_HIGH_RISK_PATTERNS
-
-    text_lower = input_nl.lower()
+        patterns = _LEGACY_COMPILED_PATTERNS
 
-    # 检查关键词
-    words = set(re.findall(r"\b\w+\b", text_lower))
-    matched_keywords = words & keywords
+    # 检查关键词：大小写折叠后单次分词，逐词在关键词哈希集合中查找
+    # （关键词集合已在策略上折叠过；查找耗时与关键词数量无关）
+    matched_keywords = keywords.intersection(_WORD_RE.findall(input_nl.casefold()))
     if matched_keywords:
         # 只返回最重要的（优先返回 prod/production）
-        priority_keywords = ["production", "prod", "delete", "drop", "truncate"]
-        for kw in priority_keywords:
-            if kw in matched_keywords:
-                return kw
-        return matched_keywords.pop()
-
-    # 检查模式
-    for pattern in patterns:
-        if re.search(pattern, text_lower):
-            return f"pattern:{pattern}"
+        return min(matched_keywords, key=_keyword_priority)
+
+    # 检查模式：保持对 lower() 文本匹配，策略中的模式语义不随折叠规则变化（如 ß 不会变成 ss）
+    text_lower = input_nl.lower()
+    if patterns.prefilter is not None and patterns.prefilter.search(text_lower) is None:
+        return None
+    for source, pattern in patterns.patterns:
+        if pattern.search(text_lower):
+            return f"pattern:{source}"
 
     return None
 
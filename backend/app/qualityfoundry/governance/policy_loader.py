@@ -4,7 +4,7 @@
 
 Features:
 - Pydantic schema 验证
-- YAML 加载
+- YAML 加载（优先使用 libyaml 的 CSafeLoader，按文件 mtime/大小/inode 缓存解析结果）
 - 默认值回退
 - 环境变量路径覆盖
 """
@@ -13,11 +13,18 @@ from __future__ import annotations
 
 import logging
 import os
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+try:
+    # libyaml C 扩展，比纯 Python 的 SafeLoader 快一个数量级
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - 未编译 libyaml 时回退
+    from yaml import SafeLoader as _YamlLoader
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +51,8 @@ class FallbackRule(BaseModel):
 
 class CostGovernance(BaseModel):
     """成本治理配置（预留扩展）"""
+    model_config = ConfigDict(frozen=True)
+
     timeout_s: int = Field(default=300, ge=1, description="超时时间（秒）")
     max_retries: int = Field(default=3, ge=0, description="最大重试次数")
 
@@ -106,6 +115,7 @@ class AIReviewPolicy(BaseModel):
     )
     max_retries: int = Field(default=2, ge=0, description="单个模型最大重试次数")
     timeout_seconds: int = Field(default=30, ge=1, description="单次评审超时时间")
+    cache_votes: bool = Field(default=False, description="是否在进程内缓存确定性模型的投票")
 
 
 class PlaywrightPolicy(BaseModel):
@@ -187,7 +197,12 @@ class SandboxPolicy(BaseModel):
 
 
 class PolicyConfig(BaseModel):
-    """策略配置主模型"""
+    """策略配置主模型
+
+    加载后不可变（frozen）：缓存的策略实例在编排各节点间共享，禁止就地修改。
+    """
+    model_config = ConfigDict(frozen=True)
+
     version: str = Field(default="1.0", description="配置版本")
     high_risk_keywords: list[str] = Field(
         default_factory=list,
@@ -226,6 +241,49 @@ class PolicyConfig(BaseModel):
         description="AI 评审策略配置"
     )
 
+    @cached_property
+    def high_risk_keyword_set(self) -> frozenset[str]:
+        """大小写折叠后的高危关键词集合（首次访问时构建，供门禁逐词 O(1) 查找）"""
+        return frozenset(k.casefold() for k in self.high_risk_keywords)
+
+    def model_copy(self, *, update: Optional[dict[str, Any]] = None, deep: bool = False) -> PolicyConfig:
+        """复制策略；派生实例的关键词可能已变更，不沿用原实例缓存的关键词集合"""
+        copied = super().model_copy(update=update, deep=deep)
+        copied.__dict__.pop("high_risk_keyword_set", None)
+        return copied
+
+
+def load_policy_from_dict(data: Optional[dict]) -> PolicyConfig:
+    """从已解析的字典构建策略配置（跳过文件读写与 YAML 解析）
+
+    Args:
+        data: 策略配置字典，None 视为空配置
+
+    Returns:
+        PolicyConfig: 策略配置对象
+    """
+    return PolicyConfig.model_validate(data or {})
+
+
+@lru_cache(maxsize=32)
+def _load_policy_file(path: Path, stat_key: tuple[int, int, int]) -> PolicyConfig:
+    """解析策略文件（按路径 + (mtime, 大小, inode) 缓存，文件变更后自动失效）
+
+    只比较 mtime 不够：粗粒度时间戳的文件系统上，同一时间片内的重写 mtime 不变；
+    大小与 inode（原子替换会换 inode）一并作为键，仍只需一次 stat。
+
+    PolicyConfig 不可变，缓存实例可以安全地在调用方之间共享。
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+        config = load_policy_from_dict(data)
+        logger.info(f"Policy loaded from {path}")
+        return config
+    except Exception as e:
+        logger.warning(f"Failed to load policy from {path}: {e}, using defaults")
+        return PolicyConfig()
+
 
 def load_policy(path: Optional[Path] = None) -> PolicyConfig:
     """加载策略配置
@@ -236,6 +294,8 @@ def load_policy(path: Optional[Path] = None) -> PolicyConfig:
     3. 默认路径 (governance/policy_config.yaml)
     4. 内置默认值
 
+    同一文件在未修改（mtime、大小、inode 均不变）时直接返回缓存的解析结果。
+
     Args:
         path: 策略文件路径（可选）
 
@@ -251,25 +311,20 @@ def load_policy(path: Optional[Path] = None) -> PolicyConfig:
             path = DEFAULT_POLICY_PATH
 
     # 尝试加载
-    if path.exists():
-        try:
-            with open(path, encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-            config = PolicyConfig.model_validate(data or {})
-            logger.info(f"Policy loaded from {path}")
-            return config
-        except Exception as e:
-            logger.warning(f"Failed to load policy from {path}: {e}, using defaults")
-            return PolicyConfig()
-    else:
+    try:
+        st = path.stat()
+    except OSError:
         logger.info(f"Policy file not found at {path}, using defaults")
         return PolicyConfig()
+    return _load_policy_file(Path(path), (st.st_mtime_ns, st.st_size, st.st_ino))
 
 
+@lru_cache(maxsize=1)
 def get_default_policy() -> PolicyConfig:
     """获取默认策略（不加载文件）
 
     用于测试或需要纯默认值的场景。
+    PolicyConfig 不可变，整个进程共享同一个实例。
     """
     return PolicyConfig(
         high_risk_keywords=[
@@ -312,3 +367,5 @@ def clear_policy_cache() -> None:
     """清除策略缓存（用于测试）"""
     global _cached_policy
     _cached_policy = None
+    _load_policy_file.cache_clear()
+    get_default_policy.cache_clear()
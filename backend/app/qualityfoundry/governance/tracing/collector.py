@@ -7,13 +7,13 @@ Evidence Schema: https://qualityfoundry.ai/schemas/evidence.v1.schema.json
 
 from __future__ import annotations
 
-import json
 import logging
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 from uuid import UUID
 
+import orjson
 from pydantic import BaseModel, ConfigDict, Field
 
 from qualityfoundry.governance.repro import ReproMeta, get_repro_meta
@@ -135,13 +135,20 @@ class Evidence(BaseModel):
     def schema_version(self) -> str:
         return EVIDENCE_SCHEMA_V1.version
 
+    def model_dump_json_bytes_for_file(self) -> bytes:
+        """导出为 UTF-8 编码的 JSON 字节（用于写文件）
+        
+        自动使用 alias 以包含 $schema；使用 orjson 序列化，缩进 2 空格、非 ASCII 字符原样输出。
+        """
+        data = self.model_dump(mode="json", by_alias=True)
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
     def model_dump_json_for_file(self) -> str:
         """导出为 JSON 字符串（用于写文件）
         
         自动使用 alias 以包含 $schema。
         """
-        data = self.model_dump(mode="json", by_alias=True)
-        return json.dumps(data, indent=2, ensure_ascii=False)
+        return self.model_dump_json_bytes_for_file().decode("utf-8")
 
 
 class TraceCollector:
@@ -271,7 +278,7 @@ class TraceCollector:
         evidence_path = run_dir / "evidence.json"
 
         # 写入文件
-        evidence_path.write_text(evidence.model_dump_json_for_file(), encoding="utf-8")
+        evidence_path.write_bytes(evidence.model_dump_json_bytes_for_file())
         logger.info(f"Evidence saved to {evidence_path}")
 
         return evidence_path
@@ -300,7 +307,7 @@ def load_evidence(run_id: UUID | str, artifact_root: Path | None = None) -> Evid
         return None
 
     try:
-        data = json.loads(evidence_path.read_text(encoding="utf-8"))
+        data = orjson.loads(evidence_path.read_bytes())
         return Evidence.model_validate(data)
     except Exception as e:
         logger.warning(f"Failed to load evidence from {evidence_path}: {e}")
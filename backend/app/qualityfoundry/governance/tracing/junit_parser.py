@@ -13,11 +13,18 @@ from __future__ import annotations
 import logging
 import re
 import xml.etree.ElementTree as ET
+from functools import partial
 from pathlib import Path
-from typing import TypedDict
+from typing import Iterable, TypedDict
 
 logger = logging.getLogger(__name__)
 
+# 增量解析时每次送入解析器的数据量
+_FEED_CHUNK_SIZE = 64 * 1024
+
+# 正则 fallback：一次扫描提取全部统计属性（每个属性取第一次出现的值）
+_ATTR_RE = re.compile(r'(tests|failures|errors|skipped)="(\d+)"|time="([\d.]+)"')
+
 
 class JUnitSummary(TypedDict):
     """JUnit 测试统计摘要"""
@@ -49,8 +56,13 @@ def parse_junit_xml(path: Path | str) -> JUnitSummary:
         return _empty_summary()
 
     try:
-        content = path.read_text(encoding="utf-8")
-        return parse_junit_xml_content(content)
+        try:
+            # 以字节块直接送入解析器：不整体读入、不解码；统计在根标签上时只读第一块
+            with open(path, "rb") as f:
+                return _parse_stream(iter(partial(f.read, _FEED_CHUNK_SIZE), b""))
+        except ET.ParseError:
+            # 空文件、非 XML 或不完整文档：按文本走完整的 fallback 逻辑
+            return parse_junit_xml_content(path.read_text(encoding="utf-8"))
     except Exception as e:
         logger.warning(f"Failed to parse JUnit XML {path}: {e}")
         return _empty_summary()
@@ -65,32 +77,63 @@ def parse_junit_xml_content(content: str) -> JUnitSummary:
     Returns:
         JUnitSummary: 测试统计摘要
     """
-    if not content.strip():
+    # 去掉 UTF-8 BOM（Windows 工具生成的报告常带），否则会被误判为非 XML
+    content = content.removeprefix("\ufeff")
+    stripped = content.lstrip()
+    if not stripped:
         return _empty_summary()
+    # 不以标签开头的内容不可能是合法 XML，直接走正则
+    if not stripped.startswith("<"):
+        return _parse_with_regex(content)
 
+    chunks = (
+        content[i:i + _FEED_CHUNK_SIZE] for i in range(0, len(content), _FEED_CHUNK_SIZE)
+    )
     try:
-        root = ET.fromstring(content)
-        return _parse_element(root)
+        return _parse_stream(chunks)
     except ET.ParseError as e:
         logger.warning(f"XML parse error: {e}")
         # 尝试正则解析作为 fallback
         return _parse_with_regex(content)
 
 
-def _parse_element(root: ET.Element) -> JUnitSummary:
-    """从 XML 元素解析统计信息"""
-    # 判断是 testsuites 还是 testsuite
-    if root.tag == "testsuites":
-        # 聚合所有 testsuite
-        return _aggregate_testsuites(root)
-    elif root.tag == "testsuite":
-        return _parse_testsuite(root)
-    else:
-        # 尝试查找 testsuite 子元素
-        testsuite = root.find(".//testsuite")
-        if testsuite is not None:
-            return _parse_testsuite(testsuite)
-        return _empty_summary()
+def _parse_stream(chunks: Iterable[str | bytes]) -> JUnitSummary:
+    """增量解析 JUnit XML，只读取 testsuite/testsuites 开始标签上的统计属性
+
+    - 根为 <testsuite>，或根 <testsuites> 自带统计属性：读到根标签即返回，不再解析其余内容
+    - 根为 <testsuites>：聚合直接子元素 <testsuite>
+    - 其他根元素：取文档中第一个 <testsuite>
+    每个元素结束后立即 clear()，不保留 <testcase> 子树。
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root: ET.Element | None = None
+    depth = 0
+    total = _empty_summary()
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if event == "end":
+                depth -= 1
+                elem.clear()
+                continue
+
+            depth += 1
+            if root is None:
+                root = elem
+                if elem.tag == "testsuite":
+                    return _parse_testsuite(elem)
+                # 如果 testsuites 本身有属性，使用它们（pytest 有时直接写在 testsuites 上）
+                if elem.tag == "testsuites" and elem.get("tests"):
+                    return _parse_testsuites_attrs(elem)
+            elif elem.tag == "testsuite":
+                if root.tag != "testsuites":
+                    return _parse_testsuite(elem)
+                if depth == 2:
+                    _accumulate(total, _parse_testsuite(elem))
+
+    parser.close()
+    return total
 
 
 def _parse_testsuite(elem: ET.Element) -> JUnitSummary:
@@ -104,29 +147,24 @@ def _parse_testsuite(elem: ET.Element) -> JUnitSummary:
     )
 
 
-def _aggregate_testsuites(root: ET.Element) -> JUnitSummary:
-    """聚合多个 testsuite 的统计"""
-    total = JUnitSummary(tests=0, failures=0, errors=0, skipped=0, time=0.0)
-
-    for testsuite in root.findall("testsuite"):
-        suite_summary = _parse_testsuite(testsuite)
-        total["tests"] += suite_summary["tests"]
-        total["failures"] += suite_summary["failures"]
-        total["errors"] += suite_summary["errors"]
-        total["skipped"] += suite_summary["skipped"]
-        total["time"] += suite_summary["time"]
-
-    # 如果 testsuites 本身有属性，使用它们（pytest 有时直接写在 testsuites 上）
-    if root.get("tests"):
-        return JUnitSummary(
-            tests=_get_int_attr(root, "tests"),
-            failures=_get_int_attr(root, "failures"),
-            errors=_get_int_attr(root, "errors"),
-            skipped=_get_int_attr(root, "skipped"),
-            time=_get_float_attr(root, "time"),
-        )
+def _parse_testsuites_attrs(elem: ET.Element) -> JUnitSummary:
+    """解析 testsuites 元素自身的统计属性"""
+    return JUnitSummary(
+        tests=_get_int_attr(elem, "tests"),
+        failures=_get_int_attr(elem, "failures"),
+        errors=_get_int_attr(elem, "errors"),
+        skipped=_get_int_attr(elem, "skipped"),
+        time=_get_float_attr(elem, "time"),
+    )
 
-    return total
+
+def _accumulate(total: JUnitSummary, suite_summary: JUnitSummary) -> None:
+    """把单个 testsuite 的统计累加到 total"""
+    total["tests"] += suite_summary["tests"]
+    total["failures"] += suite_summary["failures"]
+    total["errors"] += suite_summary["errors"]
+    total["skipped"] += suite_summary["skipped"]
+    total["time"] += suite_summary["time"]
 
 
 def _get_int_attr(elem: ET.Element, name: str) -> int:
@@ -152,24 +190,23 @@ def _get_float_attr(elem: ET.Element, name: str) -> float:
 
 
 def _parse_with_regex(content: str) -> JUnitSummary:
-    """使用正则表达式解析（XML 解析失败时的 fallback）"""
+    """使用正则表达式解析（非 XML 内容或 XML 解析失败时的 fallback）"""
     summary = _empty_summary()
-
-    patterns = [
-        (r'tests="(\d+)"', "tests", int),
-        (r'failures="(\d+)"', "failures", int),
-        (r'errors="(\d+)"', "errors", int),
-        (r'skipped="(\d+)"', "skipped", int),
-        (r'time="([\d.]+)"', "time", float),
-    ]
-
-    for pattern, key, converter in patterns:
-        match = re.search(pattern, content)
-        if match:
-            try:
-                summary[key] = converter(match.group(1))
-            except ValueError:
-                pass
+    seen: set[str] = set()
+
+    for match in _ATTR_RE.finditer(content):
+        key, int_value, time_value = match.groups()
+        if key is None:
+            key = "time"
+        if key in seen:
+            continue
+        seen.add(key)
+        try:
+            summary[key] = float(time_value) if key == "time" else int(int_value)
+        except ValueError:
+            pass
+        if len(seen) == 5:
+            break
 
     return summary
 
@@ -68,31 +68,41 @@ async def lifespan(app: FastAPI):
     
     yield  # 应用开始处理请求
 
-app = FastAPI(lifespan=lifespan)
 
-# 配置日志
-setup_logging()
+def create_app() -> FastAPI:
+    """创建 FastAPI 应用：注册中间件与全部路由
+
+    模块级 `app` 由此创建一次（uvicorn `qualityfoundry.main:app` 与测试共用）；
+    需要独立实例（不共享 dependency_overrides）时可再次调用。
+    """
+    application = FastAPI(lifespan=lifespan)
 
-# 安全响应头中间件
-app.add_middleware(SecurityHeadersMiddleware)
+    # 安全响应头中间件
+    application.add_middleware(SecurityHeadersMiddleware)
 
-# CORS 中间件
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # 允许所有来源，生产环境请指定具体域名
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    # CORS 中间件
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # 允许所有来源，生产环境请指定具体域名
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
-app.include_router(v1_router)
+    application.include_router(v1_router)
 
-@app.get("/healthz", include_in_schema=False)
-def healthz():
-    return {"ok": True}
+    @application.get("/healthz", include_in_schema=False)
+    def healthz():
+        return {"ok": True}
 
-@app.get("/health", include_in_schema=False)
-def health():
-    return {"ok": True}
+    @application.get("/health", include_in_schema=False)
+    def health():
+        return {"ok": True}
 
+    return application
+
+
+# 配置日志（进程级，只执行一次）
+setup_logging()
 
+app = create_app()
@@ -16,6 +16,7 @@ from pathlib import Path
 from playwright.sync_api import TimeoutError as PWTimeoutError
 from playwright.sync_api import sync_playwright
 
+from qualityfoundry.core.config import settings
 from qualityfoundry.models.schemas import Action, ActionType, ExecutionRequest, Locator, StepEvidence
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,8 @@ def run_actions(
     req: ExecutionRequest,
     artifact_dir: Path,
     enable_tracing: bool = True,
+    context=None,
+    ws_endpoint: str | None = None,
 ) -> tuple[bool, list[StepEvidence], str | None]:
     """统一 Runner 入口（唯一对外函数）。
 
@@ -58,6 +61,11 @@ def run_actions(
         req: ExecutionRequest（包含 actions / headless / base_url）
         artifact_dir: 本次 run 的产物目录（executor 已创建）
         enable_tracing: 是否启用 trace 收集（默认 True）
+        context: 调用方提供的 Playwright BrowserContext（可选）。
+            提供时在其上新开页面执行，不再启动/关闭浏览器，context 的生命周期由调用方负责；
+            用于多次执行共享同一个浏览器进程（如测试会话级 fixture）。
+        ws_endpoint: 已运行浏览器服务的 WebSocket 地址（可选，默认取 settings.PLAYWRIGHT_WS_ENDPOINT）。
+            提供时连接该浏览器而不在本地启动 Chromium，headless 由浏览器服务决定。
 
     Returns:
         (ok, evidence_list, trace_path)
@@ -67,105 +75,106 @@ def run_actions(
     """
     artifact_dir.mkdir(parents=True, exist_ok=True)
 
+    try:
+        if context is not None:
+            return _run_in_context(context, req, artifact_dir, enable_tracing)
+
+        endpoint = ws_endpoint or settings.PLAYWRIGHT_WS_ENDPOINT
+        with sync_playwright() as p:
+            if endpoint:
+                browser = p.chromium.connect(endpoint)
+            else:
+                browser = p.chromium.launch(headless=req.headless)
+            try:
+                own_context = browser.new_context()
+                try:
+                    return _run_in_context(own_context, req, artifact_dir, enable_tracing)
+                finally:
+                    own_context.close()
+            finally:
+                browser.close()
+
+    except Exception:
+        logger.exception("Playwright runner failed")
+        raise
+
+
+def _run_in_context(
+    context,
+    req: ExecutionRequest,
+    artifact_dir: Path,
+    enable_tracing: bool,
+) -> tuple[bool, list[StepEvidence], str | None]:
+    """在给定 BrowserContext 中新开页面，按顺序执行 actions 并收集证据与 trace。"""
     ok_all = True
     evidence: list[StepEvidence] = []
     trace_path: str | None = None
     trace_file = artifact_dir / "trace.zip"
 
-    browser = None
-    context = None
+    # 启用 tracing（PR-2 增强）
+    if enable_tracing:
+        try:
+            context.tracing.start(screenshots=True, snapshots=True, sources=True)
+            logger.info("Playwright tracing started")
+        except Exception as e:
+            logger.warning(f"Failed to start tracing: {e}")
+            enable_tracing = False
 
+    page = context.new_page()
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=req.headless)
-            context = browser.new_context()
+        # 若 caller 给了 base_url，可作为默认跳转目标（但不强制）
+        if req.base_url:
+            page.goto(req.base_url, timeout=30_000)
 
-            # 启用 tracing（PR-2 增强）
-            if enable_tracing:
-                try:
-                    context.tracing.start(screenshots=True, snapshots=True, sources=True)
-                    logger.info("Playwright tracing started")
-                except Exception as e:
-                    logger.warning(f"Failed to start tracing: {e}")
-                    enable_tracing = False
-
-            page = context.new_page()
-
-            # 若 caller 给了 base_url，可作为默认跳转目标（但不强制）
-            if req.base_url:
-                page.goto(req.base_url, timeout=30_000)
-
-            for idx, action in enumerate(req.actions):
-                step_ok = True
-                err: str | None = None
-                shot_path = artifact_dir / f"step_{idx:03d}.png"
+        for idx, action in enumerate(req.actions):
+            step_ok = True
+            err: str | None = None
+            shot_path = artifact_dir / f"step_{idx:03d}.png"
 
+            try:
+                _apply_action(page, action)
+            except PWTimeoutError as e:
+                step_ok = False
+                ok_all = False
+                err = f"Playwright 超时：{str(e)}"
+            except Exception as e:
+                step_ok = False
+                ok_all = False
+                err = str(e)
+            finally:
+                # 无论成功失败都截图，便于定位
                 try:
-                    _apply_action(page, action)
-                except PWTimeoutError as e:
-                    step_ok = False
-                    ok_all = False
-                    err = f"Playwright 超时：{str(e)}"
+                    page.screenshot(path=str(shot_path), full_page=True)
+                    shot = str(shot_path)
                 except Exception as e:
-                    step_ok = False
-                    ok_all = False
-                    err = str(e)
-                finally:
-                    # 无论成功失败都截图，便于定位
-                    try:
-                        page.screenshot(path=str(shot_path), full_page=True)
-                        shot = str(shot_path)
-                    except Exception as e:
-                        shot = None
-                        # 截图失败也要记录下来（但不覆盖主错误）
-                        if err is None:
-                            err = f"截图失败：{str(e)}"
-
-                evidence.append(
-                    StepEvidence(
-                        index=idx,
-                        action=action,
-                        ok=step_ok,
-                        screenshot=shot,
-                        error=err,
-                    )
+                    shot = None
+                    # 截图失败也要记录下来（但不覆盖主错误）
+                    if err is None:
+                        err = f"截图失败：{str(e)}"
+
+            evidence.append(
+                StepEvidence(
+                    index=idx,
+                    action=action,
+                    ok=step_ok,
+                    screenshot=shot,
+                    error=err,
                 )
-
-            # 停止 tracing 并保存（在 finally 之前确保保存）
-            if enable_tracing:
-                try:
-                    context.tracing.stop(path=str(trace_file))
-                    if trace_file.exists():
-                        trace_path = str(trace_file)
-                        logger.info(f"Playwright trace saved to {trace_path}")
-                except Exception as e:
-                    logger.warning(f"Failed to save trace: {e}")
-
-            context.close()
-            browser.close()
-
-    except Exception:
-        logger.exception("Playwright runner failed")
-        # 确保资源释放
-        if context:
-            try:
-                # 尝试保存 trace（即使出错也要保留证据）
-                if enable_tracing:
-                    try:
-                        context.tracing.stop(path=str(trace_file))
-                        if trace_file.exists():
-                            trace_path = str(trace_file)
-                    except Exception:
-                        pass
-                context.close()
-            except Exception:
-                pass
-        if browser:
+            )
+    finally:
+        # 停止 tracing 并保存（出错时也尽量保留证据）
+        if enable_tracing:
             try:
-                browser.close()
-            except Exception:
-                pass
-        raise
+                context.tracing.stop(path=str(trace_file))
+                if trace_file.exists():
+                    trace_path = str(trace_file)
+                    logger.info(f"Playwright trace saved to {trace_path}")
+            except Exception as e:
+                logger.warning(f"Failed to save trace: {e}")
+        try:
+            page.close()
+        except Exception:
+            pass
 
     return ok_all, evidence, trace_path
 
@@ -8,9 +8,10 @@ import hashlib
 import json
 import logging
 import os
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any, TYPE_CHECKING
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy.orm import Session
 
@@ -24,9 +25,25 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _parse_audit_flag(value: str) -> bool:
+    """解析 AUDIT_LOG_ENABLED 取值（按原始字符串缓存）"""
+    return value.lower() in ("true", "1", "yes")
+
+
 def is_audit_enabled() -> bool:
-    """检查审计日志是否启用"""
-    return os.getenv("AUDIT_LOG_ENABLED", "true").lower() in ("true", "1", "yes")
+    """检查审计日志是否启用
+
+    每次调用仍读取环境变量，运行时修改（含测试中的 monkeypatch）立即生效；
+    只有字符串解析结果被缓存。
+    """
+    return _parse_audit_flag(os.environ.get("AUDIT_LOG_ENABLED", "true"))
+
+
+@lru_cache(maxsize=4096)
+def _compute_args_hash(canonical: bytes) -> str:
+    """对规范化后的参数计算哈希（重试等相同参数直接命中缓存）"""
+    return hashlib.sha256(canonical).hexdigest()[:16]
 
 
 def _hash_args(args: dict[str, Any] | None) -> str | None:
@@ -34,7 +51,7 @@ def _hash_args(args: dict[str, Any] | None) -> str | None:
     if not args:
         return None
     canonical = json.dumps(args, sort_keys=True, ensure_ascii=False)
-    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    return _compute_args_hash(canonical.encode())
 
 
 def _hash_policy() -> str | None:
@@ -114,6 +131,68 @@ def write_audit_event(
         return None
 
 
+def write_audit_events_bulk(
+    db: Session,
+    events: list[dict[str, Any]],
+) -> int:
+    """
+    批量写入审计事件（单次 INSERT + 单次提交）。
+
+    每个事件字典接受与 write_audit_event 相同的关键字参数
+    （run_id、event_type、user_id、tool_name、args 等）。
+    policy_hash 与 git_sha 对整批事件只计算一次。
+
+    Args:
+        db: 数据库会话
+        events: 事件参数列表
+
+    Returns:
+        写入的事件数量（审计禁用或写入失败时为 0）
+    """
+    if not is_audit_enabled():
+        logger.debug("Audit logging disabled, skipping events")
+        return 0
+    if not events:
+        return 0
+
+    try:
+        policy_hash = _hash_policy()
+        git_sha = get_git_sha()
+        now = datetime.now(timezone.utc)
+
+        rows = []
+        for i, event in enumerate(events):
+            details = event.get("details")
+            rows.append({
+                "id": uuid4(),
+                "run_id": event["run_id"],
+                "created_by_user_id": event.get("user_id"),
+                # 逐条递增 1µs，保证按 ts 排序时保持提交顺序
+                "ts": now + timedelta(microseconds=i),
+                "event_type": event["event_type"],
+                "actor": event.get("actor"),
+                "tool_name": event.get("tool_name"),
+                "args_hash": _hash_args(event.get("args")),
+                "status": event.get("status"),
+                "duration_ms": event.get("duration_ms"),
+                "policy_hash": policy_hash,
+                "git_sha": git_sha,
+                "decision_source": event.get("decision_source"),
+                "details": json.dumps(details) if details else None,
+            })
+
+        db.bulk_insert_mappings(AuditLog, rows)
+        db.commit()
+
+        logger.info(f"Audit events logged in bulk: count={len(rows)}")
+        return len(rows)
+
+    except Exception as e:
+        logger.exception(f"Failed to write audit events in bulk: {e}")
+        db.rollback()
+        return 0
+
+
 def write_artifact_collected_event(
     db: Session,
     *,
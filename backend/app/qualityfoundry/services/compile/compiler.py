@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import re
-from typing import Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
 from qualityfoundry.models.compile_schemas import CompileWarning
 
@@ -76,6 +78,95 @@ def _action_click_selector(selector: str, timeout_ms: int) -> dict[str, Any]:
 
 
 
+# -----------------------------
+# Rules（按优先级排列，合并为单个预编译正则）
+# -----------------------------
+#
+# 每条规则都锚定在步骤开头；re.match 按书写顺序尝试各分支，
+# 第一个整体匹配成功的分支胜出，与逐条匹配的优先级语义一致。
+# 一次 match 即可完成分派（m.lastgroup 为外层规则名）。
+
+_STEP_RULES: tuple[tuple[str, str], ...] = (
+    # ---------- A. 英文规则（用于 CI 冒烟与通用英文步骤） ----------
+    # A1) Open <url>
+    ("open_url", r"(?i:open\s+(?P<open_url_url>https?://\S+)\s*$)"),
+    # A2) See <text>
+    ("see_text", r"(?i:see\s+(?P<see_text_text>.+)$)"),
+    # A3) Click <text>
+    ("click_en", r"(?i:click\s+(?P<click_en_text>.+)$)"),
+
+    # ---------- B. 中文规则（常见句式） ----------
+    # B1) 打开/访问/进入/跳转到 + URL（取第一个 URL）
+    ("navigate", r"(?:打开|访问|进入|跳转到)\b(?s:.*?)(?P<navigate_url>https?://\S+)"),
+    # B2) 点击/单击 + 文本（同时兼容 click）
+    ("click_text", r"(?i:(?:点击|单击|click)\s+(?P<click_text_text>.+)$)"),
+    # B3) 输入/填写（按 placeholder）
+    (
+        "fill_placeholder",
+        r"(?:在)?\s*(?P<fill_placeholder_field>.+?)\s*(?:输入|填写)\s*(?P<fill_placeholder_value>.+)$",
+    ),
+    # B3.1) 登录场景：输入用户名（支持多种变体）
+    (
+        "fill_username",
+        r"(?i:(?:输入|填写)(?:用户名|账号|账户名|用户账号|username)\s*[:：]?\s*(?P<fill_username_value>.+)$)",
+    ),
+    # B3.2) 登录场景：输入密码
+    (
+        "fill_password",
+        r"(?i:(?:输入|填写)(?:密码|口令|password)\s*[:：]?\s*(?P<fill_password_value>.+)$)",
+    ),
+    # B3.3) 登录场景：点击登录按钮（支持多种表述）
+    ("click_login", r"(?i:(?:点击|单击)(?:登录|登入|sign in|login)(?:按钮)?$)"),
+    # B3.4) 登录场景：点击提交按钮
+    ("click_submit", r"(?i:(?:点击|单击)(?:提交|确定|确认|submit)(?:按钮)?$)"),
+    # B4) 断言文本出现：应看到/看到/显示
+    ("see_cn", r"(?:应看到|看到|显示)\s*(?P<see_cn_text>.+)$"),
+)
+
+_STEP_RE = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _STEP_RULES))
+
+
+def _unquote(text: str) -> str:
+    """去除首尾空白与引号。"""
+    return text.strip().strip('"').strip("'")
+
+
+_STEP_HANDLERS: dict[str, Callable[[Mapping[str, Any], int], dict[str, Any]]] = {
+    "open_url": lambda m, t: _action_goto(m["open_url_url"], t),
+    "see_text": lambda m, t: _action_assert_text(_unquote(m["see_text_text"]), t),
+    "click_en": lambda m, t: _action_click_text(_unquote(m["click_en_text"]), t),
+    "navigate": lambda m, t: _action_goto(m["navigate_url"], t),
+    "click_text": lambda m, t: _action_click_text(_unquote(m["click_text_text"]), t),
+    "fill_placeholder": lambda m, t: _action_fill_placeholder(
+        _unquote(m["fill_placeholder_field"]), _unquote(m["fill_placeholder_value"]), t
+    ),
+    "fill_username": lambda m, t: _action_fill_selector(
+        'input[name="username"]', _unquote(m["fill_username_value"]), t
+    ),
+    "fill_password": lambda m, t: _action_fill_selector(
+        'input[type="password"]', _unquote(m["fill_password_value"]), t
+    ),
+    # 优先尝试按钮文本匹配
+    "click_login": lambda m, t: _action_click_text("登录", t),
+    "click_submit": lambda m, t: _action_click_selector('button[type="submit"]', t),
+    "see_cn": lambda m, t: _action_assert_text(_unquote(m["see_cn_text"]), t),
+}
+
+
+@lru_cache(maxsize=4096)
+def _match_step(step: str) -> Optional[tuple[str, Mapping[str, Any]]]:
+    """匹配步骤规则，返回 (规则名, 只读命名分组)；未命中返回 None
+
+    用例之间大量步骤文本重复（打开同一 URL、点击同一按钮），按步骤文本缓存匹配结果，
+    重复步骤无需再跑正则。缓存结果被所有调用方共享，命名分组以只读映射返回；
+    action 字典每次重新构建。
+    """
+    m = _STEP_RE.match(step)
+    if m is None:
+        return None
+    return m.lastgroup, MappingProxyType(m.groupdict())
+
+
 # -----------------------------
 # Compiler（规则编译）
 # -----------------------------
@@ -104,77 +195,13 @@ def compile_step_to_actions(step_text: str, timeout_ms: int) -> tuple[list[dict[
 
 
     # ============================================================
-    # A. 英文规则（用于 CI 冒烟与通用英文步骤）
-    # ============================================================
-
-    # A1) Open <url>
-    m = re.search(r"^open\s+(https?://\S+)\s*$", s, flags=re.IGNORECASE)
-    if m:
-        return [_action_goto(m.group(1), timeout_ms)], warnings
-
-    # A2) See <text>
-    m = re.search(r"^see\s+(.+)$", s, flags=re.IGNORECASE)
-    if m:
-        text = m.group(1).strip().strip('"').strip("'")
-        return [_action_assert_text(text, timeout_ms)], warnings
-
-    # A3) Click <text>
-    m = re.search(r"^click\s+(.+)$", s, flags=re.IGNORECASE)
-    if m:
-        text = m.group(1).strip().strip('"').strip("'")
-        return [_action_click_text(text, timeout_ms)], warnings
-
-    # ============================================================
-    # B. 中文规则（常见句式）
+    # A/B. 规则匹配（单次预编译正则，按优先级分派）
     # ============================================================
 
-    # B1) 打开/访问/进入/跳转到 + URL
-    m = re.search(r"(https?://\S+)", s)
-    if re.search(r"^(打开|访问|进入|跳转到)\b", s) and m:
-        return [_action_goto(m.group(1), timeout_ms)], warnings
-
-    # B2) 点击/单击 + 文本（同时兼容 click）
-    m = re.search(r"^(点击|单击|click)\s+(.+)$", s, flags=re.IGNORECASE)
-    if m:
-        text = m.group(2).strip().strip('"').strip("'")
-        return [_action_click_text(text, timeout_ms)], warnings
-
-    # B3) 输入/填写（按 placeholder）
-    m = re.search(r"^(在)?\s*(.+?)\s*(输入|填写)\s*(.+)$", s)
-    if m:
-        placeholder = m.group(2).strip().strip('"').strip("'")
-        value = m.group(4).strip().strip('"').strip("'")
-        return [_action_fill_placeholder(placeholder, value, timeout_ms)], warnings
-
-    # B3.1) 登录场景：输入用户名（支持多种变体）
-    m = re.search(r"^(输入|填写)(用户名|账号|账户名|用户账号|username)\s*[:：]?\s*(.+)$", s, flags=re.IGNORECASE)
-    if m:
-        value = m.group(3).strip().strip('"').strip("'")
-        # 尝试多个常见选择器
-        return [_action_fill_selector('input[name="username"]', value, timeout_ms)], warnings
-
-    # B3.2) 登录场景：输入密码
-    m = re.search(r"^(输入|填写)(密码|口令|password)\s*[:：]?\s*(.+)$", s, flags=re.IGNORECASE)
-    if m:
-        value = m.group(3).strip().strip('"').strip("'")
-        return [_action_fill_selector('input[type="password"]', value, timeout_ms)], warnings
-
-    # B3.3) 登录场景：点击登录按钮（支持多种表述）
-    m = re.search(r"^(点击|单击)(登录|登入|sign in|login)(按钮)?$", s, flags=re.IGNORECASE)
-    if m:
-        # 优先尝试按钮文本匹配
-        return [_action_click_text("登录", timeout_ms)], warnings
-
-    # B3.4) 登录场景：点击提交按钮
-    m = re.search(r"^(点击|单击)(提交|确定|确认|submit)(按钮)?$", s, flags=re.IGNORECASE)
-    if m:
-        return [_action_click_selector('button[type="submit"]', timeout_ms)], warnings
-
-    # B4) 断言文本出现：应看到/看到/显示
-    m = re.search(r"^(应看到|看到|显示)\s*(.+)$", s)
-    if m:
-        text = m.group(2).strip().strip('"').strip("'")
-        return [_action_assert_text(text, timeout_ms)], warnings
+    matched = _match_step(s)
+    if matched:
+        rule, groups = matched
+        return [_STEP_HANDLERS[rule](groups, timeout_ms)], warnings
 
 
     # ============================================================
@@ -190,3 +217,20 @@ def compile_step_to_actions(step_text: str, timeout_ms: int) -> tuple[list[dict[
     ))
     return [], warnings
 
+
+def compile_steps_to_actions(
+    steps: list[str], timeout_ms: int
+) -> tuple[list[dict[str, Any]], list[CompileWarning]]:
+    """
+    批量编译多个步骤（按顺序拼接 actions 与 warnings）。
+
+    等价于逐条调用 compile_step_to_actions 后合并结果；规则正则在模块加载时已预编译，
+    批量调用共享同一个 actions / warnings 缓冲区，省去调用方的逐条合并。
+    """
+    actions: list[dict[str, Any]] = []
+    warnings: list[CompileWarning] = []
+    for step in steps:
+        step_actions, step_warnings = compile_step_to_actions(step, timeout_ms)
+        actions.extend(step_actions)
+        warnings.extend(step_warnings)
+    return actions, warnings
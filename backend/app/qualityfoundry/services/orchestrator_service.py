@@ -114,6 +114,32 @@ def _default_collector_factory(run_id: UUID, input_nl: str, environment: dict[st
     return TraceCollector(run_id=str(run_id), input_nl=input_nl, environment=environment)
 
 
+def _build_governance_evidence(
+    budget: GovernanceBudget | dict[str, Any],
+    policy: PolicyConfig | None,
+) -> dict[str, Any]:
+    """根据预算与策略构建证据中的 governance 字段 (Phase 5.1)。
+
+    直接构造普通字典，不经过 pydantic 模型。
+    """
+    short_circuited = budget.get("short_circuited", False)
+    cost = policy.cost_governance if policy else None
+    return {
+        "budget": {
+            "elapsed_ms_total": budget.get("elapsed_ms_total", 0),
+            "attempts_total": budget.get("attempts_total", 0),
+            "retries_used_total": budget.get("retries_used_total", 0),
+        },
+        "policy_limits": {
+            "timeout_s": cost.timeout_s if cost else None,
+            "max_retries": cost.max_retries if cost else None,
+        },
+        "short_circuited": short_circuited,
+        "short_circuit_reason": budget.get("short_circuit_reason"),
+        "decision_source": "governance_short_circuit" if short_circuited else "gate_evaluator",
+    }
+
+
 class OrchestrationRequestProtocol(Protocol):
     """编排请求协议（避免循环引用）。"""
     nl_input: str
@@ -384,20 +410,7 @@ class OrchestratorService:
 
         # 将治理信息添加到证据字典中 (Phase 5.1)
         evidence_dict = evidence.model_dump()
-        evidence_dict["governance"] = {
-            "budget": {
-                "elapsed_ms_total": budget.get("elapsed_ms_total", 0),
-                "attempts_total": budget.get("attempts_total", 0),
-                "retries_used_total": budget.get("retries_used_total", 0),
-            },
-            "policy_limits": {
-                "timeout_s": policy.cost_governance.timeout_s if policy else None,
-                "max_retries": policy.cost_governance.max_retries if policy else None,
-            },
-            "short_circuited": budget.get("short_circuited", False),
-            "short_circuit_reason": budget.get("short_circuit_reason"),
-            "decision_source": "governance_short_circuit" if budget.get("short_circuited") else "gate_evaluator",
-        }
+        evidence_dict["governance"] = _build_governance_evidence(budget, policy)
 
         report_path = collector.save(evidence)
 
@@ -0,0 +1,26 @@
+"""add audit_logs (run_id, ts) composite index
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-02-03 10:00:00.000000
+
+query_audit_events 按 run_id 过滤并按 ts 排序，复合索引使其成为索引范围扫描。
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, None] = 'b2c3d4e5f6a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audit_logs_run_id_ts', 'audit_logs', ['run_id', 'ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audit_logs_run_id_ts', table_name='audit_logs')
@@ -3,11 +3,19 @@ QualityFoundry 测试配置
 
 统一管理测试数据库初始化，确保所有模型都被导入和注册。
 """
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import orjson
 import pytest
+import pytest_asyncio
 from uuid import uuid4
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
+from qualityfoundry.database import config as db_config
 from qualityfoundry.database.config import Base, get_db
 from qualityfoundry.database import *  # noqa: F401, F403 - 注册所有模型
 from qualityfoundry.database.user_models import User, UserRole
@@ -15,15 +23,97 @@ from qualityfoundry.api.deps.auth_deps import get_current_user
 from qualityfoundry.main import app
 from sqlalchemy.pool import StaticPool
 
+# 检测是否在 CI 环境中运行（导入时计算一次）
+IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
+# ai 标记用例使用的真实 AI 服务配置
+AI_API_KEY = os.environ.get("QF_AI_API_KEY")
+AI_BASE_URL = os.environ.get("QF_AI_BASE_URL", "https://api.openai.com/v1")
+AI_MODEL = os.environ.get("QF_AI_MODEL", "gpt-4o-mini")
+AI_PROVIDER = os.environ.get("QF_AI_PROVIDER", "openai")
+# 需要真实 AI 服务 / 完整环境的用例按开关启用（对应 ai / integration 标记）
+AI_READY = (
+    os.environ.get("QF_ENABLE_AI_TESTS", "").lower() in ("1", "true", "yes")
+    and bool(AI_API_KEY)
+)
+ENABLE_INTEGRATION_TESTS = os.environ.get("QF_ENABLE_INTEGRATION_TESTS", "").lower() in ("1", "true", "yes")
+
+# pytest-xdist 下每个 worker 是独立进程，用 worker id 给内存库命名以免互相干扰
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+
+def worker_memory_db_url(name: str = "memdb") -> str:
+    """返回当前 xdist worker 独享的命名内存数据库 URL"""
+    return f"sqlite:///file:{name}_{WORKER_ID}?mode=memory&cache=shared&uri=true"
+
+
+def post_json(client, url: str, payload) -> httpx.Response:
+    """以 orjson 预序列化请求体发送 POST，跳过 httpx 对 json= 参数的标准库编码
+
+    用于批量造数的循环中；单次请求直接用 client.post(json=...) 即可。
+    """
+    return client.post(
+        url,
+        content=orjson.dumps(payload),
+        headers={"content-type": "application/json"},
+    )
+
+
+def ensure_ai_config(client, assigned_steps: list[str]) -> dict:
+    """创建指向真实 AI 服务的默认配置（ai 标记用例的前置步骤）"""
+    response = client.post(
+        "/api/v1/ai-configs",
+        json={
+            "name": "测试 AI 配置",
+            "provider": AI_PROVIDER,
+            "model": AI_MODEL,
+            "api_key": AI_API_KEY,
+            "base_url": AI_BASE_URL,
+            "assigned_steps": assigned_steps,
+            "is_default": True,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()
+
 # 使用内存数据库进行测试，使用 StaticPool 保证连接共享同一内存空间
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+SQLALCHEMY_DATABASE_URL = worker_memory_db_url()
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
+    SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+
+
+def apply_sqlite_test_pragmas(engine):
+    """为测试引擎的每个新连接设置 SQLite PRAGMA
+
+    测试不关心崩溃持久性：关闭同步落盘、回滚日志放在内存中，消除提交时的 fsync。
+    不启用 WAL：磁盘库被多个 xdist worker 进程共享时 WAL 会产生锁竞争。
+    内存库本身就是 MEMORY 日志，相应 PRAGMA 为空操作。
+    """
+    pragmas = (
+        "PRAGMA synchronous=OFF;"
+        "PRAGMA journal_mode=MEMORY;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA cache_size=-65536;"
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.executescript(pragmas)
+        cursor.close()
+
+    return engine
+
+
+apply_sqlite_test_pragmas(engine)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 应用内部直接使用 SessionLocal（runner 审计写入等，不经过 get_db）的代码路径
+# 同样绑定到测试内存库，避免测试在仓库根目录生成磁盘 qualityfoundry.db
+db_config.SessionLocal.configure(bind=engine)
+
 
 def override_get_db():
     """覆盖数据库依赖"""
@@ -36,8 +126,12 @@ def override_get_db():
 
 @pytest.fixture
 def db():
-    """提供数据库会话"""
-    db = TestingSessionLocal()
+    """提供数据库会话
+
+    提交后不过期对象：测试创建的实体常被交给应用（如作为当前用户），
+    若提交后过期，应用读取属性时会在本会话中途开启 SAVEPOINT，与请求会话的 SAVEPOINT 交错。
+    """
+    db = TestingSessionLocal(expire_on_commit=False)
     try:
         yield db
     finally:
@@ -82,18 +176,228 @@ def apply_overrides():
 
 
 @pytest.fixture(autouse=True)
-def setup_database():
-    """每个测试前创建所有表，测试后清理"""
-    Base.metadata.create_all(bind=engine)
+def reset_container_runtime_cache():
+    """每个测试前清除容器运行时探测缓存，使 patch("shutil.which") 生效"""
+    from qualityfoundry.execution.container_sandbox import clear_container_runtime_cache
+
+    clear_container_runtime_cache()
     yield
-    Base.metadata.drop_all(bind=engine)
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def reset_ai_review_vote_cache():
+    """每个测试前清除进程级 AI 评审投票缓存，使替换后的 _query_model 生效"""
+    from qualityfoundry.governance.ai_review.reviewer import clear_vote_cache
+
+    clear_vote_cache()
+    yield
+
+
+def enable_sqlite_savepoints(engine):
+    """让 SAVEPOINT 在 pysqlite 上生效
+
+    pysqlite 默认的事务处理会吞掉 BEGIN，导致 SAVEPOINT 回滚失效；
+    关闭驱动层事务并由 SQLAlchemy 显式发出 BEGIN。
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return engine
+
+
+enable_sqlite_savepoints(engine)
+
+
+def _create_schema(bind) -> None:
+    """执行 create_all，全部 DDL 在 begin() 开启的同一个事务中提交"""
+    with bind.begin() as conn:
+        Base.metadata.create_all(bind=conn)
+
+
+def _bind_sessions(bind, **options) -> None:
+    """把测试与应用内部使用的 sessionmaker 绑定到指定引擎/连接"""
+    TestingSessionLocal.configure(bind=bind, **options)
+    db_config.SessionLocal.configure(bind=bind, **options)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database_schema():
+    """会话开始时建表一次（内存库随进程结束释放，无需 drop_all）"""
+    _create_schema(engine)
+
+
+@pytest.fixture(autouse=True)
+def setup_database(database_schema):
+    """每个测试在外部事务中运行，结束后整体回滚
+
+    会话以 create_savepoint 模式加入外部事务：应用代码中的 commit 只释放 SAVEPOINT，
+    不会真正落库，测试之间互不可见，也无需逐表清理。
+    """
+    connection = engine.connect()
+    trans = connection.begin()
+    _bind_sessions(connection, join_transaction_mode="create_savepoint")
+    try:
+        yield
+    finally:
+        _bind_sessions(engine, join_transaction_mode="conservative_savepoint")
+        trans.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
 def client():
-    """提供测试客户端"""
+    """提供测试客户端（整个测试会话共享）
+
+    TestClient 本身无状态；数据库与认证依赖由 apply_overrides / setup_database
+    逐测试重置，因此可以安全复用同一实例。
+    创建后先请求一次 /health，让应用在首个用例之前完成中间件栈的惰性构建。
+    """
     from fastapi.testclient import TestClient
-    return TestClient(app)
+    test_client = TestClient(app)
+    test_client.get("/health")
+    return test_client
+
+
+@pytest.fixture(scope="session")
+def asgi_transport():
+    """进程内 ASGI 传输（无线程、无 socket），整个测试会话共享"""
+    from httpx import ASGITransport
+    return ASGITransport(app=app)
+
+
+@pytest_asyncio.fixture
+async def async_client(asgi_transport):
+    """提供异步测试客户端（httpx.AsyncClient + ASGITransport）"""
+    from httpx import AsyncClient
+    async with AsyncClient(transport=asgi_transport, base_url="http://test") as c:
+        yield c
+
+
+def pytest_configure(config):
+    """每个进程（含各 xdist worker）启动时预热门禁的进程内缓存
+
+    策略实例、其关键词集合与编译后的高危模式均按进程缓存；在收集阶段构建，
+    避免首个门禁用例承担构建开销。evaluate_gate 未传 policy 时使用 get_policy()
+    加载的策略文件实例，用例也常直接传入 get_default_policy()，两者分别预热。
+    """
+    from qualityfoundry.governance.gate import _check_high_risk
+    from qualityfoundry.governance.policy_loader import get_default_policy, get_policy
+
+    for policy in (get_policy(), get_default_policy()):
+        _check_high_risk("warmup", policy)
+
+
+def pytest_collection_modifyitems(config, items):
+    """收集阶段按环境统一跳过用例（跳过的用例不会实例化任何 fixture）
+
+    - CI 中没有浏览器：跳过 xdist_group("playwright") 分组
+    - 未配置真实 AI 服务：跳过 ai 标记
+    - 未启用完整环境：跳过 integration 标记
+    """
+    skip_playwright = pytest.mark.skip(reason="Playwright 测试需要浏览器，在 CI 中跳过")
+    skip_ai = pytest.mark.skip(reason="需要真实 AI 服务配置（QF_ENABLE_AI_TESTS=1 且 QF_AI_API_KEY 已配置）")
+    skip_integration = pytest.mark.skip(reason="需要完整数据库环境（QF_ENABLE_INTEGRATION_TESTS=1）")
+    for item in items:
+        if IN_CI:
+            marker = item.get_closest_marker("xdist_group")
+            if marker is not None and marker.args[:1] == ("playwright",):
+                item.add_marker(skip_playwright)
+        if not AI_READY and item.get_closest_marker("ai") is not None:
+            item.add_marker(skip_ai)
+        if not ENABLE_INTEGRATION_TESTS and item.get_closest_marker("integration") is not None:
+            item.add_marker(skip_integration)
+
+
+@pytest.fixture(scope="session")
+def pw_thread():
+    """Playwright 专用线程：返回 call(fn, *args, **kwargs)，在该线程中执行并返回结果
+
+    同步 Playwright 启动后会在所在线程上留下运行中的事件循环，若直接在测试线程中启动，
+    同一 worker 上之后的 async 用例与 asyncio.run 都会报 "cannot be called from a running event loop"。
+    同步 API 的对象只能在创建它的线程中使用，因此浏览器、context 与 run_actions 都经 call 提交到该线程。
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+
+    def call(fn, *args, **kwargs):
+        return executor.submit(fn, *args, **kwargs).result()
+
+    try:
+        yield call
+    finally:
+        executor.shutdown(wait=True)
+
+
+def _launch_browser(playwright):
+    """启动或连接 Chromium（在 Playwright 线程中调用）"""
+    from qualityfoundry.core.config import settings
+
+    if settings.PLAYWRIGHT_WS_ENDPOINT:
+        return playwright.chromium.connect(settings.PLAYWRIGHT_WS_ENDPOINT)
+    return playwright.chromium.launch(headless=True)
+
+
+@pytest.fixture(scope="session")
+def pw_browser(pw_thread):
+    """会话级共享的 Playwright Chromium（只启动一次浏览器进程，运行在 pw_thread 中）
+
+    设置了 QF_PLAYWRIGHT_WS_ENDPOINT 时连接已运行的浏览器服务（如 `playwright launch-server`），
+    多个 xdist worker 共用同一个浏览器，不再各自启动。
+    """
+    from playwright.sync_api import sync_playwright
+
+    playwright = pw_thread(lambda: sync_playwright().start())
+    try:
+        browser = pw_thread(_launch_browser, playwright)
+        try:
+            yield browser
+        finally:
+            pw_thread(browser.close)
+    finally:
+        pw_thread(playwright.stop)
+
+
+# 浏览器用例访问的 https://example.com 由本地页面代替（内容与真实页面的关键文本一致）
+EXAMPLE_DOMAIN_URL = re.compile(r"^https?://example\.com(/|$)")
+EXAMPLE_DOMAIN_HTML = """<!doctype html>
+<html>
+<head><title>Example Domain</title></head>
+<body>
+<div>
+    <h1>Example Domain</h1>
+    <p>This domain is for use in illustrative examples in documents.</p>
+</div>
+</body>
+</html>
+"""
+
+
+def _new_example_context(browser):
+    """新建 BrowserContext 并把 example.com 路由到本地页面（在 Playwright 线程中调用）"""
+    context = browser.new_context()
+    context.route(
+        EXAMPLE_DOMAIN_URL,
+        lambda route: route.fulfill(status=200, content_type="text/html", body=EXAMPLE_DOMAIN_HTML),
+    )
+    return context
+
+
+@pytest.fixture
+def pw_context(pw_thread, pw_browser):
+    """每个测试独立的 BrowserContext（隔离 cookie/storage，创建代价远低于启动浏览器）
+
+    对 example.com 的请求在 context 内直接以本地页面响应，测试不依赖外网（无 DNS/TLS 往返）。
+    context 属于 Playwright 线程，使用时经 pw_thread 提交，如 pw_thread(run_actions, req, ..., context=pw_context)。
+    """
+    context = pw_thread(_new_example_context, pw_browser)
+    try:
+        yield context
+    finally:
+        pw_thread(context.close)
 
 
 @pytest.fixture
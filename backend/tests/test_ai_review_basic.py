@@ -256,6 +256,83 @@ class TestAuditMetadata:
         assert result.metadata.total_duration_ms >= 0
 
 
+class TestVoteCache:
+    """测试显式开启时确定性配置下的投票缓存"""
+    
+    @pytest.fixture
+    def query_calls(self, monkeypatch):
+        """记录 _query_model 调用（仍执行原始模拟查询）"""
+        calls = []
+        original = AIReviewEngine._query_model
+        monkeypatch.setattr(
+            AIReviewEngine, "_query_model", lambda self, *a: calls.append(a) or original(self, *a)
+        )
+        return calls
+    
+    @staticmethod
+    def make_engine(name="gpt-4", **config):
+        return AIReviewEngine(AIReviewConfig(
+            enabled=True,
+            models=[ModelConfig(name=name, provider="openai", **config.pop("model", {}))],
+            **config,
+        ))
+    
+    def test_cache_disabled_by_default(self, query_calls):
+        """未开启 cache_votes 时即使 temperature=0 也每次查询"""
+        engine = self.make_engine()
+        
+        engine.review("same content")
+        engine.review("same content")
+        
+        assert len(query_calls) == 2
+    
+    def test_repeated_review_reuses_votes(self, query_calls):
+        """相同输入只查询一次模型，但每次评审仍有独立的 review_id"""
+        engine = self.make_engine(cache_votes=True)
+        
+        result1 = engine.review("same content")
+        result2 = engine.review("same content")
+        
+        assert len(query_calls) == 1
+        assert result1.verdict == result2.verdict
+        assert [v.verdict for v in result1.model_votes] == [v.verdict for v in result2.model_votes]
+        assert result1.metadata.review_id != result2.metadata.review_id
+        # 命中缓存未查询模型，不沿用首次查询的耗时
+        assert all(v.duration_ms == 0 for v in result2.model_votes)
+        
+        engine.clear_cache()
+        engine.review("same content")
+        assert len(query_calls) == 2
+    
+    def test_cache_shared_across_engines_with_same_models(self, query_calls):
+        """缓存为进程级：相同模型配置的新引擎直接命中，不同模型配置不共享"""
+        self.make_engine("gpt-4", cache_votes=True).review("same content")
+        self.make_engine("gpt-4", cache_votes=True).review("same content")
+        assert len(query_calls) == 1
+        
+        self.make_engine("deepseek", cache_votes=True).review("same content")
+        assert len(query_calls) == 2
+    
+    def test_needs_hitl_votes_not_cached(self, query_calls):
+        """NEEDS_HITL 投票（不确定或查询失败回退）不缓存，下次重新查询"""
+        engine = self.make_engine(cache_votes=True)
+        
+        result = engine.review("content")
+        engine.review("content")
+        
+        assert result.model_votes[0].verdict == VerdictType.NEEDS_HITL
+        assert len(query_calls) == 2
+    
+    def test_non_deterministic_models_not_cached(self, query_calls):
+        """temperature > 0 的模型每次都重新查询"""
+        engine = self.make_engine(cache_votes=True, model={"temperature": 0.5})
+        
+        engine.review("same content")
+        engine.review("same content")
+        
+        assert len(query_calls) == 2
+
+
 class TestModelIntegration:
     """测试与现有 AI 配置的集成"""
     
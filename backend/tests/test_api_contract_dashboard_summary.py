@@ -3,20 +3,13 @@
 覆盖：days 参数、limit 参数、字段存在、统计一致性。
 """
 
-import pytest
 from uuid import uuid4
-from fastapi.testclient import TestClient
 
 from qualityfoundry.main import app
 from qualityfoundry.api.deps.auth_deps import get_current_user
 from qualityfoundry.database.user_models import User, UserRole
 
 
-@pytest.fixture
-def client():
-    return TestClient(app)
-
-
 def create_mock_admin() -> User:
     """创建 mock ADMIN 用户"""
     return User(
@@ -8,7 +8,6 @@ Contract Snapshot: v1.0 (2026-01-24)
 from uuid import uuid4
 
 import pytest
-from fastapi.testclient import TestClient
 
 from qualityfoundry.main import app
 from qualityfoundry.database.user_models import User, UserRole
@@ -28,10 +27,10 @@ MOCK_ADMIN = User(
 
 
 @pytest.fixture
-def client():
-    """创建测试客户端"""
+def client(client):
+    """会话级共享客户端，本模块以 ADMIN 身份访问"""
     app.dependency_overrides[get_current_user] = lambda: MOCK_ADMIN
-    yield TestClient(app)
+    yield client
     app.dependency_overrides.pop(get_current_user, None)
 
 
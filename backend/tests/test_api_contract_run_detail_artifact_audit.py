@@ -8,10 +8,6 @@ from qualityfoundry.database.audit_log_models import AuditLog, AuditEventType
 from qualityfoundry.database.user_models import User, UserRole
 from qualityfoundry.api.deps.auth_deps import get_current_user
 
-@pytest.fixture
-def client():
-    return TestClient(app)
-
 @pytest.fixture
 def db_session():
     """提供数据库会话"""
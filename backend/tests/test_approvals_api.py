@@ -1,17 +1,11 @@
 """
 审核流程 API 单元测试
 
-使用 conftest.py 中统一的测试数据库配置
+使用 conftest.py 中统一的测试数据库配置与会话级共享的 client fixture
 """
-from fastapi.testclient import TestClient
 
-from qualityfoundry.main import app
 
-# 使用 conftest.py 中的 client fixture
-client = TestClient(app)
-
-
-def test_create_approval():
+def test_create_approval(client):
     """测试创建审核"""
     # 先创建需求和场景
     req_response = client.post(
@@ -45,7 +39,7 @@ def test_create_approval():
     assert data["status"] == "pending"
 
 
-def test_approve_approval():
+def test_approve_approval(client):
     """测试批准审核"""
     # 创建需求、场景和审核
     req_response = client.post(
@@ -88,7 +82,7 @@ def test_approve_approval():
     assert data["review_comment"] == "批准通过"
 
 
-def test_reject_approval():
+def test_reject_approval(client):
     """测试拒绝审核"""
     # 创建需求、场景和审核
     req_response = client.post(
@@ -130,7 +124,7 @@ def test_reject_approval():
     assert data["reviewer"] == "rejector"
 
 
-def test_list_approvals():
+def test_list_approvals(client):
     """测试审核列表"""
     # 创建多个审核
     req_response = client.post(
@@ -10,62 +10,45 @@ from fastapi import HTTPException
 
 from qualityfoundry.api.v1.routes_artifacts import _safe_resolve
 
+# 任意 run_id 即可：_safe_resolve 的校验结果只取决于 rel_path，
+# 对 run_id 是纯函数，因此所有用例可以复用同一个值。
+_ANY_RUN_ID = uuid4()
+
 
 class TestArtifactPathSafety:
     """路径安全校验测试"""
 
-    def test_absolute_path_rejected(self):
-        """绝对路径被拒绝"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "/etc/passwd")
-        assert exc_info.value.status_code == 400
-        assert "Absolute paths not allowed" in exc_info.value.detail
-
-    def test_windows_absolute_path_rejected(self):
-        """Windows 绝对路径被拒绝"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "\\windows\\system32")
-        assert exc_info.value.status_code == 400
-        assert "Absolute paths not allowed" in exc_info.value.detail
-
-    def test_path_traversal_rejected(self):
-        """路径遍历被拒绝"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "../../../etc/passwd")
-        assert exc_info.value.status_code == 400
-        assert "Path traversal not allowed" in exc_info.value.detail
-
-    def test_path_traversal_in_middle_rejected(self):
-        """路径中间的遍历被拒绝"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "tools/../../../etc/passwd")
-        assert exc_info.value.status_code == 400
-        assert "Path traversal not allowed" in exc_info.value.detail
-
-    def test_windows_path_traversal_rejected(self):
-        """Windows 风格路径遍历被拒绝"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "..\\..\\etc\\passwd")
-        assert exc_info.value.status_code == 400
-        assert "Path traversal not allowed" in exc_info.value.detail
-
-    def test_valid_relative_path_file_not_found(self):
-        """合法相对路径但文件不存在返回 404"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "tools/run_pytest/junit.xml")
-        assert exc_info.value.status_code == 404
-        assert "Artifact not found" in exc_info.value.detail
-
-    def test_single_dot_allowed(self):
-        """单点路径组件是允许的（但文件不存在）"""
-        run_id = uuid4()
-        with pytest.raises(HTTPException) as exc_info:
-            _safe_resolve(run_id, "./evidence.json")
-        # 不应该被 traversal 规则拦截，而是文件不存在
-        assert exc_info.value.status_code == 404
+    @pytest.mark.parametrize(
+        ("rel_path", "code", "detail_substr"),
+        [
+            # 绝对路径被拒绝
+            ("/etc/passwd", 400, "Absolute paths not allowed"),
+            # Windows 绝对路径被拒绝
+            ("\\windows\\system32", 400, "Absolute paths not allowed"),
+            # 路径遍历被拒绝
+            ("../../../etc/passwd", 400, "Path traversal not allowed"),
+            # 路径中间的遍历被拒绝
+            ("tools/../../../etc/passwd", 400, "Path traversal not allowed"),
+            # Windows 风格路径遍历被拒绝
+            ("..\\..\\etc\\passwd", 400, "Path traversal not allowed"),
+            # 合法相对路径但文件不存在返回 404
+            ("tools/run_pytest/junit.xml", 404, "Artifact not found"),
+            # 单点路径组件是允许的：不应被 traversal 规则拦截，而是文件不存在
+            ("./evidence.json", 404, "Artifact not found"),
+        ],
+        ids=[
+            "absolute",
+            "windows_absolute",
+            "traversal",
+            "traversal_in_middle",
+            "windows_traversal",
+            "valid_relative_not_found",
+            "single_dot",
+        ],
+    )
+    def test_safe_resolve(self, rel_path, code, detail_substr):
+        """非法路径返回 400，合法但不存在的路径返回 404"""
+        with pytest.raises(HTTPException) as e:
+            _safe_resolve(_ANY_RUN_ID, rel_path)
+        exc = e.value
+        assert exc.status_code == code and detail_substr in exc.detail
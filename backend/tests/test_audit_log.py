@@ -3,12 +3,13 @@
 验证审计日志的写入与查询功能。
 """
 
-import os
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from qualityfoundry.database.config import Base
 from qualityfoundry.database.audit_log_models import AuditEventType, AuditLog
@@ -17,18 +18,45 @@ from qualityfoundry.services.audit_service import (
     is_audit_enabled,
     query_audit_events,
     write_audit_event,
+    write_audit_events_bulk,
+)
+from tests.conftest import (
+    apply_sqlite_test_pragmas,
+    enable_sqlite_savepoints,
+    worker_memory_db_url,
 )
 
 
-@pytest.fixture
-def db_session():
-    """创建独立的数据库会话"""
-    engine = create_engine("sqlite:///:memory:")
+@pytest.fixture(scope="session")
+def audit_engine():
+    """整个测试会话共享一个内存数据库，只建一次表"""
+    engine = create_engine(
+        worker_memory_db_url("auditdb"),
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    enable_sqlite_savepoints(engine)
+    apply_sqlite_test_pragmas(engine)
     Base.metadata.create_all(bind=engine)
-    Session = sessionmaker(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(audit_engine):
+    """在外部事务中打开会话，测试结束后整体回滚
+
+    write_audit_event 内部的 commit 只释放 SAVEPOINT，不会真正落库，
+    因此测试之间互不可见。
+    """
+    connection = audit_engine.connect()
+    trans = connection.begin()
+    Session = sessionmaker(bind=connection, join_transaction_mode="create_savepoint")
     session = Session()
     yield session
     session.close()
+    trans.rollback()
+    connection.close()
 
 
 class TestAuditLogModel:
@@ -74,6 +102,30 @@ class TestAuditService:
         assert log.tool_name == "run_pytest"
         assert log.args_hash is not None
 
+    def test_write_audit_event_reuses_args_hash(self, db_session):
+        """相同参数的重复调用命中哈希缓存"""
+        from qualityfoundry.services.audit_service import _compute_args_hash
+
+        args = {"test_path": "tests/", "retry": 1}
+        first = write_audit_event(
+            db_session,
+            run_id=uuid4(),
+            event_type=AuditEventType.TOOL_STARTED,
+            tool_name="run_pytest",
+            args=args,
+        )
+        hits_before = _compute_args_hash.cache_info().hits
+        second = write_audit_event(
+            db_session,
+            run_id=uuid4(),
+            event_type=AuditEventType.TOOL_STARTED,
+            tool_name="run_pytest",
+            args=dict(args),
+        )
+
+        assert second.args_hash == first.args_hash
+        assert _compute_args_hash.cache_info().hits > hits_before
+
     def test_write_audit_event_with_status(self, db_session):
         """可以写入带状态的审计事件"""
         run_id = uuid4()
@@ -107,26 +159,33 @@ class TestAuditService:
         """可以查询审计事件"""
         run_id = uuid4()
 
-        # 写入多个事件
-        write_audit_event(
-            db_session,
-            run_id=run_id,
-            event_type=AuditEventType.TOOL_STARTED,
-            tool_name="run_pytest",
-        )
-        write_audit_event(
+        # 批量写入多个事件
+        count = write_audit_events_bulk(
             db_session,
-            run_id=run_id,
-            event_type=AuditEventType.TOOL_FINISHED,
-            tool_name="run_pytest",
-            status="success",
+            [
+                {
+                    "run_id": run_id,
+                    "event_type": AuditEventType.TOOL_STARTED,
+                    "tool_name": "run_pytest",
+                    "args": {"test_path": "tests/"},
+                },
+                {
+                    "run_id": run_id,
+                    "event_type": AuditEventType.TOOL_FINISHED,
+                    "tool_name": "run_pytest",
+                    "status": "success",
+                },
+            ],
         )
+        assert count == 2
 
         events = query_audit_events(db_session, run_id)
 
         assert len(events) == 2
         assert events[0].event_type == AuditEventType.TOOL_STARTED
         assert events[1].event_type == AuditEventType.TOOL_FINISHED
+        assert events[0].args_hash is not None
+        assert events[1].status == "success"
 
     def test_query_audit_events_empty(self, db_session):
         """无事件时返回空列表"""
@@ -154,38 +213,48 @@ class TestAuditService:
 class TestFeatureFlag:
     """Feature flag 测试"""
 
-    def test_audit_enabled_default(self):
+    def test_audit_enabled_default(self, monkeypatch):
         """默认启用审计"""
         # 清除环境变量
-        os.environ.pop("AUDIT_LOG_ENABLED", None)
+        monkeypatch.delenv("AUDIT_LOG_ENABLED", raising=False)
         assert is_audit_enabled() is True
 
-    def test_audit_disabled_by_env(self):
+    def test_audit_disabled_by_env(self, monkeypatch):
         """可以通过环境变量禁用"""
-        os.environ["AUDIT_LOG_ENABLED"] = "false"
-        try:
-            assert is_audit_enabled() is False
-        finally:
-            os.environ.pop("AUDIT_LOG_ENABLED", None)
+        monkeypatch.setenv("AUDIT_LOG_ENABLED", "false")
+        assert is_audit_enabled() is False
 
-    def test_write_skipped_when_disabled(self, db_session):
+    def test_write_skipped_when_disabled(self, db_session, monkeypatch):
         """禁用时跳过写入"""
-        os.environ["AUDIT_LOG_ENABLED"] = "false"
-        try:
+        monkeypatch.setenv("AUDIT_LOG_ENABLED", "false")
+        log = write_audit_event(
+            db_session,
+            run_id=uuid4(),
+            event_type=AuditEventType.TOOL_STARTED,
+        )
+        assert log is None
+
+    def test_write_skipped_before_hashing_when_disabled(self, db_session, monkeypatch):
+        """禁用时在计算参数哈希之前就返回"""
+        from qualityfoundry.services import audit_service
+
+        monkeypatch.setenv("AUDIT_LOG_ENABLED", "false")
+        with patch.object(audit_service, "_hash_args") as mock_hash:
             log = write_audit_event(
                 db_session,
                 run_id=uuid4(),
                 event_type=AuditEventType.TOOL_STARTED,
+                args={"test_path": "tests/"},
             )
-            assert log is None
-        finally:
-            os.environ.pop("AUDIT_LOG_ENABLED", None)
+        assert log is None
+        mock_hash.assert_not_called()
 
 
 class TestAuditAPI:
     """审计 API 测试"""
 
-    def test_get_audit_events_empty(self, client):
+    @pytest.mark.asyncio
+    async def test_get_audit_events_empty(self, async_client):
         """查询无事件的运行"""
         from qualityfoundry.main import app
         from qualityfoundry.api.deps.auth_deps import get_current_user
@@ -205,7 +274,7 @@ class TestAuditAPI:
         
         try:
             run_id = uuid4()
-            response = client.get(f"/api/v1/audit/{run_id}")
+            response = await async_client.get(f"/api/v1/audit/{run_id}")
 
             assert response.status_code == 200
             data = response.json()
@@ -222,7 +291,8 @@ class TestAuditAPI:
 class TestRunsListAPI:
     """Runs 列表 API 测试"""
 
-    def test_list_runs_empty(self, client):
+    @pytest.mark.asyncio
+    async def test_list_runs_empty(self, async_client):
         """无运行记录时返回空列表"""
         from qualityfoundry.main import app
         from qualityfoundry.api.deps.auth_deps import get_current_user
@@ -241,7 +311,7 @@ class TestRunsListAPI:
         app.dependency_overrides[get_current_user] = lambda: mock_admin
         
         try:
-            response = client.get("/api/v1/orchestrations/runs")
+            response = await async_client.get("/api/v1/orchestrations/runs")
 
             assert response.status_code == 200
             data = response.json()
@@ -252,7 +322,8 @@ class TestRunsListAPI:
             from tests.conftest import override_get_current_user
             app.dependency_overrides[get_current_user] = override_get_current_user
 
-    def test_list_runs_pagination(self, client):
+    @pytest.mark.asyncio
+    async def test_list_runs_pagination(self, async_client):
         """分页参数生效"""
         from qualityfoundry.main import app
         from qualityfoundry.api.deps.auth_deps import get_current_user
@@ -271,7 +342,7 @@ class TestRunsListAPI:
         app.dependency_overrides[get_current_user] = lambda: mock_admin
         
         try:
-            response = client.get("/api/v1/orchestrations/runs?limit=10&offset=0")
+            response = await async_client.get("/api/v1/orchestrations/runs?limit=10&offset=0")
 
             assert response.status_code == 200
             data = response.json()
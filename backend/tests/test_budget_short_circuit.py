@@ -7,6 +7,8 @@ Tests verify that:
 """
 
 import pytest
+from functools import lru_cache
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from uuid import uuid4
 
@@ -17,16 +19,23 @@ from qualityfoundry.services.orchestrator_service import (
     OrchestrationInput,
     OrchestrationState,
     GovernanceBudget,
+    _build_governance_evidence,
 )
 from qualityfoundry.tools.contracts import ToolRequest, ToolResult
 
 
+@lru_cache
+def _policy_for_timeout(timeout_s: int) -> PolicyConfig:
+    """按超时时间缓存策略实例（PolicyConfig 不可变，可安全共享）"""
+    return PolicyConfig(cost_governance=CostGovernance(timeout_s=timeout_s))
+
+
 class TestEnforceBudget:
     """Tests for _enforce_budget method."""
 
     def test_enforce_budget_exceeds_threshold(self):
         """When elapsed > policy.timeout_s * 1000, should set decision=FAIL and short_circuit=True."""
-        db = MagicMock()
+        db = SimpleNamespace()
         service = OrchestratorService(db)
 
         run_id = uuid4()
@@ -40,7 +49,7 @@ class TestEnforceBudget:
         )
 
         # Policy with 1 second timeout (1000ms)
-        policy = PolicyConfig(cost_governance=CostGovernance(timeout_s=1))
+        policy = _policy_for_timeout(1)
 
         # Budget with 2000ms elapsed (exceeds 1000ms limit)
         budget: GovernanceBudget = {
@@ -68,7 +77,7 @@ class TestEnforceBudget:
 
     def test_enforce_budget_within_threshold(self):
         """When elapsed <= policy.timeout_s * 1000, should not affect state."""
-        db = MagicMock()
+        db = SimpleNamespace()
         service = OrchestratorService(db)
 
         run_id = uuid4()
@@ -82,7 +91,7 @@ class TestEnforceBudget:
         )
 
         # Policy with 10 second timeout (10000ms)
-        policy = PolicyConfig(cost_governance=CostGovernance(timeout_s=10))
+        policy = _policy_for_timeout(10)
 
         # Budget with 500ms elapsed (within 10000ms limit)
         budget: GovernanceBudget = {
@@ -114,7 +123,7 @@ class TestShortCircuitEvidence:
     @pytest.mark.asyncio
     async def test_short_circuit_still_generates_evidence(self):
         """Even when short-circuited, evidence.json should be generated with governance info."""
-        db = MagicMock()
+        db = SimpleNamespace()
 
         # Mock collector
         mock_evidence = MagicMock()
@@ -129,7 +138,7 @@ class TestShortCircuitEvidence:
         mock_collector_factory = MagicMock(return_value=mock_collector)
 
         # Policy with 1 second timeout (1000ms)
-        mock_policy = PolicyConfig(cost_governance=CostGovernance(timeout_s=1))
+        mock_policy = _policy_for_timeout(1)
 
         service = OrchestratorService(
             db,
@@ -188,3 +197,36 @@ class TestShortCircuitEvidence:
         assert "governance" in state["evidence"]
         assert state["evidence"]["governance"]["short_circuited"] is True
         assert state["evidence"]["governance"]["short_circuit_reason"] == "budget_elapsed_exceeded"
+
+
+class TestBuildGovernanceEvidence:
+    """Tests for _build_governance_evidence helper."""
+
+    def test_short_circuited_budget(self):
+        """Short-circuited budget is reported with governance decision source."""
+        budget: GovernanceBudget = {
+            "elapsed_ms_total": 5000,
+            "attempts_total": 2,
+            "retries_used_total": 1,
+            "short_circuited": True,
+            "short_circuit_reason": "budget_elapsed_exceeded",
+        }
+
+        governance = _build_governance_evidence(budget, _policy_for_timeout(1))
+
+        assert governance == {
+            "budget": {"elapsed_ms_total": 5000, "attempts_total": 2, "retries_used_total": 1},
+            "policy_limits": {"timeout_s": 1, "max_retries": 3},
+            "short_circuited": True,
+            "short_circuit_reason": "budget_elapsed_exceeded",
+            "decision_source": "governance_short_circuit",
+        }
+
+    def test_empty_budget_without_policy(self):
+        """Missing budget/policy falls back to zeros and None limits."""
+        governance = _build_governance_evidence({}, None)
+
+        assert governance["budget"]["elapsed_ms_total"] == 0
+        assert governance["policy_limits"] == {"timeout_s": None, "max_retries": None}
+        assert governance["short_circuited"] is False
+        assert governance["decision_source"] == "gate_evaluator"
@@ -1,13 +1,44 @@
-from qualityfoundry.services.compile.compiler import compile_step_to_actions
+import pytest
 
+from qualityfoundry.services.compile.compiler import (
+    _match_step,
+    compile_step_to_actions,
+    compile_steps_to_actions,
+)
 
-def test_compile_goto():
-    actions, warnings = compile_step_to_actions("打开 https://example.com", 15000)
-    assert actions and actions[0]["type"] == "goto"
+
+@pytest.mark.parametrize(
+    ("step", "expected_type", "field", "expected_value"),
+    [
+        ("打开 https://example.com", "goto", "url", "https://example.com"),
+        ('应看到 "Example Domain"', "assert_text", "value", "Example Domain"),
+    ],
+    ids=["goto", "assert_text"],
+)
+def test_compile(step, expected_type, field, expected_value):
+    actions, warnings = compile_step_to_actions(step, 15000)
+    assert actions and actions[0]["type"] == expected_type
+    assert actions[0][field] == expected_value
     assert not warnings
 
 
-def test_compile_assert_text():
-    actions, warnings = compile_step_to_actions('应看到 "Example Domain"', 15000)
-    assert actions and actions[0]["type"] == "assert_text"
-    assert not warnings
+def test_repeated_step_returns_fresh_actions():
+    first, _ = compile_step_to_actions("点击 登录", 15000)
+    first[0]["locator"]["value"] = "mutated"
+    second, _ = compile_step_to_actions("点击 登录", 5000)
+    assert second[0]["locator"]["value"] == "登录"
+    assert second[0]["timeout_ms"] == 5000
+
+
+def test_cached_match_groups_are_read_only():
+    _, groups = _match_step("打开 https://example.com")
+    with pytest.raises(TypeError):
+        groups["navigate_url"] = "https://evil.example"
+    assert _match_step("打开 https://example.com")[1] is groups
+
+
+def test_compile_steps_batch_matches_single():
+    steps = ["打开 https://example.com", "无法识别的步骤", '应看到 "Example Domain"']
+    actions, warnings = compile_steps_to_actions(steps, 15000)
+    assert [a["type"] for a in actions] == ["goto", "assert_text"]
+    assert [w.type for w in warnings] == ["unsupported_step"]
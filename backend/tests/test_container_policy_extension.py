@@ -18,6 +18,7 @@ from qualityfoundry.governance.policy_loader import (
     PolicyConfig,
     SandboxPolicy,
     load_policy,
+    load_policy_from_dict,
 )
 
 
@@ -49,7 +50,7 @@ class TestPolicyLoaderContainerFields:
         assert config.sandbox.container.image == "python:3.11-slim"
 
     def test_load_policy_with_container_section(self, tmp_path: Path):
-        """加载含 container 段的 policy"""
+        """从磁盘加载含 container 段的 policy（经 YAML 解析）"""
         policy_file = tmp_path / "policy.yaml"
         policy_file.write_text("""
 version: "1.0"
@@ -65,6 +66,23 @@ sandbox:
         assert config.sandbox.container.image == "python:3.12-alpine"
         assert config.sandbox.container.network_policy == "all"
 
+    def test_load_policy_from_dict_with_container_section(self):
+        """从字典构建含 container 段的 policy（跳过文件与 YAML 解析）"""
+        config = load_policy_from_dict({
+            "version": "1.0",
+            "sandbox": {
+                "enabled": True,
+                "mode": "container",
+                "container": {
+                    "image": "python:3.12-alpine",
+                    "network_policy": "all",
+                },
+            },
+        })
+        assert config.sandbox.mode == "container"
+        assert config.sandbox.container.image == "python:3.12-alpine"
+        assert config.sandbox.container.network_policy == "all"
+
     def test_load_policy_without_container_uses_defaults(self, tmp_path: Path):
         """无 container 段时使用默认值"""
         policy_file = tmp_path / "policy.yaml"
@@ -4,60 +4,103 @@
 需在 Docker/Podman 可用的环境下运行。
 """
 
+import subprocess
+import uuid
+
 import pytest
 from qualityfoundry.execution.container_sandbox import (
     ContainerSandboxConfig,
     run_in_container,
     is_container_mode_available,
+    _get_container_runtime,
+    _run_args,
 )
 
 # 检查容器运行时是否可用
 CONTAINER_READY = is_container_mode_available()
 
 @pytest.mark.skipif(not CONTAINER_READY, reason="需要 Docker 或 Podman 环境")
+@pytest.mark.xdist_group("docker")  # 并行时串行执行容器用例，避免镜像拉取抖动
 class TestContainerSandbox:
     """Container Sandbox 集成测试"""
 
+    # 隔离参数（禁网 + 只读 workspace）的检查共享一个预热容器，通过 exec 执行；
+    # 预热容器使用与 run_in_container 相同的 _run_args。echo / 超时 / 端到端禁网用例仍完整走 run_in_container。
+    WARM_CONFIG = ContainerSandboxConfig(image="python:3.11-slim", timeout_s=30)
+
+    @pytest.fixture(scope="class")
+    def container_exec(self, tmp_path_factory):
+        """类级预热容器，返回在其中执行命令的函数：cmd -> CompletedProcess"""
+        runtime = _get_container_runtime()
+        workspace = tmp_path_factory.mktemp("workspace")
+        (workspace / "test.txt").write_text("content")
+        output = tmp_path_factory.mktemp("output")
+        name = f"qf-test-warm-{uuid.uuid4().hex[:8]}"
+        subprocess.run(
+            [runtime, "run", "-d", "--rm", "--name", name,
+             *_run_args(self.WARM_CONFIG, workspace, output, None),
+             self.WARM_CONFIG.image, "sleep", "infinity"],
+            check=True, capture_output=True,
+        )
+
+        def _exec(cmd):
+            return subprocess.run(
+                [runtime, "exec", name, *cmd],
+                capture_output=True, text=True, timeout=self.WARM_CONFIG.timeout_s,
+            )
+
+        try:
+            yield _exec
+        finally:
+            subprocess.run([runtime, "kill", name], capture_output=True)
+
     @pytest.mark.asyncio
     async def test_simple_echo(self, tmp_path):
         """测试基础 echo 命令"""
-        config = ContainerSandboxConfig(image="python:3.11-slim", timeout_s=30)
         workspace = tmp_path / "workspace"
         workspace.mkdir()
         output = tmp_path / "output"
-        output.mkdir()
 
         result = await run_in_container(
             ["echo", "hello-container"],
-            config=config,
+            config=self.WARM_CONFIG,
             workspace_path=workspace,
-            output_path=output
+            output_path=output,
         )
 
         assert result.exit_code == 0
         assert "hello-container" in result.stdout
         assert result.mode == "container"
     
-    @pytest.mark.asyncio
-    async def test_network_isolation(self, tmp_path):
+    def test_network_isolation(self, container_exec):
         """测试禁网 (--network none)"""
-        config = ContainerSandboxConfig(image="python:3.11-slim", timeout_s=30, network_policy="deny")
-        workspace = tmp_path / "workspace"
-        workspace.mkdir()
-        output = tmp_path / "output"
-        output.mkdir()
+        assert self.WARM_CONFIG.network_policy == "deny"
 
         # 尝试 ping (在禁网容器中应失败)
         # 注意：slim 镜像可能没有 ping，使用 python 尝试 socket 连接
         cmd = ["python", "-c", "import socket; socket.create_connection(('google.com', 80), timeout=1)"]
         
+        result = container_exec(cmd)
+
+        assert result.returncode != 0
+        assert "Temporary failure in name resolution" in result.stderr or "Network is unreachable" in result.stderr
+
+    @pytest.mark.asyncio
+    async def test_network_isolation_end_to_end(self, tmp_path):
+        """端到端验证 run_in_container 本身的禁网参数（不经预热容器）"""
+        workspace = tmp_path / "workspace"
+        workspace.mkdir()
+        output = tmp_path / "output"
+        cmd = ["python", "-c", "import socket; socket.create_connection(('google.com', 80), timeout=1)"]
+
         result = await run_in_container(
             cmd,
-            config=config,
+            config=self.WARM_CONFIG,
             workspace_path=workspace,
-            output_path=output
+            output_path=output,
         )
 
+        assert result.mode == "container"
         assert result.exit_code != 0
         assert "Temporary failure in name resolution" in result.stderr or "Network is unreachable" in result.stderr
 
@@ -80,24 +123,12 @@ class TestContainerSandbox:
         assert result.killed_by_timeout is True
         assert "killed by timeout" in result.stderr.lower()
 
-    @pytest.mark.asyncio
-    async def test_readonly_workspace(self, tmp_path):
+    def test_readonly_workspace(self, container_exec):
         """测试工作目录只读挂载"""
-        config = ContainerSandboxConfig(image="python:3.11-slim", timeout_s=30, readonly_workspace=True)
-        workspace = tmp_path / "workspace"
-        workspace.mkdir()
-        (workspace / "test.txt").write_text("content")
-        
-        output = tmp_path / "output"
-        output.mkdir()
+        assert self.WARM_CONFIG.readonly_workspace is True
 
         # 尝试写入只读目录应失败
-        result = await run_in_container(
-            ["touch", "/workspace/new-file.txt"],
-            config=config,
-            workspace_path=workspace,
-            output_path=output
-        )
+        result = container_exec(["touch", "/workspace/new-file.txt"])
 
-        assert result.exit_code != 0
+        assert result.returncode != 0
         assert "Read-only file system" in result.stderr
@@ -6,100 +6,142 @@
 from __future__ import annotations
 
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import patch
 
 import pytest
 
 from qualityfoundry.execution.container_sandbox import (
     ContainerNotAvailableError,
     ContainerSandboxConfig,
-    ContainerSandboxResult,
     _detect_container_runtime,
     _is_container_runtime_available,
+    clear_container_runtime_cache,
     run_in_container,
 )
 
 
+class _FakeStream:
+    """模拟 asyncio.StreamReader，read() 一次性返回全部内容"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def read(self) -> bytes:
+        return self._data
+
+
+class _FakeProcess:
+    """轻量的模拟容器进程（stdout/stderr 管道 + wait/kill），避免构造 AsyncMock
+
+    wait_effects 中的异常会在前几次 wait() 时依次抛出，之后 wait() 正常返回。
+    """
+
+    def __init__(self, stdout: bytes, stderr: bytes, returncode: int, wait_effects: tuple = ()):
+        self.stdout = _FakeStream(stdout)
+        self.stderr = _FakeStream(stderr)
+        self.returncode = returncode
+        self._wait_effects = list(wait_effects)
+
+    async def wait(self) -> int:
+        if self._wait_effects:
+            raise self._wait_effects.pop(0)
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
+def _make_proc(
+    stdout: bytes = b"", stderr: bytes = b"", returncode: int = 0, wait_effects: tuple = ()
+) -> _FakeProcess:
+    """构造模拟的容器进程"""
+    return _FakeProcess(stdout, stderr, returncode, wait_effects)
+
+
+# 执行均被 mock，用例只读取挂载路径、从不写入，因此 workspace/output 在模块内共享
+@pytest.fixture(scope="module")
+def workspace(tmp_path_factory):
+    return tmp_path_factory.mktemp("workspace")
+
+
+@pytest.fixture(scope="module")
+def output(tmp_path_factory):
+    return tmp_path_factory.mktemp("output")
+
+
 class TestContainerSandboxConfig:
     """ContainerSandboxConfig 单元测试"""
 
-    def test_default_config(self):
-        config = ContainerSandboxConfig()
-        assert config.image == "python:3.11-slim"
-        assert config.timeout_s == 300
-        assert config.memory_mb == 512
-        assert config.cpus == 1.0
-        assert config.pids_limit == 100
-        assert config.network_policy == "deny"
-        assert config.readonly_workspace is True
-
-    def test_custom_config(self):
-        config = ContainerSandboxConfig(
-            image="python:3.12",
-            timeout_s=60,
-            memory_mb=1024,
-            cpus=2.0,
-            network_policy="all",
-        )
-        assert config.image == "python:3.12"
-        assert config.timeout_s == 60
-        assert config.memory_mb == 1024
-        assert config.cpus == 2.0
-        assert config.network_policy == "all"
-
-
-class TestContainerSandboxResult:
-    """ContainerSandboxResult 单元测试"""
-
-    def test_success_result(self):
-        result = ContainerSandboxResult(
-            exit_code=0,
-            stdout="test passed",
-            stderr="",
-            elapsed_ms=1000,
-            container_id="abc123",
-            image_hash="sha256abc",
-        )
-        assert result.exit_code == 0
-        assert result.mode == "container"
-        assert result.killed_by_timeout is False
-
-    def test_timeout_result(self):
-        result = ContainerSandboxResult(
-            exit_code=-1,
-            killed_by_timeout=True,
-            elapsed_ms=60000,
-        )
-        assert result.killed_by_timeout is True
+    @pytest.mark.parametrize(
+        ("kwargs", "expected"),
+        [
+            (
+                {},
+                {
+                    "image": "python:3.11-slim",
+                    "timeout_s": 300,
+                    "memory_mb": 512,
+                    "cpus": 1.0,
+                    "pids_limit": 100,
+                    "network_policy": "deny",
+                    "readonly_workspace": True,
+                },
+            ),
+            (
+                {
+                    "image": "python:3.12",
+                    "timeout_s": 60,
+                    "memory_mb": 1024,
+                    "cpus": 2.0,
+                    "network_policy": "all",
+                },
+                {
+                    "image": "python:3.12",
+                    "timeout_s": 60,
+                    "memory_mb": 1024,
+                    "cpus": 2.0,
+                    "network_policy": "all",
+                },
+            ),
+        ],
+        ids=["default", "custom"],
+    )
+    def test_config(self, kwargs, expected):
+        config = ContainerSandboxConfig(**kwargs)
+        for attr, value in expected.items():
+            assert getattr(config, attr) == value
 
 
 class TestRuntimeDetection:
     """容器运行时检测测试"""
 
-    @patch("shutil.which")
-    def test_docker_available(self, mock_which):
-        mock_which.side_effect = lambda x: "/usr/bin/docker" if x == "docker" else None
-        runtime = _detect_container_runtime()
-        assert runtime == "docker"
+    @pytest.mark.parametrize(
+        ("which_map", "expected"),
+        [
+            ({"docker": "/usr/bin/docker", "podman": "/usr/bin/podman"}, "docker"),
+            ({"podman": "/usr/bin/podman"}, "podman"),
+            ({}, None),
+        ],
+        ids=["docker", "podman_fallback", "no_runtime"],
+    )
+    def test_runtime_detection(self, which_map, expected):
+        with patch("shutil.which", side_effect=which_map.get):
+            assert _detect_container_runtime() == expected
+            clear_container_runtime_cache()
+            assert _is_container_runtime_available() == (expected is not None, expected)
 
     @patch("shutil.which")
-    def test_podman_fallback(self, mock_which):
-        mock_which.side_effect = lambda x: "/usr/bin/podman" if x == "podman" else None
-        runtime = _detect_container_runtime()
-        assert runtime == "podman"
+    def test_runtime_probe_is_cached(self, mock_which):
+        mock_which.return_value = "/usr/bin/docker"
+        _is_container_runtime_available()
+        _is_container_runtime_available()
+        assert mock_which.call_count == 1
 
-    @patch("shutil.which")
-    def test_no_runtime(self, mock_which):
+        clear_container_runtime_cache()
         mock_which.return_value = None
-        runtime = _detect_container_runtime()
-        assert runtime is None
-
-    @patch("shutil.which")
-    def test_is_container_runtime_available(self, mock_which):
-        mock_which.return_value = "/usr/bin/docker"
         available, name = _is_container_runtime_available()
-        assert available is True
-        assert name == "docker"
+        assert available is False
+        assert name is None
 
 
 class TestRunInContainer:
@@ -110,18 +152,15 @@ class TestRunInContainer:
         return ContainerSandboxConfig(timeout_s=60)
 
     @pytest.fixture
-    def workspace(self, tmp_path):
-        ws = tmp_path / "workspace"
-        ws.mkdir()
-        return ws
-
-    @pytest.fixture
-    def output(self, tmp_path):
-        out = tmp_path / "output"
-        out.mkdir()
-        return out
+    def mocks(self):
+        """(create_subprocess_exec, 运行时探测, 镜像 hash) 三个 mock，默认 docker 可用"""
+        with patch("asyncio.create_subprocess_exec") as mock_subprocess, \
+                patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available") as mock_runtime, \
+                patch("qualityfoundry.execution.container_sandbox._get_image_hash") as mock_hash:
+            mock_runtime.return_value = (True, "docker")
+            mock_hash.return_value = "abc123"
+            yield mock_subprocess, mock_runtime, mock_hash
 
-    @pytest.mark.asyncio
     @patch("shutil.which")
     async def test_container_not_available_raises(self, mock_which, config, workspace, output):
         mock_which.return_value = None
@@ -136,21 +175,9 @@ class TestRunInContainer:
         
         assert "docker/podman" in str(exc_info.value)
 
-    @pytest.mark.asyncio
-    @patch("qualityfoundry.execution.container_sandbox._get_image_hash")
-    @patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available")
-    @patch("asyncio.create_subprocess_exec")
-    async def test_successful_execution(
-        self, mock_subprocess, mock_runtime, mock_hash, config, workspace, output
-    ):
-        # Setup mocks
-        mock_runtime.return_value = (True, "docker")
-        mock_hash.return_value = "abc123def456"
-        
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"test passed", b"")
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+    async def test_successful_execution(self, mocks, config, workspace, output):
+        mock_subprocess, _, _ = mocks
+        mock_subprocess.return_value = _make_proc(stdout=b"test passed")
         
         result = await run_in_container(
             ["python", "-m", "pytest"],
@@ -161,6 +188,7 @@ class TestRunInContainer:
         
         assert result.exit_code == 0
         assert result.mode == "container"
+        assert result.killed_by_timeout is False
         assert "test passed" in result.stdout
         mock_subprocess.assert_called_once()
         
@@ -171,23 +199,15 @@ class TestRunInContainer:
         assert "--network=none" in call_args
         assert "--rm" in call_args
 
-    @pytest.mark.asyncio
-    @patch("qualityfoundry.execution.container_sandbox._get_image_hash")
-    @patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available")
-    @patch("asyncio.create_subprocess_exec")
-    async def test_timeout_kills_container(
-        self, mock_subprocess, mock_runtime, mock_hash, workspace, output
-    ):
+    async def test_timeout_kills_container(self, mocks, workspace, output):
+        mock_subprocess, _, _ = mocks
         # Short timeout config
         config = ContainerSandboxConfig(timeout_s=1)
-        mock_runtime.return_value = (True, "docker")
-        mock_hash.return_value = "abc123"
         
-        # Mock process that times out
-        mock_process = AsyncMock()
-        mock_process.communicate.side_effect = asyncio.TimeoutError()
-        mock_process.wait = AsyncMock()
-        mock_subprocess.return_value = mock_process
+        # Mock process that times out: 首次 wait 超时，kill 与再次 wait 正常返回
+        mock_subprocess.return_value = _make_proc(
+            stdout=b"partial output", returncode=-9, wait_effects=(asyncio.TimeoutError(),)
+        )
         
         result = await run_in_container(
             ["python", "-m", "pytest"],
@@ -197,22 +217,14 @@ class TestRunInContainer:
         )
         
         assert result.killed_by_timeout is True
-        # Exit code may vary depending on mock setup, key is killed_by_timeout=True
-
-    @pytest.mark.asyncio
-    @patch("qualityfoundry.execution.container_sandbox._get_image_hash")
-    @patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available")
-    @patch("asyncio.create_subprocess_exec")
-    async def test_network_disabled_by_default(
-        self, mock_subprocess, mock_runtime, mock_hash, config, workspace, output
-    ):
-        mock_runtime.return_value = (True, "docker")
-        mock_hash.return_value = "abc123"
+        # 超时前产生的输出被保留
+        assert result.stdout == "partial output"
+        assert "killed by timeout" in result.stderr.lower()
+
+    async def test_network_disabled_by_default(self, mocks, config, workspace, output):
+        mock_subprocess, _, _ = mocks
         
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"")
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        mock_subprocess.return_value = _make_proc()
         
         await run_in_container(
             ["python", "-c", "print('hello')"],
@@ -224,20 +236,10 @@ class TestRunInContainer:
         call_args = mock_subprocess.call_args[0]
         assert "--network=none" in call_args
 
-    @pytest.mark.asyncio
-    @patch("qualityfoundry.execution.container_sandbox._get_image_hash")
-    @patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available")
-    @patch("asyncio.create_subprocess_exec")
-    async def test_readonly_workspace_mount(
-        self, mock_subprocess, mock_runtime, mock_hash, config, workspace, output
-    ):
-        mock_runtime.return_value = (True, "docker")
-        mock_hash.return_value = "abc123"
+    async def test_readonly_workspace_mount(self, mocks, config, workspace, output):
+        mock_subprocess, _, _ = mocks
         
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"")
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        mock_subprocess.return_value = _make_proc()
         
         await run_in_container(
             ["python", "-c", "print('hello')"],
@@ -255,25 +257,15 @@ class TestRunInContainer:
                     assert ":ro" in mount_arg
                     break
 
-    @pytest.mark.asyncio
-    @patch("qualityfoundry.execution.container_sandbox._get_image_hash")
-    @patch("qualityfoundry.execution.container_sandbox._is_container_runtime_available")
-    @patch("asyncio.create_subprocess_exec")
-    async def test_resource_limits_in_command(
-        self, mock_subprocess, mock_runtime, mock_hash, workspace, output
-    ):
+    async def test_resource_limits_in_command(self, mocks, workspace, output):
+        mock_subprocess, _, _ = mocks
         config = ContainerSandboxConfig(
             memory_mb=1024,
             cpus=2.0,
             pids_limit=50,
         )
-        mock_runtime.return_value = (True, "docker")
-        mock_hash.return_value = "abc123"
         
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"")
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        mock_subprocess.return_value = _make_proc()
         
         await run_in_container(
             ["python", "-c", "print('hello')"],
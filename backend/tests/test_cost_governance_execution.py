@@ -42,8 +42,8 @@ async def fake_fail_tool(request: ToolRequest) -> ToolResult:
 
 
 async def fake_slow_tool(request: ToolRequest) -> ToolResult:
-    """Sleeps longer than typical timeout."""
-    await asyncio.sleep(10)  # 10 seconds
+    """Never completes on its own; returns only if not cancelled by the timeout."""
+    await asyncio.Event().wait()
     return ToolResult(
         status=ToolStatus.SUCCESS,
         stdout="should not reach here",
@@ -51,6 +51,25 @@ async def fake_slow_tool(request: ToolRequest) -> ToolResult:
     )
 
 
+# 超时用例的每次尝试时长（秒）。ToolRequest 校验要求 timeout_s >= 1，
+# 这里用 model_copy 绕过校验，避免每次尝试都真实等待 1 秒。
+FAST_TIMEOUT_S = 0.05
+
+# 基准请求只校验构造一次，各用例通过 _req 克隆并覆盖差异字段
+_BASE_REQUEST = ToolRequest(
+    tool_name="tool",
+    run_id=uuid4(),
+    args={},
+    timeout_s=10,
+    max_retries=0,
+)
+
+
+def _req(**overrides) -> ToolRequest:
+    """Clone the baseline request with a fresh run_id and the given overrides."""
+    return _BASE_REQUEST.model_copy(update={"run_id": uuid4(), **overrides})
+
+
 class FailThenSucceedTool:
     """Fails N times, then succeeds."""
 
@@ -79,16 +98,9 @@ class FailThenSucceedTool:
 class TestGovernanceTimeout:
     """超时强制测试"""
 
-    @pytest.mark.asyncio
     async def test_timeout_triggers_on_slow_tool(self):
-        """timeout_s=0.1 时慢工具必须触发超时"""
-        request = ToolRequest(
-            tool_name="slow_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=1,  # 1 second timeout, tool sleeps 10s
-            max_retries=0,
-        )
+        """超时很短时慢工具必须触发超时"""
+        request = _req(tool_name="slow_tool", timeout_s=FAST_TIMEOUT_S, max_retries=0)
 
         result = await execute_with_governance(fake_slow_tool, request)
 
@@ -98,16 +110,9 @@ class TestGovernanceTimeout:
         assert result.metrics.retries_used == 0
         assert "超时" in result.error_message.lower()
 
-    @pytest.mark.asyncio
     async def test_fast_tool_completes_within_timeout(self):
         """快速工具在超时前完成"""
-        request = ToolRequest(
-            tool_name="fast_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=0,
-        )
+        request = _req(tool_name="fast_tool", max_retries=0)
 
         result = await execute_with_governance(fake_success_tool, request)
 
@@ -119,16 +124,17 @@ class TestGovernanceTimeout:
 class TestGovernanceRetry:
     """重试机制测试"""
 
-    @pytest.mark.asyncio
+    @pytest.fixture(autouse=True)
+    def _no_sleep(self, monkeypatch):
+        """重试间的退避等待置为空操作，纯逻辑用例不消耗真实时间"""
+        async def _noop(*_args, **_kwargs):
+            return None
+
+        monkeypatch.setattr("qualityfoundry.tools.base.asyncio.sleep", _noop)
+
     async def test_no_retry_on_success(self):
         """成功时不应重试"""
-        request = ToolRequest(
-            tool_name="success_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=3,
-        )
+        request = _req(tool_name="success_tool", max_retries=3)
 
         result = await execute_with_governance(fake_success_tool, request)
 
@@ -136,16 +142,9 @@ class TestGovernanceRetry:
         assert result.metrics.attempts == 1
         assert result.metrics.retries_used == 0
 
-    @pytest.mark.asyncio
     async def test_retry_on_failure(self):
         """失败时应重试直到 max_retries"""
-        request = ToolRequest(
-            tool_name="fail_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=3,
-        )
+        request = _req(tool_name="fail_tool", max_retries=3)
 
         result = await execute_with_governance(fake_fail_tool, request)
 
@@ -154,17 +153,10 @@ class TestGovernanceRetry:
         assert result.metrics.attempts == 4
         assert result.metrics.retries_used == 3
 
-    @pytest.mark.asyncio
     async def test_retry_success_after_failures(self):
         """失败后重试成功"""
         tool = FailThenSucceedTool(fail_count=2)  # Fail twice, then succeed
-        request = ToolRequest(
-            tool_name="flaky_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=3,
-        )
+        request = _req(tool_name="flaky_tool", max_retries=3)
 
         result = await execute_with_governance(tool, request)
 
@@ -173,16 +165,9 @@ class TestGovernanceRetry:
         assert result.metrics.retries_used == 2
         assert tool.call_count == 3
 
-    @pytest.mark.asyncio
     async def test_no_retry_when_max_retries_zero(self):
         """max_retries=0 时不重试"""
-        request = ToolRequest(
-            tool_name="fail_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=0,
-        )
+        request = _req(tool_name="fail_tool", max_retries=0)
 
         result = await execute_with_governance(fake_fail_tool, request)
 
@@ -194,16 +179,9 @@ class TestGovernanceRetry:
 class TestGovernanceMetrics:
     """治理指标测试"""
 
-    @pytest.mark.asyncio
     async def test_metrics_fields_exist(self):
         """验证 metrics 包含所有治理字段"""
-        request = ToolRequest(
-            tool_name="success_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=0,
-        )
+        request = _req(tool_name="success_tool", max_retries=0)
 
         result = await execute_with_governance(fake_success_tool, request)
 
@@ -212,16 +190,9 @@ class TestGovernanceMetrics:
         assert hasattr(result.metrics, "timed_out")
         assert hasattr(result.metrics, "duration_ms")
 
-    @pytest.mark.asyncio
     async def test_duration_ms_tracks_total_time(self):
         """duration_ms 应跟踪总执行时间"""
-        request = ToolRequest(
-            tool_name="success_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=10,
-            max_retries=0,
-        )
+        request = _req(tool_name="success_tool", max_retries=0)
 
         result = await execute_with_governance(fake_success_tool, request)
 
@@ -231,16 +202,9 @@ class TestGovernanceMetrics:
 class TestGovernanceCombined:
     """组合场景测试"""
 
-    @pytest.mark.asyncio
     async def test_timeout_with_retry(self):
         """超时后重试"""
-        request = ToolRequest(
-            tool_name="slow_tool",
-            run_id=uuid4(),
-            args={},
-            timeout_s=1,  # 1 second timeout
-            max_retries=2,
-        )
+        request = _req(tool_name="slow_tool", timeout_s=FAST_TIMEOUT_S, max_retries=2)
 
         result = await execute_with_governance(fake_slow_tool, request)
 
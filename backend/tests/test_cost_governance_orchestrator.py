@@ -16,14 +16,27 @@ from qualityfoundry.services.orchestrator_service import (
     LangGraphState,
 )
 
+# 用例只断言 budget/governance 结构，与 run_id 取值无关，模块内共用一个
+RUN_ID = uuid4()
+
+
+@pytest.fixture(scope="module")
+def gb_hints():
+    """GovernanceBudget 的类型注解（解析一次，模块内复用）"""
+    return get_type_hints(GovernanceBudget)
+
+
+@pytest.fixture(scope="module")
+def lgs_hints():
+    """LangGraphState 的类型注解（解析一次，模块内复用）"""
+    return get_type_hints(LangGraphState)
+
 
 class TestGovernanceBudgetType:
     """GovernanceBudget 类型测试"""
 
-    def test_governance_budget_has_required_fields(self):
+    def test_governance_budget_has_required_fields(self, gb_hints):
         """验证 GovernanceBudget 包含所有必要字段"""
-        hints = get_type_hints(GovernanceBudget)
-
         required_fields = [
             "elapsed_ms_total",
             "attempts_total",
@@ -32,43 +45,28 @@ class TestGovernanceBudgetType:
             "short_circuit_reason",
         ]
         for field in required_fields:
-            assert field in hints, f"Missing field: {field}"
-
-    def test_governance_budget_can_be_instantiated(self):
-        """验证 GovernanceBudget 可以实例化"""
-        budget: GovernanceBudget = {
-            "elapsed_ms_total": 1000,
-            "attempts_total": 3,
-            "retries_used_total": 2,
-            "short_circuited": False,
-            "short_circuit_reason": None,
-        }
-        assert budget["elapsed_ms_total"] == 1000
-        assert budget["attempts_total"] == 3
+            assert field in gb_hints, f"Missing field: {field}"
 
 
 class TestLangGraphStateWithBudget:
     """LangGraphState 包含 budget 字段测试"""
 
-    def test_langgraph_state_has_budget_field(self):
+    def test_langgraph_state_has_budget_field(self, lgs_hints):
         """验证 LangGraphState 包含 budget 字段"""
-        hints = get_type_hints(LangGraphState)
-        assert "budget" in hints
+        assert "budget" in lgs_hints
 
-    def test_langgraph_state_budget_is_governance_budget(self):
+    def test_langgraph_state_budget_is_governance_budget(self, lgs_hints):
         """验证 budget 字段类型正确"""
-        hints = get_type_hints(LangGraphState)
-        assert hints["budget"] == GovernanceBudget
+        assert lgs_hints["budget"] == GovernanceBudget
 
 
+# 显式运行在会话级共享事件循环上（与 pyproject 中的默认值一致），不逐用例创建新循环
+@pytest.mark.asyncio(loop_scope="session")
 class TestExecuteToolsWithGovernance:
     """_execute_tools 集成 governance 测试"""
 
-    @pytest.mark.asyncio
-    async def test_execute_tools_populates_budget(self, setup_database):
+    async def test_execute_tools_populates_budget(self, db):
         """验证 _execute_tools 填充 budget"""
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
         from qualityfoundry.services.orchestrator_service import (
             OrchestratorService,
             OrchestrationInput,
@@ -76,17 +74,11 @@ class TestExecuteToolsWithGovernance:
         from qualityfoundry.governance.policy_loader import PolicyConfig
         from qualityfoundry.tools.contracts import ToolRequest
 
-        # Create in-memory DB session
-        engine = create_engine("sqlite:///:memory:")
-        Session = sessionmaker(bind=engine)
-        db = Session()
-
         service = OrchestratorService(db=db)
-        run_id = uuid4()
 
         # Create minimal state
         state = {
-            "run_id": run_id,
+            "run_id": RUN_ID,
             "input": OrchestrationInput(
                 nl_input="test",
                 environment_id=None,
@@ -99,7 +91,7 @@ class TestExecuteToolsWithGovernance:
             "tool_request": ToolRequest(
                 tool_name="nonexistent_tool",
                 args={},
-                run_id=run_id,
+                run_id=RUN_ID,
                 timeout_s=10,
             ),
         }
@@ -114,16 +106,12 @@ class TestExecuteToolsWithGovernance:
         assert "retries_used_total" in budget
         assert budget["attempts_total"] >= 1
 
-        db.close()
-
 
 class TestEvidenceGovernanceField:
     """Evidence 包含 governance 字段测试"""
 
-    def test_collect_evidence_includes_governance(self, setup_database):
+    def test_collect_evidence_includes_governance(self, db):
         """验证 _collect_evidence 在 evidence 中包含 governance"""
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
         from qualityfoundry.services.orchestrator_service import (
             OrchestratorService,
             OrchestrationInput,
@@ -131,17 +119,11 @@ class TestEvidenceGovernanceField:
         from qualityfoundry.governance.policy_loader import PolicyConfig
         from qualityfoundry.tools.contracts import ToolRequest, ToolResult, ToolStatus, ToolMetrics
 
-        # Create in-memory DB session
-        engine = create_engine("sqlite:///:memory:")
-        Session = sessionmaker(bind=engine)
-        db = Session()
-
         service = OrchestratorService(db=db)
-        run_id = uuid4()
 
         # Create state with budget
         state = {
-            "run_id": run_id,
+            "run_id": RUN_ID,
             "input": OrchestrationInput(
                 nl_input="test governance evidence",
                 environment_id=None,
@@ -154,7 +136,7 @@ class TestEvidenceGovernanceField:
             "tool_request": ToolRequest(
                 tool_name="test_tool",
                 args={},
-                run_id=run_id,
+                run_id=RUN_ID,
                 timeout_s=10,
             ),
             "tool_result": ToolResult(
@@ -186,5 +168,3 @@ class TestEvidenceGovernanceField:
         assert gov["budget"]["elapsed_ms_total"] == 500
         assert gov["budget"]["attempts_total"] == 2
         assert gov["budget"]["retries_used_total"] == 1
-
-        db.close()
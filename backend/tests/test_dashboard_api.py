@@ -9,24 +9,41 @@
 6. test_dashboard_summary_recent_runs_contract - recent_runs 字段契约
 """
 
-import pytest
-from uuid import uuid4
-from fastapi.testclient import TestClient
+from contextlib import contextmanager
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
 
 from qualityfoundry.main import app
 from qualityfoundry.api.deps.auth_deps import get_current_user
+from qualityfoundry.api.v1.routes_dashboard import get_dashboard_summary
 from qualityfoundry.database.user_models import User, UserRole
 
+# client 使用 conftest 中会话级共享的 TestClient，各用例只切换认证依赖
+
+
+@contextmanager
+def override_user(user):
+    """临时覆盖 get_current_user，退出时恢复原覆盖
 
-@pytest.fixture
-def client():
-    return TestClient(app)
+    user 可以是 User 实例，也可以是依赖函数（如抛出 401 的 no_auth）。
+    """
+    user_provider = user if callable(user) else (lambda: user)
+    original_override = app.dependency_overrides.get(get_current_user)
+    app.dependency_overrides[get_current_user] = user_provider
+    try:
+        yield
+    finally:
+        if original_override:
+            app.dependency_overrides[get_current_user] = original_override
+        else:
+            app.dependency_overrides.pop(get_current_user, None)
 
 
-def create_mock_user(role: UserRole, username: str = "mock_user") -> User:
-    """创建 mock 用户对象"""
+def create_mock_user(role: UserRole, username: str = "mock_user", user_id: UUID | None = None) -> User:
+    """创建 mock 用户对象（未指定 user_id 时随机生成）"""
     return User(
-        id=uuid4(),
+        id=user_id or uuid4(),
         username=username,
         password_hash="mock_hash",
         email=f"{username}@test.com",
@@ -36,36 +53,27 @@ def create_mock_user(role: UserRole, username: str = "mock_user") -> User:
     )
 
 
+
+# 各角色的 mock 用户在模块导入时构建一次，用例之间复用
+MOCK_ADMIN = create_mock_user(UserRole.ADMIN, "test_admin_dash", UUID(int=1))
+MOCK_USER = create_mock_user(UserRole.USER, "test_user_dash", UUID(int=2))
+MOCK_VIEWER = create_mock_user(UserRole.VIEWER, "test_viewer_dash", UUID(int=3))
+
 class TestDashboardSummaryAuth:
     """权限相关测试"""
     
     def test_dashboard_summary_401_no_token(self, client):
         """无 token 返回 401"""
-        # 临时移除默认 mock，模拟无认证场景
-        original_override = app.dependency_overrides.get(get_current_user)
-        
-        # 设置为抛出异常
         def no_auth():
-            from fastapi import HTTPException
             raise HTTPException(status_code=401, detail="未认证")
-        
-        app.dependency_overrides[get_current_user] = no_auth
-        
-        try:
+
+        with override_user(no_auth):
             resp = client.get("/api/v1/dashboard/summary")
             assert resp.status_code == 401, f"Expected 401, got {resp.status_code}"
-        finally:
-            if original_override:
-                app.dependency_overrides[get_current_user] = original_override
-            else:
-                app.dependency_overrides.pop(get_current_user, None)
-    
+
     def test_dashboard_summary_viewer_can_access(self, client):
         """VIEWER 有 OrchestrationRead 权限可访问（无 audit_summary）"""
-        mock_viewer = create_mock_user(UserRole.VIEWER, "test_viewer_dash")
-        app.dependency_overrides[get_current_user] = lambda: mock_viewer
-        
-        try:
+        with override_user(MOCK_VIEWER):
             resp = client.get("/api/v1/dashboard/summary")
             # VIEWER 有 ORCHESTRATION_READ 权限，可以访问
             assert resp.status_code == 200, f"Expected 200, got {resp.status_code}"
@@ -73,9 +81,6 @@ class TestDashboardSummaryAuth:
             assert "cards" in data
             # VIEWER 不是 ADMIN，不应该有 audit_summary
             assert data["audit_summary"] is None
-        finally:
-            from tests.conftest import override_get_current_user
-            app.dependency_overrides[get_current_user] = override_get_current_user
 
 
 class TestDashboardSummarySuccess:
@@ -83,10 +88,7 @@ class TestDashboardSummarySuccess:
     
     def test_dashboard_summary_success_admin(self, client):
         """ADMIN 成功并返回 audit_summary"""
-        mock_admin = create_mock_user(UserRole.ADMIN, "test_admin_dash")
-        app.dependency_overrides[get_current_user] = lambda: mock_admin
-        
-        try:
+        with override_user(MOCK_ADMIN):
             resp = client.get("/api/v1/dashboard/summary")
             assert resp.status_code == 200
             data = resp.json()
@@ -101,16 +103,10 @@ class TestDashboardSummarySuccess:
             assert data["audit_summary"] is not None
             assert "total_events" in data["audit_summary"]
             assert "runs_with_events" in data["audit_summary"]
-        finally:
-            from tests.conftest import override_get_current_user
-            app.dependency_overrides[get_current_user] = override_get_current_user
     
     def test_dashboard_summary_success_user(self, client):
         """USER 成功（无 audit_summary，因为 USER != ADMIN）"""
-        mock_user = create_mock_user(UserRole.USER, "test_user_dash")
-        app.dependency_overrides[get_current_user] = lambda: mock_user
-        
-        try:
+        with override_user(MOCK_USER):
             resp = client.get("/api/v1/dashboard/summary")
             assert resp.status_code == 200
             data = resp.json()
@@ -128,53 +124,42 @@ class TestDashboardSummarySuccess:
             
             # USER 不是 ADMIN，不应该有 audit_summary
             assert data["audit_summary"] is None
-        finally:
-            from tests.conftest import override_get_current_user
-            app.dependency_overrides[get_current_user] = override_get_current_user
 
 
 class TestDashboardSummaryContract:
-    """契约测试"""
-    
-    def test_dashboard_summary_trend_missing_fields(self, client):
+    """契约测试
+
+    只校验响应结构，直接调用路由函数（注入 db 与当前用户），跳过 ASGI 栈；
+    完整 HTTP 链路由 test_dashboard_summary_success_admin 覆盖。
+    """
+
+    @staticmethod
+    def _summary(db) -> dict:
+        """以 ADMIN 身份调用 get_dashboard_summary，返回与响应 JSON 等价的字典"""
+        response = get_dashboard_summary(days=7, limit=50, db=db, current_user=MOCK_ADMIN)
+        return response.model_dump(mode="json")
+
+    def test_dashboard_summary_trend_missing_fields(self, db):
         """trend 缺字段时容错（elapsed_ms 可为 null）"""
-        mock_admin = create_mock_user(UserRole.ADMIN, "test_admin_trend")
-        app.dependency_overrides[get_current_user] = lambda: mock_admin
-        
-        try:
-            resp = client.get("/api/v1/dashboard/summary")
-            assert resp.status_code == 200
-            data = resp.json()
-            
-            # trend 中每个点应有基础字段
-            for point in data["trend"]:
-                assert "run_id" in point
-                assert "started_at" in point
-                # elapsed_ms 可为 null
-                assert "elapsed_ms" in point  # 字段存在即可
-        finally:
-            from tests.conftest import override_get_current_user
-            app.dependency_overrides[get_current_user] = override_get_current_user
-    
-    def test_dashboard_summary_recent_runs_contract(self, client):
+        data = self._summary(db)
+
+        # trend 中每个点应有基础字段
+        for point in data["trend"]:
+            assert "run_id" in point
+            assert "started_at" in point
+            # elapsed_ms 可为 null
+            assert "elapsed_ms" in point  # 字段存在即可
+
+    def test_dashboard_summary_recent_runs_contract(self, db):
         """recent_runs 字段契约验证"""
-        mock_admin = create_mock_user(UserRole.ADMIN, "test_admin_contract")
-        app.dependency_overrides[get_current_user] = lambda: mock_admin
-        
-        try:
-            resp = client.get("/api/v1/dashboard/summary")
-            assert resp.status_code == 200
-            data = resp.json()
-            
-            # recent_runs 中每项应有必需字段
-            for run in data["recent_runs"]:
-                assert "run_id" in run
-                assert "started_at" in run
-                assert "decision" in run
-                assert "tool_count" in run
-                # 可选字段存在即可
-                assert "policy_version" in run
-                assert "policy_hash" in run
-        finally:
-            from tests.conftest import override_get_current_user
-            app.dependency_overrides[get_current_user] = override_get_current_user
+        data = self._summary(db)
+
+        # recent_runs 中每项应有必需字段
+        for run in data["recent_runs"]:
+            assert "run_id" in run
+            assert "started_at" in run
+            assert "decision" in run
+            assert "tool_count" in run
+            # 可选字段存在即可
+            assert "policy_version" in run
+            assert "policy_hash" in run
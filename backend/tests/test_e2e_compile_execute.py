@@ -4,119 +4,87 @@ End-to-end test: Compile → Execute workflow
 
 注意：这些测试需要 Playwright 浏览器，在 CI 环境中可能会跳过
 """
-import os
 import pytest
+from functools import lru_cache
 from pathlib import Path
-from qualityfoundry.services.compile.compiler import compile_step_to_actions
-from qualityfoundry.models.schemas import Action, ExecutionRequest
+from qualityfoundry.services.compile.compiler import compile_step_to_actions, compile_steps_to_actions
+from qualityfoundry.models.schemas import Action, ActionType, ExecutionRequest, Locator
 from qualityfoundry.runners.playwright.runner import run_actions
 
-# 检测是否在 CI 环境中运行
-IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
 
+@lru_cache(maxsize=None)
+def _compile(step: str) -> tuple[tuple[dict, ...], tuple]:
+    """编译单个步骤（按步骤文本缓存，模块内重复步骤只编译一次）
 
-@pytest.mark.skipif(IN_CI, reason="Playwright 测试需要浏览器，在 CI 中跳过")
+    返回元组视为只读；需要修改 action 的用例应自行拷贝。
+    """
+    actions, warnings = compile_step_to_actions(step, timeout_ms=10000)
+    return tuple(actions), tuple(warnings)
+
+
+def _to_action(raw: dict) -> Action:
+    """把编译器输出转换为 Action（编译器是信任边界，跳过 Pydantic 校验直接构造）"""
+    locator = raw.get("locator")
+    return Action.model_construct(
+        **{
+            **raw,
+            "type": ActionType(raw["type"]),
+            "locator": Locator.model_construct(**locator) if locator else None,
+        }
+    )
+
+
+def test_login_scenario_compile():
+    """测试完整登录场景的编译（纯编译，不需要浏览器）"""
+    login_steps = [
+        "打开 https://example.com",
+        "输入用户名admin",
+        "输入密码123456",
+        "点击登录",
+        "看到Example Domain"
+    ]
+
+    all_actions, all_warnings = compile_steps_to_actions(login_steps, timeout_ms=10000)
+
+    # 验证编译成功
+    assert len(all_warnings) == 0, f"Unexpected warnings: {all_warnings}"
+    assert [a["type"] for a in all_actions] == ["goto", "fill", "fill", "click", "assert_text"]
+
+    # 免校验构造与正常校验构造结果一致
+    assert [_to_action(a) for a in all_actions] == [Action(**a) for a in all_actions]
+
+
+@pytest.mark.xdist_group("playwright")  # 并行时固定在同一 worker，只启动一个 Chromium
 class TestEndToEndCompileExecute:
-    """端到端测试：编译 → 执行"""
-
-    def test_login_scenario_compile_to_execute(self, tmp_path: Path):
-        """测试完整登录场景：编译 → 执行"""
-        # 定义登录场景步骤
-        login_steps = [
-            "打开 https://example.com",
-            "输入用户名admin",
-            "输入密码123456",
-            "点击登录",
-            "看到Example Domain"
-        ]
-        
-        # 步骤1：编译所有步骤
-        all_actions = []
-        all_warnings = []
-        
-        for step in login_steps:
-            actions, warnings = compile_step_to_actions(step, timeout_ms=10000)
-            all_actions.extend(actions)
-            all_warnings.extend(warnings)
-        
-        # 验证编译成功
-        assert len(all_actions) == 5, f"Expected 5 actions, got {len(all_actions)}"
-        assert len(all_warnings) == 0, f"Unexpected warnings: {all_warnings}"
-        
-        # 验证编译后的 action 类型
-        assert all_actions[0]["type"] == "goto"
-        assert all_actions[1]["type"] == "fill"
-        assert all_actions[2]["type"] == "fill"
-        assert all_actions[3]["type"] == "click"
-        assert all_actions[4]["type"] == "assert_text"
-        
-        print("\n✅ 编译成功:")
-        for i, action in enumerate(all_actions):
-            print(f"  Step {i}: {action['type']}")
-
-    def test_simple_navigation_e2e(self, tmp_path: Path):
-        """测试简单导航场景的端到端流程"""
-        # 编译步骤
-        step = "打开 https://example.com"
-        actions, warnings = compile_step_to_actions(step, timeout_ms=10000)
-        
-        assert len(actions) == 1
-        assert len(warnings) == 0
-        assert actions[0]["type"] == "goto"
-        
-        # 转换为 Action 对象并执行
-        action_obj = Action(**actions[0])
-        req = ExecutionRequest(
-            actions=[action_obj],
-            headless=True
-        )
-        
-        # 执行
-        ok, evidence, _ = run_actions(req, artifact_dir=tmp_path)
-        
-        # 验证执行结果
-        assert ok is True
-        assert len(evidence) == 1
-        assert evidence[0].ok is True
-        assert evidence[0].screenshot is not None
-        assert Path(evidence[0].screenshot).exists()
-        
-        print("\n✅ 端到端测试通过:")
-        print(f"  编译: {step} → {actions[0]['type']}")
-        print(f"  执行: ok={ok}, screenshot={evidence[0].screenshot}")
-
-    def test_assert_text_e2e(self, tmp_path: Path):
-        """测试文本断言的端到端流程"""
-        steps = [
-            "打开 https://example.com",
-            "看到Example Domain"
-        ]
-        
-        # 编译
-        all_actions = []
-        for step in steps:
-            actions, warnings = compile_step_to_actions(step, timeout_ms=10000)
-            all_actions.extend(actions)
-            assert len(warnings) == 0
-        
-        # 转换为 Action 对象
-        action_objs = [Action(**a) for a in all_actions]
+    """端到端测试：编译 → 执行（共享会话级浏览器）"""
+
+    @pytest.mark.parametrize(
+        ("steps", "expected_types"),
+        [
+            (["打开 https://example.com"], ["goto"]),
+            (["打开 https://example.com", "看到Example Domain"], ["goto", "assert_text"]),
+        ],
+        ids=["simple_navigation", "assert_text"],
+    )
+    def test_compile_execute_e2e(
+        self, steps, expected_types, tmp_path: Path, pw_thread, pw_context
+    ):
+        """编译全部步骤后一次性执行"""
+        compiled = [_compile(step) for step in steps]
+        assert all(not warnings for _, warnings in compiled)
+        all_actions = [a for actions, _ in compiled for a in actions]
+        assert [a["type"] for a in all_actions] == expected_types
+
         req = ExecutionRequest(
-            actions=action_objs,
+            actions=[_to_action(a) for a in all_actions],
             headless=True
         )
-        
-        # 执行
-        ok, evidence, _ = run_actions(req, artifact_dir=tmp_path)
-        
-        # 验证
+        ok, evidence, _ = pw_thread(run_actions, req, artifact_dir=tmp_path, context=pw_context)
+
         assert ok is True
-        assert len(evidence) == 2
+        assert len(evidence) == len(expected_types)
         assert all(e.ok for e in evidence)
-        
-        print("\n✅ 文本断言端到端测试通过:")
-        for i, e in enumerate(evidence):
-            print(f"  Step {i}: {e.action.type} - ok={e.ok}")
+        assert all(e.screenshot and Path(e.screenshot).exists() for e in evidence)
 
 
 if __name__ == "__main__":
@@ -5,44 +5,15 @@
 使用 conftest.py 中统一的测试数据库配置
 注意：这些测试需要完整的数据库和服务环境，在 CI 中可能会跳过
 """
-import os
 import pytest
-from fastapi.testclient import TestClient
 
-from qualityfoundry.main import app
+from tests.conftest import AI_API_KEY, AI_BASE_URL, AI_MODEL, AI_PROVIDER, ensure_ai_config
 
-# 检测是否在 CI 环境中运行
-IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
-ENABLE_AI_TESTS = os.environ.get("QF_ENABLE_AI_TESTS", "").lower() in ("1", "true", "yes")
-AI_API_KEY = os.environ.get("QF_AI_API_KEY")
-AI_BASE_URL = os.environ.get("QF_AI_BASE_URL", "https://api.openai.com/v1")
-AI_MODEL = os.environ.get("QF_AI_MODEL", "gpt-4o-mini")
-AI_PROVIDER = os.environ.get("QF_AI_PROVIDER", "openai")
-AI_READY = ENABLE_AI_TESTS and bool(AI_API_KEY)
+# 使用 conftest.py 中的 setup_database fixture（autouse=True）与会话级 client fixture
 
-# 使用 conftest.py 中的 setup_database fixture（autouse=True）
-client = TestClient(app)
 
-
-def _ensure_ai_config():
-    response = client.post(
-        "/api/v1/ai-configs",
-        json={
-            "name": "测试 AI 配置",
-            "provider": AI_PROVIDER,
-            "model": AI_MODEL,
-            "api_key": AI_API_KEY,
-            "base_url": AI_BASE_URL,
-            "assigned_steps": ["scenario_generation", "testcase_generation"],
-            "is_default": True,
-        },
-    )
-    assert response.status_code == 201
-    return response.json()
-
-
-@pytest.mark.skipif(not AI_READY, reason="需要真实 AI 服务配置（QF_ENABLE_AI_TESTS=1 且 QF_AI_API_KEY 已配置）")
-def test_complete_workflow_end_to_end():
+@pytest.mark.ai
+def test_complete_workflow_end_to_end(client):
     """
     完整端到端测试：
     1. 创建用户
@@ -92,7 +63,7 @@ def test_complete_workflow_end_to_end():
     requirement_id = req_response.json()["id"]
     
     # 4. AI 配置
-    _ensure_ai_config()
+    ensure_ai_config(client, ["scenario_generation", "testcase_generation"])
 
     # 5. AI 生成场景
     scenario_response = client.post(
@@ -177,8 +148,8 @@ def test_complete_workflow_end_to_end():
     print("✅ 完整端到端测试通过！")
 
 
-@pytest.mark.skipif(not AI_READY, reason="需要真实 AI 服务配置（QF_ENABLE_AI_TESTS=1 且 QF_AI_API_KEY 已配置）")
-def test_ai_config_workflow():
+@pytest.mark.ai
+def test_ai_config_workflow(client):
     """测试 AI 配置工作流"""
     # 创建 AI 配置
     config_response = client.post(
@@ -1,17 +1,25 @@
 """
 环境管理 API 单元测试
 
-使用 conftest.py 中统一的测试数据库配置
+使用 conftest.py 中统一的测试数据库配置与会话级共享的 client fixture
 """
-from fastapi.testclient import TestClient
+from sqlalchemy import insert
 
-from qualityfoundry.main import app
+from qualityfoundry.database.models import Environment
 
-# 使用 conftest.py 中的 client fixture
-client = TestClient(app)
 
+def seed_environments(db, rows):
+    """以 executemany 方式直接插入环境数据
 
-def test_create_environment():
+    列表/筛选用例只关心查询结果，前置数据无需逐条走 POST 与 ORM flush，
+    一条编译好的 INSERT 批量写入即可（id、时间戳等由列默认值生成）。
+    """
+    db.execute(insert(Environment), rows)
+    db.commit()
+
+
+
+def test_create_environment(client):
     """测试创建环境"""
     response = client.post(
         "/api/v1/environments",
@@ -30,7 +38,7 @@ def test_create_environment():
     assert data["credentials"] != "test_password"
 
 
-def test_create_duplicate_environment():
+def test_create_duplicate_environment(client):
     """测试创建重复环境名称"""
     # 创建第一个环境
     client.post(
@@ -52,17 +60,13 @@ def test_create_duplicate_environment():
     assert response.status_code == 400
 
 
-def test_list_environments():
+def test_list_environments(client, db):
     """测试环境列表"""
     # 创建多个环境
-    for name in ["dev", "sit", "uat"]:
-        client.post(
-            "/api/v1/environments",
-            json={
-                "name": name,
-                "base_url": f"http://{name}.example.com"
-            }
-        )
+    seed_environments(
+        db,
+        [{"name": name, "base_url": f"http://{name}.example.com"} for name in ["dev", "sit", "uat"]],
+    )
     
     # 获取列表
     response = client.get("/api/v1/environments")
@@ -71,7 +75,7 @@ def test_list_environments():
     assert data["total"] == 3
 
 
-def test_get_environment():
+def test_get_environment(client):
     """测试获取环境详情"""
     # 创建环境
     create_response = client.post(
@@ -90,7 +94,7 @@ def test_get_environment():
     assert data["id"] == environment_id
 
 
-def test_update_environment():
+def test_update_environment(client):
     """测试更新环境"""
     # 创建环境
     create_response = client.post(
@@ -116,7 +120,7 @@ def test_update_environment():
     assert data["is_active"] is False
 
 
-def test_delete_environment():
+def test_delete_environment(client):
     """测试删除环境"""
     # 创建环境
     create_response = client.post(
@@ -137,23 +141,15 @@ def test_delete_environment():
     assert get_response.status_code == 404
 
 
-def test_filter_active_environments():
+def test_filter_active_environments(client, db):
     """测试筛选激活的环境"""
-    # 创建环境
-    env1 = client.post(
-        "/api/v1/environments",
-        json={"name": "dev", "base_url": "http://dev.example.com"}
-    ).json()
-    
-    client.post(
-        "/api/v1/environments",
-        json={"name": "sit", "base_url": "http://sit.example.com"}
-    )
-    
-    # 停用第一个环境
-    client.put(
-        f"/api/v1/environments/{env1['id']}",
-        json={"is_active": False}
+    # 创建一个已停用、一个激活的环境（通过 API 停用由 test_update_environment 覆盖）
+    seed_environments(
+        db,
+        [
+            {"name": "dev", "base_url": "http://dev.example.com", "is_active": False},
+            {"name": "sit", "base_url": "http://sit.example.com", "is_active": True},
+        ],
     )
     
     # 筛选激活的环境
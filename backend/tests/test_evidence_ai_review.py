@@ -2,11 +2,13 @@
 
 Evidence 与 AI 评审集成测试
 """
-import json
-from uuid import uuid4
+import itertools
+from uuid import UUID
 from pathlib import Path
 import tempfile
 
+import orjson
+
 from qualityfoundry.governance.tracing.collector import (
     TraceCollector,
     Evidence,
@@ -22,6 +24,14 @@ from qualityfoundry.governance.ai_review import (
     VerdictType,
 )
 
+# 用例只需要互不相同的 ID，用递增整数生成 UUID 格式字符串，不逐次读取系统随机数
+_uid_counter = itertools.count(1)
+
+
+def uid() -> str:
+    """返回一个本模块内唯一的 UUID 字符串"""
+    return str(UUID(int=next(_uid_counter)))
+
 
 class TestEvidenceWithAIReview:
     """测试 Evidence 包含 AI 评审结果"""
@@ -29,7 +39,7 @@ class TestEvidenceWithAIReview:
     def test_evidence_has_ai_review_field(self):
         """Evidence 模型有 ai_review 字段"""
         evidence = Evidence(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Test",
             ai_review={
                 "verdict": "PASS",
@@ -45,7 +55,7 @@ class TestEvidenceWithAIReview:
     def test_evidence_ai_review_none_by_default(self):
         """默认 ai_review 为 None"""
         evidence = Evidence(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Test",
         )
         
@@ -54,7 +64,7 @@ class TestEvidenceWithAIReview:
     def test_evidence_extra_allow_schema(self):
         """Evidence 允许额外字段（用于 ai_review）"""
         evidence = Evidence(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Test",
             ai_review={
                 "verdict": "PASS",
@@ -66,9 +76,8 @@ class TestEvidenceWithAIReview:
             },
         )
         
-        # 验证可以序列化
-        json_str = evidence.model_dump_json_for_file()
-        data = json.loads(json_str)
+        # 直接取与落盘内容等价的 JSON 字典，无需序列化后再解析（往返由 test_evidence_round_trip 覆盖）
+        data = evidence.model_dump(mode="json", by_alias=True)
         
         assert "ai_review" in data
         assert data["ai_review"]["verdict"] == "PASS"
@@ -81,7 +90,7 @@ class TestTraceCollectorAIReview:
     def test_collector_set_ai_review_result(self):
         """Collector 可以设置 AI 评审结果"""
         collector = TraceCollector(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Test scenario",
         )
         
@@ -92,7 +101,7 @@ class TestTraceCollectorAIReview:
             "model_votes": [
                 {"model": "gpt-4", "verdict": "PASS", "confidence": 0.9},
             ],
-            "metadata": {"review_id": str(uuid4())},
+            "metadata": {"review_id": uid()},
         }
         
         collector.set_ai_review_result(ai_result)
@@ -103,7 +112,7 @@ class TestTraceCollectorAIReview:
     def test_collector_without_ai_review(self):
         """未设置 AI 评审时 evidence.ai_review 为 None"""
         collector = TraceCollector(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Test scenario",
         )
         
@@ -145,7 +154,7 @@ class TestAIReviewResultToEvidence:
         
         # 2. 创建 Collector 并设置结果
         collector = TraceCollector(
-            run_id=str(uuid4()),
+            run_id=uid(),
             input_nl="Run tests",
         )
         collector.set_ai_review_result(ai_result.to_evidence_format()["ai_review"])
@@ -168,7 +177,7 @@ class TestEvidencePersistence:
         """保存包含 AI 评审的 Evidence"""
         with tempfile.TemporaryDirectory() as tmpdir:
             collector = TraceCollector(
-                run_id=str(uuid4()),
+                run_id=uid(),
                 input_nl="Test",
                 artifact_root=Path(tmpdir),
             )
@@ -177,7 +186,7 @@ class TestEvidencePersistence:
                 "verdict": "PASS",
                 "confidence": 0.9,
                 "model_votes": [],
-                "metadata": {"review_id": str(uuid4())},
+                "metadata": {"review_id": uid()},
             }
             collector.set_ai_review_result(ai_result)
             
@@ -185,22 +194,26 @@ class TestEvidencePersistence:
             
             # 验证文件存在且内容正确
             assert path.exists()
-            saved_data = json.loads(path.read_text())
+            saved_data = orjson.loads(path.read_bytes())
             
             assert saved_data["ai_review"]["verdict"] == "PASS"
             assert saved_data["ai_review"]["confidence"] == 0.9
 
 
 class TestEvidenceSchemaCompatibility:
-    """测试 Evidence Schema 兼容性"""
+    """测试 Evidence Schema 兼容性
+
+    这里关注序列化输出，输入是手写的合法字面量，用 model_construct 跳过校验构造；
+    字段校验行为由 TestEvidenceWithAIReview 覆盖。
+    """
 
     def test_ai_review_does_not_break_existing_fields(self):
         """AI 评审字段不影响现有字段"""
-        evidence = Evidence(
-            run_id=str(uuid4()),
+        evidence = Evidence.model_construct(
+            run_id=uid(),
             input_nl="Test",
             tool_calls=[
-                ToolCallSummary(tool_name="run_pytest", status="success"),
+                ToolCallSummary.model_construct(tool_name="run_pytest", status="success"),
             ],
             ai_review={"verdict": "PASS"},
         )
@@ -214,8 +227,8 @@ class TestEvidenceSchemaCompatibility:
 
     def test_evidence_round_trip(self):
         """Evidence 序列化和反序列化"""
-        original = Evidence(
-            run_id=str(uuid4()),
+        original = Evidence.model_construct(
+            run_id=uid(),
             input_nl="Test",
             ai_review={
                 "verdict": "NEEDS_HITL",
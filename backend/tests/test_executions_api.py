@@ -1,246 +1,126 @@
 """
 执行管理 API 单元测试
 
-使用 conftest.py 中统一的测试数据库配置
+使用 conftest.py 中统一的测试数据库配置与会话级共享的 client fixture
 """
-from fastapi.testclient import TestClient
+from typing import NamedTuple
+from uuid import UUID, uuid4
 
-from qualityfoundry.main import app
+import pytest
+from sqlalchemy import insert
 
-# 使用 conftest.py 中的 client fixture
-client = TestClient(app)
+from qualityfoundry.database.models import (
+    ApprovalStatus,
+    Environment,
+    Execution,
+    Requirement,
+    Scenario,
+    TestCase as DBTestCase,
+)
 
 
-def test_create_execution():
-    """测试创建执行"""
-    # 创建需求、场景、用例、环境
-    req_response = client.post(
-        "/api/v1/requirements",
-        json={"title": "测试需求", "content": "内容", "version": "v1.0"}
-    )
-    requirement_id = req_response.json()["id"]
-    
-    scenario_response = client.post(
-        "/api/v1/scenarios",
-        json={
-            "requirement_id": requirement_id,
-            "title": "测试场景",
-            "steps": ["步骤1"]
-        }
-    )
-    scenario_id = scenario_response.json()["id"]
-    
-    testcase_response = client.post(
-        "/api/v1/testcases",
-        json={
+class ExecutionContext(NamedTuple):
+    """执行所需的前置实体 ID（与 API 返回的字符串形式一致）"""
+    testcase_id: str
+    environment_id: str
+
+
+@pytest.fixture
+def execution_context(db) -> ExecutionContext:
+    """直接插入 需求 → 场景 → 已审核用例 + 环境
+
+    这些实体的创建/审核接口由各自的 API 测试覆盖，这里只需要 ID：
+    预先生成主键，按外键顺序各执行一条 Core INSERT，不经过 HTTP 与 ORM 工作单元。
+    """
+    requirement_id, scenario_id, testcase_id, environment_id = uuid4(), uuid4(), uuid4(), uuid4()
+    db.execute(insert(Requirement), [{"id": requirement_id, "title": "测试需求", "content": "内容"}])
+    db.execute(
+        insert(Scenario),
+        [{"id": scenario_id, "requirement_id": requirement_id, "title": "测试场景", "steps": ["步骤1"]}],
+    )
+    db.execute(
+        insert(DBTestCase),
+        [{
+            "id": testcase_id,
             "scenario_id": scenario_id,
             "title": "测试用例",
-            "steps": [{"step": "步骤1", "expected": "预期结果1"}]
-        }
-    )
-    testcase_id = testcase_response.json()["id"]
-    
-    # 审批用例
-    client.post(f"/api/v1/testcases/{testcase_id}/approve", json={"reviewer": "test_admin"})
-    
-    env_response = client.post(
-        "/api/v1/environments",
-        json={
-            "name": "dev",
-            "base_url": "http://localhost:3000"
-        }
-    )
-    environment_id = env_response.json()["id"]
-    
-    # 创建执行
-    response = client.post(
+            "steps": [{"step": "步骤1", "expected": "预期结果1"}],
+            "approval_status": ApprovalStatus.APPROVED,
+            "approved_by": "test_admin",
+        }],
+    )
+    db.execute(insert(Environment), [{"id": environment_id, "name": "dev", "base_url": "http://localhost:3000"}])
+    db.commit()
+    return ExecutionContext(str(testcase_id), str(environment_id))
+
+
+@pytest.fixture
+def execution_id(db, execution_context) -> str:
+    """直接插入一条待执行记录（查询类用例不关心创建接口）"""
+    execution_id = uuid4()
+    db.execute(
+        insert(Execution),
+        [{
+            "id": execution_id,
+            "testcase_id": UUID(execution_context.testcase_id),
+            "environment_id": UUID(execution_context.environment_id),
+        }],
+    )
+    db.commit()
+    return str(execution_id)
+
+
+def _create_execution(client, ctx: ExecutionContext):
+    return client.post(
         "/api/v1/executions",
         json={
-            "testcase_id": testcase_id,
-            "environment_id": environment_id,
+            "testcase_id": ctx.testcase_id,
+            "environment_id": ctx.environment_id,
             "mode": "dsl"
         }
     )
+
+
+def test_create_execution(client, execution_context):
+    """测试创建执行"""
+    response = _create_execution(client, execution_context)
     assert response.status_code == 201
     data = response.json()
-    assert data["testcase_id"] == testcase_id
-    assert data["environment_id"] == environment_id
+    assert data["testcase_id"] == execution_context.testcase_id
+    assert data["environment_id"] == execution_context.environment_id
     assert data["mode"] == "dsl"
     assert data["status"] == "pending"
 
 
-def test_list_executions():
-    """测试执行列表"""
-    # 创建测试数据
-    req_response = client.post(
-        "/api/v1/requirements",
-        json={"title": "测试需求", "content": "内容", "version": "v1.0"}
-    )
-    requirement_id = req_response.json()["id"]
-    
-    scenario_response = client.post(
-        "/api/v1/scenarios",
-        json={
-            "requirement_id": requirement_id,
-            "title": "测试场景",
-            "steps": ["步骤1"]
-        }
-    )
-    scenario_id = scenario_response.json()["id"]
-    
-    testcase_response = client.post(
-        "/api/v1/testcases",
-        json={
-            "scenario_id": scenario_id,
-            "title": "测试用例",
-            "steps": [{"step": "步骤1", "expected": "预期结果1"}]
-        }
-    )
-    testcase_id = testcase_response.json()["id"]
-    
-    # 审批用例
-    client.post(f"/api/v1/testcases/{testcase_id}/approve", json={"reviewer": "test_admin"})
-    
-    env_response = client.post(
-        "/api/v1/environments",
-        json={
-            "name": "dev",
-            "base_url": "http://localhost:3000"
-        }
-    )
-    environment_id = env_response.json()["id"]
-    
-    # 创建多个执行
-    for i in range(3):
-        client.post(
-            "/api/v1/executions",
-            json={
-                "testcase_id": testcase_id,
-                "environment_id": environment_id,
-                "mode": "dsl"
+def test_list_executions(client, db, execution_context):
+    """测试执行列表（创建接口由 test_create_execution 覆盖，这里直接批量插入）"""
+    db.execute(
+        insert(Execution),
+        [
+            {
+                "id": uuid4(),
+                "testcase_id": UUID(execution_context.testcase_id),
+                "environment_id": UUID(execution_context.environment_id),
             }
-        )
-    
-    # 获取列表
+            for _ in range(3)
+        ],
+    )
+    db.commit()
+
     response = client.get("/api/v1/executions")
     assert response.status_code == 200
     data = response.json()
     assert data["total"] == 3
 
 
-def test_get_execution():
-    """测试获取执行详情"""
-    # 创建测试数据
-    req_response = client.post(
-        "/api/v1/requirements",
-        json={"title": "测试需求", "content": "内容", "version": "v1.0"}
-    )
-    requirement_id = req_response.json()["id"]
-    
-    scenario_response = client.post(
-        "/api/v1/scenarios",
-        json={
-            "requirement_id": requirement_id,
-            "title": "测试场景",
-            "steps": ["步骤1"]
-        }
-    )
-    scenario_id = scenario_response.json()["id"]
-    
-    testcase_response = client.post(
-        "/api/v1/testcases",
-        json={
-            "scenario_id": scenario_id,
-            "title": "测试用例",
-            "steps": [{"step": "步骤1", "expected": "预期结果1"}]
-        }
-    )
-    testcase_id = testcase_response.json()["id"]
-    
-    # 审批用例
-    client.post(f"/api/v1/testcases/{testcase_id}/approve", json={"reviewer": "test_admin"})
-    
-    env_response = client.post(
-        "/api/v1/environments",
-        json={
-            "name": "dev",
-            "base_url": "http://localhost:3000"
-        }
-    )
-    environment_id = env_response.json()["id"]
-    
-    # 创建执行
-    create_response = client.post(
-        "/api/v1/executions",
-        json={
-            "testcase_id": testcase_id,
-            "environment_id": environment_id,
-            "mode": "dsl"
-        }
-    )
-    execution_id = create_response.json()["id"]
-    
-    # 获取详情
-    response = client.get(f"/api/v1/executions/{execution_id}")
-    assert response.status_code == 200
-    data = response.json()
-    assert data["id"] == execution_id
-
-
-def test_get_execution_status():
-    """测试获取执行状态"""
-    # 创建测试数据
-    req_response = client.post(
-        "/api/v1/requirements",
-        json={"title": "测试需求", "content": "内容", "version": "v1.0"}
-    )
-    requirement_id = req_response.json()["id"]
-    
-    scenario_response = client.post(
-        "/api/v1/scenarios",
-        json={
-            "requirement_id": requirement_id,
-            "title": "测试场景",
-            "steps": ["步骤1"]
-        }
-    )
-    scenario_id = scenario_response.json()["id"]
-    
-    testcase_response = client.post(
-        "/api/v1/testcases",
-        json={
-            "scenario_id": scenario_id,
-            "title": "测试用例",
-            "steps": [{"step": "步骤1", "expected": "预期结果1"}]
-        }
-    )
-    testcase_id = testcase_response.json()["id"]
-    
-    # 审批用例
-    client.post(f"/api/v1/testcases/{testcase_id}/approve", json={"reviewer": "test_admin"})
-    
-    env_response = client.post(
-        "/api/v1/environments",
-        json={
-            "name": "dev",
-            "base_url": "http://localhost:3000"
-        }
-    )
-    environment_id = env_response.json()["id"]
-    
-    # 创建执行
-    create_response = client.post(
-        "/api/v1/executions",
-        json={
-            "testcase_id": testcase_id,
-            "environment_id": environment_id,
-            "mode": "dsl"
-        }
-    )
-    execution_id = create_response.json()["id"]
-    
-    # 获取状态
-    response = client.get(f"/api/v1/executions/{execution_id}/status")
+@pytest.mark.parametrize(
+    "suffix",
+    ["", "/status"],
+    ids=["detail", "status"],
+)
+def test_get_execution(client, execution_id, suffix):
+    """测试获取执行详情 / 执行状态"""
+    response = client.get(f"/api/v1/executions/{execution_id}{suffix}")
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == execution_id
@@ -3,80 +3,104 @@ Test cases for executor actions (runner.py)
 
 注意：这些测试需要 Playwright 浏览器，在 CI 环境中可能会跳过
 """
-import os
 import pytest
 from pathlib import Path
+from unittest.mock import MagicMock
 from qualityfoundry.models.schemas import Action, ActionType, Locator, ExecutionRequest
 from qualityfoundry.runners.playwright.runner import run_actions
 
-# 检测是否在 CI 环境中运行
-IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
+# 模块加载时校验一次的规范请求，用例按需 model_copy(update=...) 派生
+_GOTO_EXAMPLE = Action(type=ActionType.GOTO, url="https://example.com", timeout_ms=10000)
+_BASE_REQ = ExecutionRequest(base_url="https://example.com", actions=[_GOTO_EXAMPLE], headless=True)
+# mock 用例不等待真实页面，超时取短值
+_MOCK_REQ = ExecutionRequest(
+    actions=[Action(type=ActionType.GOTO, url="https://example.com", timeout_ms=1000)],
+    headless=True,
+)
 
 
-@pytest.mark.skipif(IN_CI, reason="Playwright 测试需要浏览器，在 CI 中跳过")
+@pytest.mark.xdist_group("playwright")  # 并行时固定在同一 worker，只启动一个 Chromium
 class TestExecutorActions:
-    """测试执行器动作实现"""
+    """测试执行器动作实现（共享会话级浏览器，每个测试独立 BrowserContext）"""
 
-    def test_assert_visible_action(self, tmp_path: Path):
+    def test_assert_visible_action(self, tmp_path: Path, pw_thread, pw_context):
         """测试 assert_visible 动作"""
-        req = ExecutionRequest(
-            base_url="https://example.com",
-            actions=[
-                Action(
-                    type=ActionType.GOTO,
-                    url="https://example.com",
-                    timeout_ms=10000
-                ),
-                Action(
-                    type=ActionType.ASSERT_VISIBLE,
-                    locator=Locator(strategy="text", value="Example Domain"),
-                    timeout_ms=5000
-                )
-            ],
-            headless=True
-        )
-        
-        ok, evidence, _ = run_actions(req, artifact_dir=tmp_path)
+        req = _BASE_REQ.model_copy(update={"actions": [
+            _GOTO_EXAMPLE,
+            Action(
+                type=ActionType.ASSERT_VISIBLE,
+                locator=Locator(strategy="text", value="Example Domain"),
+                timeout_ms=5000
+            ),
+        ]})
+
+        ok, evidence, _ = pw_thread(run_actions, req, artifact_dir=tmp_path, context=pw_context)
         
         assert ok is True
         assert len(evidence) == 2
         assert evidence[1].ok is True
         assert evidence[1].action.type == ActionType.ASSERT_VISIBLE
 
-    def test_placeholder_locator_strategy(self, tmp_path: Path):
+    def test_placeholder_locator_strategy(self, tmp_path: Path, pw_thread, pw_context):
         """测试 placeholder 定位策略"""
         # 注意：这个测试需要一个实际的页面，这里只验证不会抛出异常
-        req = ExecutionRequest(
-            base_url="https://example.com",
-            actions=[
-                Action(
-                    type=ActionType.GOTO,
-                    url="https://example.com",
-                    timeout_ms=10000
-                )
-            ],
-            headless=True
-        )
-        
-        ok, evidence, _ = run_actions(req, artifact_dir=tmp_path)
+        ok, evidence, _ = pw_thread(run_actions, _BASE_REQ, artifact_dir=tmp_path, context=pw_context)
         assert ok is True
 
-    def test_fill_with_css_selector(self, tmp_path: Path):
+    def test_fill_with_css_selector(self, tmp_path: Path, pw_thread, pw_context):
         """测试使用 CSS 选择器的 fill 动作"""
-        req = ExecutionRequest(
-            base_url="https://example.com",
-            actions=[
-                Action(
-                    type=ActionType.GOTO,
-                    url="https://example.com",
-                    timeout_ms=10000
-                )
-            ],
-            headless=True
+        ok, evidence, _ = pw_thread(run_actions, _BASE_REQ, artifact_dir=tmp_path, context=pw_context)
+        assert ok is True
+
+
+class TestRunActionsWithContext:
+    """调用方注入 BrowserContext 时的 runner 行为（mock，不需要浏览器）"""
+
+    def test_injected_context_is_reused_not_closed(self, tmp_path: Path):
+        context = MagicMock()
+        page = context.new_page.return_value
+
+        ok, evidence, trace_path = run_actions(_MOCK_REQ, artifact_dir=tmp_path, context=context)
+
+        assert ok is True
+        assert len(evidence) == 1
+        page.goto.assert_called_once_with("https://example.com", timeout=1000)
+        context.tracing.start.assert_called_once()
+        context.tracing.stop.assert_called_once()
+        # 页面用完即关，context 由调用方负责关闭
+        page.close.assert_called_once()
+        context.close.assert_not_called()
+        assert trace_path is None
+
+    def test_failed_step_still_stops_tracing(self, tmp_path: Path):
+        context = MagicMock()
+        page = context.new_page.return_value
+
+        page.goto.side_effect = RuntimeError("boom")
+
+        ok, evidence, _ = run_actions(_MOCK_REQ, artifact_dir=tmp_path, context=context)
+
+        assert ok is False
+        assert evidence[0].error == "boom"
+        context.tracing.stop.assert_called_once()
+        page.close.assert_called_once()
+
+    def test_ws_endpoint_connects_instead_of_launching(self, tmp_path: Path, monkeypatch):
+        pw = MagicMock()
+        manager = MagicMock()
+        manager.__enter__.return_value = pw
+        monkeypatch.setattr(
+            "qualityfoundry.runners.playwright.runner.sync_playwright", lambda: manager
         )
-        
-        ok, evidence, _ = run_actions(req, artifact_dir=tmp_path)
+
+        ok, _, _ = run_actions(_MOCK_REQ, artifact_dir=tmp_path, ws_endpoint="ws://127.0.0.1:4444/")
+
         assert ok is True
+        pw.chromium.connect.assert_called_once_with("ws://127.0.0.1:4444/")
+        pw.chromium.launch.assert_not_called()
+        browser = pw.chromium.connect.return_value
+        browser.new_context.return_value.close.assert_called_once()
+        browser.close.assert_called_once()
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@
 验证门禁决策逻辑的正确性。
 """
 
+import pytest
 
 from qualityfoundry.governance.gate import (
     GateDecision,
@@ -11,7 +12,7 @@ from qualityfoundry.governance.gate import (
     evaluate_gate_with_hitl,
     _check_high_risk,
 )
-from qualityfoundry.governance.policy_loader import get_default_policy
+from qualityfoundry.governance.policy_loader import PolicyConfig, get_default_policy
 from qualityfoundry.governance.tracing.collector import (
     Evidence,
     EvidenceSummary,
@@ -19,6 +20,23 @@ from qualityfoundry.governance.tracing.collector import (
 )
 
 
+@pytest.fixture(scope="module")
+def make_evidence():
+    """免校验构造 Evidence 的工厂（门禁只读取字段，输入形状固定，无需逐次校验）
+
+    summary / tool_calls 以字典传入，同样用 model_construct 构造。
+    """
+    def _make(run_id, input_nl="run tests", summary=None, tool_calls=()):
+        return Evidence.model_construct(
+            run_id=run_id,
+            input_nl=input_nl,
+            summary=EvidenceSummary.model_construct(**summary) if summary is not None else None,
+            tool_calls=[ToolCallSummary.model_construct(**tc) for tc in tool_calls],
+        )
+
+    return _make
+
+
 class TestHighRiskKeywordDetection:
     """高危关键词检测测试"""
 
@@ -65,29 +83,66 @@ class TestHighRiskKeywordDetection:
         result = _check_high_risk("Deploy to PRODUCTION")
         assert result == "production"
 
+    def test_casefold_matches_policy_keywords(self):
+        """输入与策略关键词均做大小写折叠（含非 ASCII 字符）"""
+        policy = PolicyConfig(high_risk_keywords=["Straße"])
+        assert _check_high_risk("close STRASSE now", policy) == "strasse"
+
     def test_priority_keywords(self):
         """优先返回更重要的关键词"""
         # production 优先级高于 delete
         result = _check_high_risk("delete data in production")
         assert result == "production"
 
+    def test_non_priority_keywords_resolve_deterministically(self):
+        """都不是优先关键词时按字母序返回，与集合迭代顺序无关"""
+        result = _check_high_risk("release the schema migration")
+        assert result == "migration"
+
+
+class TestHighRiskPatterns:
+    """高危模式匹配测试（预编译 + 合并预过滤）"""
+
+    def test_first_pattern_in_list_order_is_reported(self):
+        """多个模式命中时返回列表中靠前的模式，而非文本中最先出现的"""
+        policy = PolicyConfig(high_risk_patterns=[r"\bsudo\b", r"\brm\s+-rf\b"])
+        assert _check_high_risk("rm -rf / then sudo", policy) == r"pattern:\bsudo\b"
+
+    def test_no_pattern_hit_returns_none(self):
+        policy = PolicyConfig(high_risk_patterns=[r"\bsudo\b", r"\brm\s+-rf\b"])
+        assert _check_high_risk("run unit tests", policy) is None
+
+    def test_backreference_pattern_still_matches(self):
+        """含捕获组/反向引用的模式不参与合并，仍能正确匹配"""
+        policy = PolicyConfig(high_risk_patterns=[r"\bsudo\b", r"(\w+) \1"])
+        assert _check_high_risk("drop drop", policy) == r"pattern:(\w+) \1"
+
+    def test_patterns_match_lowercased_not_casefolded_text(self):
+        """模式匹配 lower() 后的文本：ß 保持原样，不会被折叠成 ss"""
+        policy = PolicyConfig(high_risk_keywords=[], high_risk_patterns=[r"straße"])
+        assert _check_high_risk("Straße sperren", policy) == "pattern:straße"
+        assert _check_high_risk("STRASSE sperren", policy) is None
+
+    def test_long_input_hits_near_the_end(self):
+        """长输入（LLM 生成的提示词）末尾的关键词/模式同样能命中"""
+        filler = "verify the login page renders correctly. " * 500
+        assert _check_high_risk(filler + "then truncate the table") == "truncate"
+        policy = PolicyConfig(high_risk_keywords=[], high_risk_patterns=[r"\bsudo\b"])
+        assert _check_high_risk(filler + "run sudo make", policy) == r"pattern:\bsudo\b"
+
+    def test_long_input_without_hits(self):
+        assert _check_high_risk("verify the login page renders correctly. " * 500) is None
+
 
 class TestGateDecisionWithJUnit:
     """基于 JUnit 结果的门禁决策测试"""
 
-    def test_all_tests_passed(self):
+    def test_all_tests_passed(self, make_evidence):
         """所有测试通过 → PASS"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-1",
             input_nl="run all tests",
-            summary=EvidenceSummary(
-                tests=10,
-                failures=0,
-                errors=0,
-                skipped=0,
-                passed=10,
-                time=1.5,
-            ),
+            summary=dict(tests=10, failures=0, errors=0, skipped=0, passed=10, time=1.5),
         )
 
         result = evaluate_gate(evidence)
@@ -96,19 +151,12 @@ class TestGateDecisionWithJUnit:
         assert "测试已通过" in result.reason
         assert "junit_all_passed" in result.triggered_rules
 
-    def test_some_tests_failed(self):
+    def test_some_tests_failed(self, make_evidence):
         """有测试失败 → FAIL"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-2",
             input_nl="run tests",
-            summary=EvidenceSummary(
-                tests=10,
-                failures=2,
-                errors=0,
-                skipped=1,
-                passed=7,
-                time=2.0,
-            ),
+            summary=dict(tests=10, failures=2, errors=0, skipped=1, passed=7, time=2.0),
         )
 
         result = evaluate_gate(evidence)
@@ -117,19 +165,12 @@ class TestGateDecisionWithJUnit:
         assert "个失败" in result.reason
         assert "junit_has_failures" in result.triggered_rules
 
-    def test_tests_with_errors(self):
+    def test_tests_with_errors(self, make_evidence):
         """有错误 → FAIL"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-3",
             input_nl="run tests",
-            summary=EvidenceSummary(
-                tests=5,
-                failures=0,
-                errors=1,
-                skipped=0,
-                passed=4,
-                time=1.0,
-            ),
+            summary=dict(tests=5, failures=0, errors=1, skipped=0, passed=4, time=1.0),
         )
 
         result = evaluate_gate(evidence)
@@ -137,12 +178,12 @@ class TestGateDecisionWithJUnit:
         assert result.decision == GateDecision.FAIL
         assert "个失败" in result.reason
 
-    def test_evidence_summary_included(self):
+    def test_evidence_summary_included(self, make_evidence):
         """结果包含 evidence_summary"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-4",
             input_nl="run tests",
-            summary=EvidenceSummary(tests=5, failures=0, errors=0, skipped=0, passed=5),
+            summary=dict(tests=5, failures=0, errors=0, skipped=0, passed=5),
         )
 
         result = evaluate_gate(evidence)
@@ -154,14 +195,14 @@ class TestGateDecisionWithJUnit:
 class TestGateDecisionWithToolCalls:
     """基于 ToolCall 状态的门禁决策测试（无 JUnit 时）"""
 
-    def test_all_tools_succeeded(self):
+    def test_all_tools_succeeded(self, make_evidence):
         """所有工具执行成功 → PASS"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-5",
             input_nl="run tests",
             tool_calls=[
-                ToolCallSummary(tool_name="run_pytest", status="success"),
-                ToolCallSummary(tool_name="run_playwright", status="success"),
+                dict(tool_name="run_pytest", status="success"),
+                dict(tool_name="run_playwright", status="success"),
             ],
         )
 
@@ -171,14 +212,14 @@ class TestGateDecisionWithToolCalls:
         assert "工具执行成功" in result.reason
         assert "all_tools_succeeded" in result.triggered_rules
 
-    def test_some_tools_failed(self):
+    def test_some_tools_failed(self, make_evidence):
         """有工具执行失败 → FAIL"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-6",
             input_nl="run tests",
             tool_calls=[
-                ToolCallSummary(tool_name="run_pytest", status="success"),
-                ToolCallSummary(tool_name="run_playwright", status="failed"),
+                dict(tool_name="run_pytest", status="success"),
+                dict(tool_name="run_playwright", status="failed"),
             ],
         )
 
@@ -188,9 +229,25 @@ class TestGateDecisionWithToolCalls:
         assert "run_playwright" in result.reason
         assert "tool_execution_failed" in result.triggered_rules
 
-    def test_no_execution_data(self):
+    def test_all_failed_tools_listed_in_reason(self, make_evidence):
+        """失败原因列出全部失败工具（按调用顺序，附错误摘要）"""
+        evidence = make_evidence(
+            run_id="test-run-6b",
+            tool_calls=[
+                dict(tool_name="run_pytest", status="failed", error_message="exit 1"),
+                dict(tool_name="fetch_logs", status="success"),
+                dict(tool_name="run_playwright", status="timeout"),
+            ],
+        )
+
+        result = evaluate_gate(evidence)
+
+        assert result.decision == GateDecision.FAIL
+        assert result.reason == "工具执行失败: run_pytest (exit 1); run_playwright"
+
+    def test_no_execution_data(self, make_evidence):
         """无执行数据 → FAIL"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-7",
             input_nl="run tests",
         )
@@ -205,12 +262,12 @@ class TestGateDecisionWithToolCalls:
 class TestGateDecisionWithHITL:
     """HITL（人工审核）触发测试"""
 
-    def test_high_risk_triggers_hitl(self):
+    def test_high_risk_triggers_hitl(self, make_evidence):
         """高危关键词触发 NEED_HITL"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-8",
             input_nl="delete all data in production database",
-            summary=EvidenceSummary(tests=5, failures=0, errors=0, skipped=0, passed=5),
+            summary=dict(tests=5, failures=0, errors=0, skipped=0, passed=5),
         )
 
         result = evaluate_gate(evidence)
@@ -219,12 +276,12 @@ class TestGateDecisionWithHITL:
         assert "高危关键词" in result.reason
         assert any("high_risk_keyword" in r for r in result.triggered_rules)
 
-    def test_hitl_priority_over_pass(self):
+    def test_hitl_priority_over_pass(self, make_evidence):
         """HITL 优先级高于 PASS（即使测试全部通过）"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-9",
             input_nl="run tests for production deployment",
-            summary=EvidenceSummary(tests=10, failures=0, errors=0, skipped=0, passed=10),
+            summary=dict(tests=10, failures=0, errors=0, skipped=0, passed=10),
         )
 
         result = evaluate_gate(evidence)
@@ -232,9 +289,9 @@ class TestGateDecisionWithHITL:
         # 即使所有测试通过，但包含高危关键词，仍然需要 HITL
         assert result.decision == GateDecision.NEED_HITL
 
-    def test_evaluate_gate_with_hitl_creates_approval(self):
+    def test_evaluate_gate_with_hitl_creates_approval(self, make_evidence):
         """evaluate_gate_with_hitl 创建审批记录"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-10",
             input_nl="deploy to production",
         )
@@ -244,12 +301,12 @@ class TestGateDecisionWithHITL:
         assert result.decision == GateDecision.NEED_HITL
         assert result.approval_id is not None
 
-    def test_evaluate_gate_with_hitl_no_approval_for_pass(self):
+    def test_evaluate_gate_with_hitl_no_approval_for_pass(self, make_evidence):
         """PASS 结果不创建审批记录"""
-        evidence = Evidence(
+        evidence = make_evidence(
             run_id="test-run-11",
             input_nl="run unit tests",
-            summary=EvidenceSummary(tests=5, failures=0, errors=0, skipped=0, passed=5),
+            summary=dict(tests=5, failures=0, errors=0, skipped=0, passed=5),
         )
 
         result = evaluate_gate_with_hitl(evidence)
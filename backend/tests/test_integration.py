@@ -4,45 +4,15 @@
 使用 conftest.py 中统一的测试数据库配置
 注意：这些测试需要完整的数据库和服务环境，在 CI 中可能会跳过
 """
-import os
 import pytest
-from fastapi.testclient import TestClient
 
-from qualityfoundry.main import app
+from tests.conftest import ensure_ai_config
 
-# 检测是否在 CI 环境中运行
-IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
-ENABLE_AI_TESTS = os.environ.get("QF_ENABLE_AI_TESTS", "").lower() in ("1", "true", "yes")
-AI_API_KEY = os.environ.get("QF_AI_API_KEY")
-AI_BASE_URL = os.environ.get("QF_AI_BASE_URL", "https://api.openai.com/v1")
-AI_MODEL = os.environ.get("QF_AI_MODEL", "gpt-4o-mini")
-AI_PROVIDER = os.environ.get("QF_AI_PROVIDER", "openai")
-AI_READY = ENABLE_AI_TESTS and bool(AI_API_KEY)
-ENABLE_INTEGRATION_TESTS = os.environ.get("QF_ENABLE_INTEGRATION_TESTS", "").lower() in ("1", "true", "yes")
+# 使用 conftest.py 中的 setup_database fixture（autouse=True）与会话级 client fixture
 
-# 使用 conftest.py 中的 setup_database fixture（autouse=True）
-client = TestClient(app)
 
-
-def _ensure_ai_config():
-    response = client.post(
-        "/api/v1/ai-configs",
-        json={
-            "name": "测试 AI 配置",
-            "provider": AI_PROVIDER,
-            "model": AI_MODEL,
-            "api_key": AI_API_KEY,
-            "base_url": AI_BASE_URL,
-            "assigned_steps": ["scenario_generation", "testcase_generation"],
-            "is_default": True,
-        },
-    )
-    assert response.status_code == 201
-    return response.json()
-
-
-@pytest.mark.skipif(not AI_READY, reason="需要真实 AI 服务配置（QF_ENABLE_AI_TESTS=1 且 QF_AI_API_KEY 已配置）")
-def test_full_workflow():
+@pytest.mark.ai
+def test_full_workflow(client):
     """
     测试完整工作流：
     需求 → 场景 → 用例 → 环境 → 执行
@@ -61,7 +31,7 @@ def test_full_workflow():
     requirement_id = requirement["id"]
     
     # 2. AI 配置
-    _ensure_ai_config()
+    ensure_ai_config(client, ["scenario_generation", "testcase_generation"])
 
     # 3. 生成场景
     scenario_response = client.post(
@@ -139,8 +109,8 @@ def test_full_workflow():
     assert status_response.status_code == 200
 
 
-@pytest.mark.skipif(not ENABLE_INTEGRATION_TESTS, reason="需要完整数据库环境（QF_ENABLE_INTEGRATION_TESTS=1）")
-def test_approval_workflow():
+@pytest.mark.integration
+def test_approval_workflow(client):
     """测试审核流程"""
     # 创建需求和场景
     req_response = client.post(
@@ -172,8 +142,8 @@ def test_approval_workflow():
     assert approve_response.json()["approval_status"] == "approved"
 
 
-@pytest.mark.skipif(not ENABLE_INTEGRATION_TESTS, reason="需要完整数据库环境（QF_ENABLE_INTEGRATION_TESTS=1）")
-def test_environment_health_check():
+@pytest.mark.integration
+def test_environment_health_check(client):
     """测试环境健康检查"""
     # 创建环境
     env_response = client.post(
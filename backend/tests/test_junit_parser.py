@@ -134,3 +134,83 @@ class TestParseJunitXml:
         assert summary["tests"] == 4
         assert summary["failures"] == 0
         assert summary["errors"] == 0
+
+    def test_nested_testsuite_under_other_root(self):
+        """非 testsuite(s) 根元素时取第一个 testsuite"""
+        content = '''<report>
+    <run><testsuite tests="7" failures="1"/></run>
+    <testsuite tests="99"/>
+</report>'''
+
+        summary = parse_junit_xml_content(content)
+
+        assert summary["tests"] == 7
+        assert summary["failures"] == 1
+
+    def test_large_testsuites_spanning_chunks(self):
+        """聚合跨越多个增量解析块的大量 testsuite"""
+        suite = (
+            '<testsuite tests="2" failures="1" errors="0" skipped="0" time="0.5">'
+            '<testcase name="a"/><testcase name="b"/></testsuite>'
+        )
+        content = "<testsuites>" + suite * 2000 + "</testsuites>"
+
+        summary = parse_junit_xml_content(content)
+
+        assert summary["tests"] == 4000
+        assert summary["failures"] == 2000
+        assert abs(summary["time"] - 1000.0) < 0.001
+
+    def test_truncated_testsuites_falls_back_to_regex(self):
+        """不完整的 testsuites 文档走正则 fallback"""
+        content = '<testsuites><testsuite tests="3" failures="1">'
+
+        summary = parse_junit_xml_content(content)
+
+        assert summary["tests"] == 3
+        assert summary["failures"] == 1
+
+    def test_regex_fallback_takes_first_value_per_attribute(self):
+        """正则 fallback 一次扫描，每个属性取第一次出现的值"""
+        content = 'summary tests="6" skipped="1" time="0.75" tests="99" errors="2"'
+
+        summary = parse_junit_xml_content(content)
+
+        assert summary["tests"] == 6
+        assert summary["skipped"] == 1
+        assert summary["errors"] == 2
+        assert summary["failures"] == 0
+        assert abs(summary["time"] - 0.75) < 0.001
+
+    def test_parse_from_file_edge_cases(self, tmp_path: Path):
+        """空文件与非 XML 文件按文本 fallback 处理"""
+        empty = tmp_path / "empty.xml"
+        empty.write_bytes(b"")
+        assert parse_junit_xml(empty)["tests"] == 0
+
+        text = tmp_path / "report.txt"
+        text.write_text('tests="4" failures="1"', encoding="utf-8")
+        summary = parse_junit_xml(text)
+        assert summary["tests"] == 4
+        assert summary["failures"] == 1
+
+    def test_content_with_utf8_bom(self):
+        """带 UTF-8 BOM 的内容仍按 XML 解析并聚合全部 testsuite"""
+        content = (
+            '\ufeff<?xml version="1.0" encoding="utf-8"?>'
+            '<testsuites><testsuite tests="2" failures="1"/><testsuite tests="3"/></testsuites>'
+        )
+
+        summary = parse_junit_xml_content(content)
+
+        assert summary["tests"] == 5
+        assert summary["failures"] == 1
+
+    def test_file_with_utf8_bom(self, tmp_path: Path):
+        """带 BOM 的文件同样聚合全部 testsuite"""
+        path = tmp_path / "bom.xml"
+        path.write_bytes(
+            b'\xef\xbb\xbf<testsuites><testsuite tests="2"/><testsuite tests="3"/></testsuites>'
+        )
+
+        assert parse_junit_xml(path)["tests"] == 5
@@ -3,8 +3,11 @@
 验证策略配置的加载、验证和默认值行为。
 """
 
+import os
 from pathlib import Path
 
+import pytest
+from pydantic import ValidationError
 
 from qualityfoundry.governance.policy_loader import (
     PolicyConfig,
@@ -12,6 +15,7 @@ from qualityfoundry.governance.policy_loader import (
     FallbackRule,
     CostGovernance,
     load_policy,
+    load_policy_from_dict,
     get_policy,
     get_default_policy,
     clear_policy_cache,
@@ -49,6 +53,28 @@ class TestPolicyConfig:
         assert config.fallback_rule.require_all_tools_success is False
         assert config.cost_governance.timeout_s == 600
 
+    def test_policy_is_frozen(self):
+        """策略实例不可变，防止共享缓存被就地修改"""
+        config = PolicyConfig()
+        with pytest.raises(ValidationError):
+            config.version = "2.0"
+        with pytest.raises(ValidationError):
+            config.cost_governance.timeout_s = 1
+
+    def test_high_risk_keyword_set(self):
+        """关键词集合小写化并缓存在实例上，不出现在序列化结果中"""
+        config = PolicyConfig(high_risk_keywords=["Prod", "delete"])
+        assert config.high_risk_keyword_set == frozenset({"prod", "delete"})
+        assert config.high_risk_keyword_set is config.high_risk_keyword_set
+        assert "high_risk_keyword_set" not in config.model_dump()
+
+    def test_model_copy_rebuilds_keyword_set(self):
+        """model_copy 更新关键词后不沿用原实例的缓存集合"""
+        config = PolicyConfig(high_risk_keywords=["prod"])
+        assert config.high_risk_keyword_set == frozenset({"prod"})
+        copied = config.model_copy(update={"high_risk_keywords": ["staging"]})
+        assert copied.high_risk_keyword_set == frozenset({"staging"})
+
 
 class TestLoadPolicy:
     """load_policy 函数测试"""
@@ -108,6 +134,53 @@ high_risk_keywords:
         assert config.junit_pass_rule.max_failures == 0
         assert config.fallback_rule.require_all_tools_success is True
 
+    def test_load_cached_until_file_changes(self, tmp_path: Path):
+        """测试未修改的文件命中缓存，修改后重新解析"""
+        config_file = tmp_path / "cached.yaml"
+        config_file.write_text("high_risk_keywords:\n  - first\n")
+
+        first = load_policy(config_file)
+        assert load_policy(config_file) is first
+
+        config_file.write_text("high_risk_keywords:\n  - second\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_policy(config_file).high_risk_keywords == ["second"]
+
+    def test_rewrite_within_same_mtime_is_reloaded(self, tmp_path: Path):
+        """同一时间片内重写（mtime 不变）仍能按大小变化重新解析"""
+        config_file = tmp_path / "same_tick.yaml"
+        config_file.write_text("high_risk_keywords:\n  - first\n")
+        original = config_file.stat()
+        assert load_policy(config_file).high_risk_keywords == ["first"]
+
+        config_file.write_text("high_risk_keywords:\n  - rewritten\n")
+        os.utime(config_file, ns=(original.st_atime_ns, original.st_mtime_ns))
+
+        assert load_policy(config_file).high_risk_keywords == ["rewritten"]
+
+    def test_atomic_replace_within_same_mtime_is_reloaded(self, tmp_path: Path):
+        """原子替换（同大小、mtime 不变，inode 不同）同样重新解析"""
+        config_file = tmp_path / "replaced.yaml"
+        config_file.write_text("high_risk_keywords:\n  - aaaa\n")
+        original = config_file.stat()
+        assert load_policy(config_file).high_risk_keywords == ["aaaa"]
+
+        staged = tmp_path / "replaced.yaml.tmp"
+        staged.write_text("high_risk_keywords:\n  - bbbb\n")
+        os.utime(staged, ns=(original.st_atime_ns, original.st_mtime_ns))
+        os.replace(staged, config_file)
+
+        assert load_policy(config_file).high_risk_keywords == ["bbbb"]
+
+    def test_load_from_dict(self):
+        """测试从字典直接构建策略"""
+        config = load_policy_from_dict({"junit_pass_rule": {"max_failures": 3}})
+
+        assert config.junit_pass_rule.max_failures == 3
+        assert load_policy_from_dict(None) == PolicyConfig()
+
 
 class TestGetDefaultPolicy:
     """get_default_policy 函数测试"""
@@ -121,6 +194,14 @@ class TestGetDefaultPolicy:
         assert "delete" in policy.high_risk_keywords
         assert len(policy.high_risk_patterns) > 0
 
+    def test_returns_shared_instance(self):
+        """默认策略只构建一次，clear_policy_cache 后重建"""
+        policy = get_default_policy()
+        assert get_default_policy() is policy
+        clear_policy_cache()
+        assert get_default_policy() is not policy
+        assert get_default_policy() == policy
+
 
 class TestPolicyCache:
     """策略缓存测试"""
@@ -3,7 +3,6 @@
 测试用户只能访问自己创建的运行记录，ADMIN 可访问全部。
 """
 from uuid import uuid4
-from fastapi.testclient import TestClient
 
 from qualityfoundry.main import app
 from qualityfoundry.database.user_models import User, UserRole
@@ -55,13 +54,12 @@ MOCK_VIEWER = User(
 class TestUnauthorizedAccess:
     """未认证访问测试"""
 
-    def test_runs_requires_auth(self):
+    def test_runs_requires_auth(self, client):
         """测试 /runs 需要认证"""
         # 清除 mock 以测试真实认证
         original_override = app.dependency_overrides.get(get_current_user)
         app.dependency_overrides.pop(get_current_user, None)
         
-        client = TestClient(app)
         response = client.get("/api/v1/runs")
         
         # 恢复 mock
@@ -70,12 +68,11 @@ class TestUnauthorizedAccess:
         
         assert response.status_code == 401
 
-    def test_orchestrations_runs_requires_auth(self):
+    def test_orchestrations_runs_requires_auth(self, client):
         """测试 /orchestrations/runs 需要认证"""
         original_override = app.dependency_overrides.get(get_current_user)
         app.dependency_overrides.pop(get_current_user, None)
         
-        client = TestClient(app)
         response = client.get("/api/v1/orchestrations/runs")
         
         if original_override:
@@ -3,6 +3,7 @@
 
 使用 conftest.py 中统一的测试数据库配置
 """
+from tests.conftest import post_json
 
 
 # 不再使用模块级全局 client，改为使用 conftest.py 提供的 client fixture
@@ -29,9 +30,10 @@ def test_list_requirements(client):
     """测试需求列表"""
     # 创建几个需求
     for i in range(3):
-        client.post(
+        post_json(
+            client,
             "/api/v1/requirements",
-            json={
+            {
                 "title": f"需求{i}",
                 "content": f"内容{i}",
                 "version": "v1.0"
@@ -13,8 +13,8 @@ from qualityfoundry.governance.tracing.collector import (
 )
 
 
-# 创建测试客户端
-@pytest.fixture
+# 创建测试客户端（仅挂载评审路由的独立应用，模块内共享）
+@pytest.fixture(scope="module")
 def client():
     """测试客户端"""
     from fastapi import FastAPI
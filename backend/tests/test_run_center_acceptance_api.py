@@ -24,12 +24,6 @@ from qualityfoundry.schemas import validate_evidence_v1, EvidenceValidationError
 
 # ============ Fixtures ============
 
-@pytest.fixture
-def client():
-    """创建测试客户端"""
-    return TestClient(app)
-
-
 @pytest.fixture
 def test_user(db: Session):
     """创建测试用户"""
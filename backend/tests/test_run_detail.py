@@ -4,8 +4,6 @@
 """
 from uuid import uuid4
 
-from fastapi.testclient import TestClient
-
 from qualityfoundry.main import app
 from qualityfoundry.database.user_models import User, UserRole
 from qualityfoundry.api.deps.auth_deps import get_current_user
@@ -46,12 +44,11 @@ MOCK_USER_B = User(
 class TestRunDetailUnauthorized:
     """未认证访问测试"""
 
-    def test_run_detail_requires_auth(self):
+    def test_run_detail_requires_auth(self, client):
         """测试 /orchestrations/runs/{run_id} 需要认证"""
         original = app.dependency_overrides.get(get_current_user)
         app.dependency_overrides.pop(get_current_user, None)
         
-        client = TestClient(app)
         run_id = str(uuid4())
         response = client.get(f"/api/v1/orchestrations/runs/{run_id}")
         
@@ -2,7 +2,6 @@
 import pytest
 import json
 from uuid import uuid4
-from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from qualityfoundry.main import app
@@ -48,9 +47,8 @@ def test_event_service_emit_and_get(db: Session):
     assert len(events_since) == 1
     assert events_since[0].id == event2.id
 
-def test_sse_endpoint_structure(db: Session):
+def test_sse_endpoint_structure(db: Session, client):
     """测试 SSE 端点结构响应"""
-    client = TestClient(app)
     run_id = uuid4()
     
     # 模拟管理员登录（这里简化，直接使用 RequireOrchestrationRead 的 mock）
@@ -101,17 +101,19 @@ async def test_artifact_size_limit(monkeypatch):
 async def test_container_sandbox_network_policy(monkeypatch):
     """验证容器网络策略正确映射到 Docker 命令参数"""
     from pathlib import Path
-    import asyncio
     
     # 模拟容器运行时可用
     monkeypatch.setattr("shutil.which", lambda x: "/usr/bin/docker" if x == "docker" else None)
     
     # 模拟 subprocess 执行，用于捕获命令
     mock_proc = MagicMock()
-    mock_proc.communicate = asyncio.iscoroutinefunction(lambda: None) # Make it awaitable
-    async def mock_communicate():
-        return b"stdout", b"stderr"
-    mock_proc.communicate = mock_communicate
+    async def mock_read():
+        return b""
+    async def mock_wait():
+        return 0
+    mock_proc.stdout.read = mock_read
+    mock_proc.stderr.read = mock_read
+    mock_proc.wait = mock_wait
     mock_proc.returncode = 0
     
     captured_cmds = []
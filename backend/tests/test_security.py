@@ -3,18 +3,14 @@
 """
 import os
 import pytest
-from fastapi.testclient import TestClient
 
-from qualityfoundry.main import app
 from qualityfoundry.middleware.security import SecurityMiddleware
 
 # 检测是否在 CI 环境中运行
 IN_CI = os.environ.get("CI", "").lower() == "true" or os.environ.get("GITHUB_ACTIONS", "").lower() == "true"
 
-client = TestClient(app)
 
-
-def test_sql_injection_detection():
+def test_sql_injection_detection(client):
     """测试 SQL 注入检测"""
     # 测试危险的 SQL 输入
     dangerous_inputs = [
@@ -29,7 +25,7 @@ def test_sql_injection_detection():
             SecurityMiddleware.sanitize_sql_input(dangerous_input)
 
 
-def test_xss_detection():
+def test_xss_detection(client):
     """测试 XSS 检测"""
     # 测试危险的 XSS 输入
     dangerous_inputs = [
@@ -44,7 +40,7 @@ def test_xss_detection():
             SecurityMiddleware.sanitize_xss_input(dangerous_input)
 
 
-def test_safe_input():
+def test_safe_input(client):
     """测试安全输入"""
     safe_inputs = [
         "正常的用户输入",
@@ -59,7 +55,7 @@ def test_safe_input():
         assert result == safe_input
 
 
-def test_security_headers():
+def test_security_headers(client):
     """测试安全响应头"""
     # 使用 /health 端点测试，避免数据库依赖
     response = client.get("/health")
@@ -70,3 +66,19 @@ def test_security_headers():
     assert "X-Frame-Options" in response.headers
     assert response.headers["X-Frame-Options"] == "DENY"
     assert "X-XSS-Protection" in response.headers
+
+
+def test_create_app_returns_independent_instance():
+    """create_app 每次返回独立实例，路由完整且不共享依赖覆盖"""
+    from fastapi.testclient import TestClient
+
+    from qualityfoundry.main import app, create_app
+
+    fresh = create_app()
+    assert fresh is not app
+    assert fresh.dependency_overrides == {}
+    assert len(fresh.routes) == len(app.routes)
+
+    response = TestClient(fresh).get("/healthz")
+    assert response.status_code == 200
+    assert response.headers["X-Frame-Options"] == "DENY"
@@ -3,7 +3,8 @@
 测试 /api/v1/tenants 端点
 """
 from uuid import uuid4
-from fastapi.testclient import TestClient
+
+import pytest
 
 from qualityfoundry.database.tenant_models import Tenant, TenantMembership, TenantRole, TenantStatus
 from qualityfoundry.database.user_models import User, UserRole
@@ -37,26 +38,25 @@ def override_get_db_for_test():
         db.close()
 
 
-def get_client_with_user(user):
-    """获取使用指定用户的测试客户端"""
-    def override_get_current_user():
-        return user
-    
-    app.dependency_overrides[get_current_user] = override_get_current_user
-    app.dependency_overrides[get_db] = override_get_db_for_test
-    
-    client = TestClient(app)
-    return client
+@pytest.fixture
+def client_with_user(client):
+    """返回切换认证用户的函数：覆盖当前用户与数据库依赖后返回会话级共享客户端"""
+    def _as(user):
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_db] = override_get_db_for_test
+        return client
+
+    return _as
 
 
 class TestTenantAPICreate:
     """创建租户 API 测试"""
 
-    def test_create_tenant_success(self, db):
+    def test_create_tenant_success(self, db, client_with_user):
         """成功创建租户"""
         # 创建用户
         user = create_test_user(db, "tenant_creator")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         response = client.post(
             "/api/v1/tenants",
@@ -73,10 +73,10 @@ class TestTenantAPICreate:
         assert data["name"] == "Test Tenant"
         assert data["status"] == "active"
 
-    def test_create_tenant_duplicate_slug(self, db):
+    def test_create_tenant_duplicate_slug(self, db, client_with_user):
         """重复的 slug 返回 400"""
         user = create_test_user(db, "dup_user")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         # 第一个租户
         client.post(
@@ -93,12 +93,11 @@ class TestTenantAPICreate:
         assert response.status_code == 400
         assert "已存在" in response.json()["detail"]
 
-    def test_create_tenant_unauthorized(self):
+    def test_create_tenant_unauthorized(self, client):
         """未认证返回 401"""
         # 清除认证覆盖
         app.dependency_overrides.pop(get_current_user, None)
         app.dependency_overrides[get_db] = override_get_db_for_test
-        client = TestClient(app)
         
         response = client.post(
             "/api/v1/tenants",
@@ -110,7 +109,7 @@ class TestTenantAPICreate:
 class TestTenantAPIList:
     """列出租户 API 测试"""
 
-    def test_list_my_tenants(self, db):
+    def test_list_my_tenants(self, db, client_with_user):
         """列出当前用户的租户"""
         user = create_test_user(db, "list_user")
         
@@ -133,17 +132,17 @@ class TestTenantAPIList:
         db.add(membership)
         db.commit()
         
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         response = client.get("/api/v1/tenants")
         
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) >= 1
 
-    def test_get_my_tenants(self, db):
+    def test_get_my_tenants(self, db, client_with_user):
         """获取我的租户列表（专用端点）"""
         user = create_test_user(db, "my_tenants_user")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         # 先创建租户
         client.post(
@@ -161,10 +160,10 @@ class TestTenantAPIList:
 class TestTenantAPIDetail:
     """租户详情 API 测试"""
 
-    def test_get_tenant_detail(self, db):
+    def test_get_tenant_detail(self, db, client_with_user):
         """获取租户详情"""
         user = create_test_user(db, "detail_user")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         # 创建租户
         response = client.post(
@@ -180,10 +179,10 @@ class TestTenantAPIDetail:
         data = response.json()
         assert data["slug"] == "detail-tenant"
 
-    def test_get_nonexistent_tenant(self, db):
+    def test_get_nonexistent_tenant(self, db, client_with_user):
         """获取不存在的租户返回 404"""
         user = create_test_user(db, "notfound_user")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         response = client.get(f"/api/v1/tenants/{uuid4()}")
         
@@ -193,10 +192,10 @@ class TestTenantAPIDetail:
 class TestTenantAPIUpdate:
     """更新租户 API 测试"""
 
-    def test_update_tenant(self, db):
+    def test_update_tenant(self, db, client_with_user):
         """更新租户信息"""
         user = create_test_user(db, "update_user")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         # 创建租户（用户自动成为 owner）
         response = client.post(
@@ -220,10 +219,10 @@ class TestTenantAPIUpdate:
 class TestTenantAPIMembers:
     """成员管理 API 测试"""
 
-    def test_list_members(self, db):
+    def test_list_members(self, db, client_with_user):
         """列出成员"""
         user = create_test_user(db, "member_list_owner")
-        client = get_client_with_user(user)
+        client = client_with_user(user)
         
         # 创建租户
         response = client.post(
@@ -240,7 +239,7 @@ class TestTenantAPIMembers:
         assert isinstance(data, list)
         assert len(data) >= 1  # 至少包含所有者
 
-    def test_add_member(self, db):
+    def test_add_member(self, db, client_with_user):
         """添加成员"""
         # 所有者
         owner = create_test_user(db, "add_member_owner")
@@ -248,7 +247,7 @@ class TestTenantAPIMembers:
         # 新成员
         new_user = create_test_user(db, "new_member")
         
-        client = get_client_with_user(owner)
+        client = client_with_user(owner)
         
         # 创建租户
         response = client.post(
@@ -268,7 +267,7 @@ class TestTenantAPIMembers:
         assert data["user_id"] == str(new_user.id)
         assert data["role"] == "member"
 
-    def test_remove_member(self, db):
+    def test_remove_member(self, db, client_with_user):
         """移除成员"""
         # 所有者
         owner = create_test_user(db, "remove_owner")
@@ -276,7 +275,7 @@ class TestTenantAPIMembers:
         # 要移除的成员
         member = create_test_user(db, "to_remove")
         
-        client = get_client_with_user(owner)
+        client = client_with_user(owner)
         
         # 创建租户
         response = client.post(
@@ -300,13 +299,13 @@ class TestTenantAPIMembers:
 class TestTenantAPIPermissions:
     """权限测试"""
 
-    def test_non_member_cannot_access(self, db):
+    def test_non_member_cannot_access(self, db, client_with_user):
         """非成员无法访问租户"""
         # 创建者
         owner = create_test_user(db, "private_owner")
         
         # 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "private-tenant", "name": "Private"},
@@ -315,7 +314,7 @@ class TestTenantAPIPermissions:
         
         # 非成员尝试访问
         outsider = create_test_user(db, "outsider")
-        outsider_client = get_client_with_user(outsider)
+        outsider_client = client_with_user(outsider)
         
         response = outsider_client.get(f"/api/v1/tenants/{tenant_id}")
         
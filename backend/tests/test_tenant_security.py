@@ -3,7 +3,8 @@
 补充缺失的安全测试场景
 """
 from uuid import UUID, uuid4
-from fastapi.testclient import TestClient
+
+import pytest
 
 from qualityfoundry.database.tenant_models import TenantMembership, TenantRole
 from qualityfoundry.database.user_models import User, UserRole
@@ -38,22 +39,21 @@ def override_get_db_for_test():
         db.close()
 
 
-def get_client_with_user(user):
-    """获取使用指定用户的测试客户端"""
-    def override_get_current_user():
-        return user
-    
-    app.dependency_overrides[get_current_user] = override_get_current_user
-    app.dependency_overrides[get_db] = override_get_db_for_test
-    
-    client = TestClient(app)
-    return client
+@pytest.fixture
+def client_with_user(client):
+    """返回切换认证用户的函数：覆盖当前用户与数据库依赖后返回会话级共享客户端"""
+    def _as(user):
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_db] = override_get_db_for_test
+        return client
+
+    return _as
 
 
 class TestF003SecurityScenarios:
     """F003 安全测试场景"""
 
-    def test_f003a_admin_cannot_delete_tenant(self, db):
+    def test_f003a_admin_cannot_delete_tenant(self, db, client_with_user):
         """F003a: admin 不能删除租户（只有 owner 可以）"""
         # 创建 owner
         owner = create_test_user(db, "delete_owner")
@@ -62,7 +62,7 @@ class TestF003SecurityScenarios:
         admin_user = create_test_user(db, "delete_admin")
         
         # owner 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "delete-test", "name": "Delete Test"},
@@ -73,13 +73,13 @@ class TestF003SecurityScenarios:
         TenantService.add_member(db, tenant_id, admin_user.id, TenantRole.ADMIN)
         
         # admin 尝试删除租户
-        admin_client = get_client_with_user(admin_user)
+        admin_client = client_with_user(admin_user)
         response = admin_client.delete(f"/api/v1/tenants/{tenant_id}")
         
         assert response.status_code == 403
         assert "需要所有者权限" in response.json()["detail"]
 
-    def test_f003b_member_cannot_add_members(self, db):
+    def test_f003b_member_cannot_add_members(self, db, client_with_user):
         """F003b: member 不能添加成员（只有 admin/owner 可以）"""
         # 创建 owner 和 member
         owner = create_test_user(db, "add_owner")
@@ -87,7 +87,7 @@ class TestF003SecurityScenarios:
         new_user = create_test_user(db, "new_guy")
         
         # owner 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "member-add-test", "name": "Member Add Test"},
@@ -98,7 +98,7 @@ class TestF003SecurityScenarios:
         TenantService.add_member(db, tenant_id, member.id, TenantRole.MEMBER)
         
         # member 尝试添加新成员
-        member_client = get_client_with_user(member)
+        member_client = client_with_user(member)
         response = member_client.post(
             f"/api/v1/tenants/{tenant_id}/members",
             json={"user_id": str(new_user.id), "role": "member"},
@@ -107,13 +107,13 @@ class TestF003SecurityScenarios:
         assert response.status_code == 403
         assert "需要管理员权限" in response.json()["detail"]
 
-    def test_f003c_add_nonexistent_user_id(self, db):
+    def test_f003c_add_nonexistent_user_id(self, db, client_with_user):
         """F003c: 添加不存在的 user_id 返回 400"""
         # 创建 owner
         owner = create_test_user(db, "exist_owner")
         
         # owner 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "exist-test", "name": "Exist Test"},
@@ -130,7 +130,7 @@ class TestF003SecurityScenarios:
         assert response.status_code == 400
         assert "用户不存在" in response.json()["detail"]
 
-    def test_f003d_admin_add_owner_blocked(self, db):
+    def test_f003d_admin_add_owner_blocked(self, db, client_with_user):
         """F003d: admin 添加 owner 角色被阻止"""
         # 创建 owner 和 admin
         owner = create_test_user(db, "block_owner")
@@ -138,7 +138,7 @@ class TestF003SecurityScenarios:
         target_user = create_test_user(db, "target_user")
         
         # owner 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "block-test", "name": "Block Test"},
@@ -149,7 +149,7 @@ class TestF003SecurityScenarios:
         TenantService.add_member(db, tenant_id, admin_user.id, TenantRole.ADMIN)
         
         # admin 尝试添加 owner 角色
-        admin_client = get_client_with_user(admin_user)
+        admin_client = client_with_user(admin_user)
         response = admin_client.post(
             f"/api/v1/tenants/{tenant_id}/members",
             json={"user_id": str(target_user.id), "role": "owner"},
@@ -158,7 +158,7 @@ class TestF003SecurityScenarios:
         assert response.status_code == 400
         assert "不能直接添加所有者角色" in response.json()["detail"]
 
-    def test_f003e_delete_tenant_cascades_memberships(self, db):
+    def test_f003e_delete_tenant_cascades_memberships(self, db, client_with_user):
         """F003e: 删除租户级联删除成员关系"""
         # 创建 owner 和多个成员
         owner = create_test_user(db, "cascade_owner")
@@ -166,7 +166,7 @@ class TestF003SecurityScenarios:
         member2 = create_test_user(db, "cascade_member2")
         
         # owner 创建租户
-        owner_client = get_client_with_user(owner)
+        owner_client = client_with_user(owner)
         response = owner_client.post(
             "/api/v1/tenants",
             json={"slug": "cascade-test", "name": "Cascade Test"},
@@ -3,41 +3,18 @@
 
 使用 conftest.py 中统一的测试数据库配置
 """
-import os
 import pytest
 
+from tests.conftest import ensure_ai_config, post_json
 
-# 不再使用模块级全局 client，改为使用 conftest.py 提供的 client fixture
-
-ENABLE_AI_TESTS = os.environ.get("QF_ENABLE_AI_TESTS", "").lower() in ("1", "true", "yes")
-AI_API_KEY = os.environ.get("QF_AI_API_KEY")
-AI_BASE_URL = os.environ.get("QF_AI_BASE_URL", "https://api.openai.com/v1")
-AI_MODEL = os.environ.get("QF_AI_MODEL", "gpt-4o-mini")
-AI_PROVIDER = os.environ.get("QF_AI_PROVIDER", "openai")
-AI_READY = ENABLE_AI_TESTS and bool(AI_API_KEY)
 
-
-def _ensure_ai_config(client):
-    response = client.post(
-        "/api/v1/ai-configs",
-        json={
-            "name": "测试 AI 配置",
-            "provider": AI_PROVIDER,
-            "model": AI_MODEL,
-            "api_key": AI_API_KEY,
-            "base_url": AI_BASE_URL,
-            "assigned_steps": ["testcase_generation"],
-            "is_default": True,
-        },
-    )
-    assert response.status_code == 201
-    return response.json()
+# 不再使用模块级全局 client，改为使用 conftest.py 提供的 client fixture
 
 
-@pytest.mark.skipif(not AI_READY, reason="需要真实 AI 服务配置（QF_ENABLE_AI_TESTS=1 且 QF_AI_API_KEY 已配置）")
+@pytest.mark.ai
 def test_generate_testcases(client):
     """测试 AI 生成用例"""
-    _ensure_ai_config(client)
+    ensure_ai_config(client, ["testcase_generation"])
     # 创建需求和场景
     req_response = client.post(
         "/api/v1/requirements",
@@ -125,9 +102,10 @@ def test_list_testcases(client):
     scenario_id = scenario_response.json()["id"]
     
     for i in range(3):
-        client.post(
+        post_json(
+            client,
             "/api/v1/testcases",
-            json={
+            {
                 "scenario_id": scenario_id,
                 "title": f"用例{i}",
                 "steps": [{"step": "步骤1", "expected": "预期结果1"}]